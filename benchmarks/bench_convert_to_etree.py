@@ -0,0 +1,91 @@
+# ---------- IMPORTS: ----------
+# Standard library
+import os
+import sys
+import time
+from lxml import etree as ET
+from ncclient.xml_ import NCElement
+from ncclient.operations.retrieve import GetReply
+from ncclient.devices.junos import JunosDeviceHandler
+
+# Custom modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import utils
+
+# Benchmark of utils.convertToEtree on a ~50 MB <get-route-information> reply (Junos full routing table).
+# The same reply is converted as a Cisco reply (GetReply - raw XML) and as a Juniper reply (NCElement - already parsed by ncclient).
+# No device (or NETCONF session) is needed.
+#   Usage: python benchmarks/bench_convert_to_etree.py [number of routes]
+
+ROUTES = 155000 # ~50 MB
+
+
+# ---------- HELPERS: ----------
+def _buildRouteInformationReply(routes) -> str:
+    parts = ['<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" xmlns:junos="http://xml.juniper.net/junos/24.2R1/junos" message-id="1">'
+             '<route-information xmlns="http://xml.juniper.net/junos/24.2R1/junos-routing">'
+             '<route-table><table-name>inet.0</table-name>']
+    for index in range(routes):
+        parts.append(f'<rt junos:style="brief"><rt-destination>10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}/32</rt-destination>'
+                     f'<rt-entry><active-tag>*</active-tag><current-active/><last-active/><protocol-name>BGP</protocol-name><preference>170</preference>'
+                     f'<age junos:seconds="1000">00:16:40</age><nh><selected-next-hop/><to>192.168.1.1</to><via>ge-0/0/0.0</via></nh></rt-entry></rt>')
+    parts.append('</route-table></route-information></rpc-reply>')
+    return("".join(parts))
+
+class _RawReply:
+    """Stands for the ncclient reply, from which the NCElement is created."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def __str__(self):
+        return(self._raw)
+
+def _previousConvertToEtree(rpc_reply, device_type) -> ET.Element:
+    """convertToEtree before the change: reply -> string -> bytes -> etree -> recursive namespace stripping."""
+
+    def removeXmlns(element):
+        if element.tag.startswith('{'):
+            element.tag = element.tag.split('}', 1)[-1]
+            for child in element:
+                removeXmlns(child)
+
+    if device_type == "iosxe":
+        rpc_reply_bytes = rpc_reply.xml.encode('utf-8')
+    elif device_type == "junos":
+        rpc_reply_bytes = str(rpc_reply).encode('utf-8')
+    rpc_reply_etree = ET.fromstring(rpc_reply_bytes)
+    removeXmlns(rpc_reply_etree)
+    return(rpc_reply_etree)
+
+def _measure(function, *args) -> tuple:
+    """Returns (result, time in seconds)."""
+
+    start = time.perf_counter()
+    result = function(*args)
+    return(result, time.perf_counter() - start)
+
+
+# ---------- MAIN: ----------
+def main() -> None:
+    routes = int(sys.argv[1]) if len(sys.argv) > 1 else ROUTES
+    raw_reply = _buildRouteInformationReply(routes)
+    print(f"Reply: {len(raw_reply) / 1e6:.1f} MB, {routes} routes")
+
+    cisco_reply = GetReply(raw_reply)
+    juniper_reply = NCElement(_RawReply(raw_reply), JunosDeviceHandler({"name": "junos"}).transform_reply())
+
+    print(f"{'device':>8} {'previous (s)':>14} {'current (s)':>13} {'speedup':>9}")
+    for device_type, rpc_reply in (("iosxe", cisco_reply), ("junos", juniper_reply)):
+        previous_etree, previous_time = _measure(_previousConvertToEtree, rpc_reply, device_type)
+        current_etree, current_time = _measure(utils.convertToEtree, rpc_reply, device_type)
+
+        # Both must find the same data, the current one must not leave any namespace behind
+        assert len(previous_etree.xpath("//rt-destination")) == len(current_etree.xpath("//rt-destination")) == routes
+        assert not current_etree.xpath('//*[namespace-uri() != ""]')
+
+        print(f"{device_type:>8} {previous_time:>14.3f} {current_time:>13.3f} {previous_time / current_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
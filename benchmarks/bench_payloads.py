@@ -0,0 +1,74 @@
+# ---------- IMPORTS: ----------
+# Standard library
+import os
+import sys
+import time
+from lxml import etree as ET
+from ncclient.operations.edit import EditConfig
+from ncclient.xml_ import to_ele
+from ncclient.devices.iosxe import IosxeDeviceHandler
+
+# Custom modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.vlan import OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter
+
+# Benchmark of the RPC payload construction: time needed to build an <edit-config> (bulk VLAN edit on N interfaces)
+# and turn it into the bytes sent to the device. No device (or NETCONF session) is needed.
+#   Usage: python benchmarks/bench_payloads.py
+
+SIZES = [10, 100, 1000]
+REPEAT = 20
+
+
+# ---------- HELPERS: ----------
+class _OfflineEditConfig(EditConfig):
+    """The ncclient <edit-config> operation, which returns the serialized RPC instead of sending it to the device."""
+
+    def __init__(self):
+        self._device_handler = IosxeDeviceHandler({"name": "iosxe"})
+        self._assert = lambda capability: None
+        self._id = "1"
+
+    def _request(self, op):
+        return(self._wrap(op))
+
+def _buildInterfaces(count) -> dict:
+    return({f"GigabitEthernet1/0/{index}": {"vlan_data": {"port_mode": "trunk", "vlan": ["10", "20", "30"]}} for index in range(count)})
+
+def _stringPayload(interfaces) -> str:
+    """Previous way: filter -> string -> ncclient parses it back -> RPC string."""
+
+    filter = OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter(interfaces)
+    return(_OfflineEditConfig().request(str(filter), target="candidate"))
+
+def _elementPayload(interfaces) -> str:
+    """Current way: filter element is handed to ncclient as is -> RPC string."""
+
+    filter = OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter(interfaces)
+    return(_OfflineEditConfig().request(filter.__ele__(), target="candidate"))
+
+def _measure(function, interfaces) -> float:
+    """Returns the best time (in milliseconds) out of REPEAT runs."""
+
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function(interfaces)
+        best = min(best, time.perf_counter() - start)
+    return(best * 1000)
+
+
+# ---------- MAIN: ----------
+def main() -> None:
+    print(f"{'elements':>10} {'string (ms)':>14} {'element (ms)':>14} {'speedup':>9}")
+    for size in SIZES:
+        interfaces = _buildInterfaces(size)
+        assert ET.tostring(to_ele(_stringPayload(interfaces))) == ET.tostring(to_ele(_elementPayload(interfaces))) # Both ways must produce the same RPC
+
+        string_time = _measure(_stringPayload, interfaces)
+        element_time = _measure(_elementPayload, interfaces)
+        print(f"{size:>10} {string_time:>14.3f} {element_time:>14.3f} {string_time / element_time:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+# ---------- IMPORTS: ----------
+# Standard library
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import ipaddress
+import statistics
+import contextlib
+from datetime import datetime
+from lxml import etree as ET
+from ncclient.xml_ import NCElement
+from ncclient.operations.retrieve import GetReply
+from ncclient.devices.junos import JunosDeviceHandler
+
+# Custom modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import utils
+import bulk
+from modules.interfaces import getInterfacesWithNetconf, OpenconfigInterfaces_Get_GetAllInterfaces_Filter
+from modules.ospf import CiscoIOSXEOspf_Editconfig_ConfigureOspf_Filter, OpenconfigNetworkInstance_Editconfig_ConfigureOspf_Filter
+from modules.security import CiscoIOSXENative_Editconfig_ConfigureIPSec_Filter, JunosConf_Editconfig_ConfigureIPSec_Filter
+from modules.vlan import OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter
+from netconf_simulator import BASE_NS, PERSONALITY_DEVICE_TYPES, NetconfSimulator, SimulatedDevice
+
+# PySide6
+from PySide6.QtWidgets import QApplication
+
+# End-to-end benchmark suite of the inventory, edit and commit paths:
+#   - interfaces.parse.*  getInterfacesWithNetconf (reply -> etree -> interfaces dictionary) with 10 to 5000 interfaces
+#   - convert_to_etree.*  utils.convertToEtree of the largest <get> reply (for Juniper together with the NCElement construction,
+#                         where ncclient parses the reply - convertToEtree then only reuses the parsed tree)
+#   - filter.*            construction of the OSPF, IPsec and VLAN edit-config filters
+#   - load_devices.*      MainWindow._loadDevicesFromFile with N devices, until all of them are brought up
+#   - commit_fanout.*     commit of a pending change on N devices (Pending changes -> Commit), until all of them have finished
+# The first three run offline against reply fixtures, generated by the simulated devices (see netconf_simulator.py). The last two run
+# the application against simulated devices on the localhost (use --no-simulator to skip them).
+# The results are stored as JSON. When a baseline (results of an earlier run) is given, the results are compared with it and the exit code
+# is 1, if any benchmark has become slower by more than the threshold.
+#   Usage: python benchmarks/bench_suite.py [--output results.json] [--baseline baseline.json] [--threshold 0.25] [--quick]
+#          [--only PREFIX] [--no-simulator] [--latency S]
+
+INTERFACE_COUNTS = [10, 100, 1000, 5000]
+VLAN_INTERFACE_COUNTS = [10, 100, 1000]
+DEVICE_COUNTS = [10, 50]
+OSPF_INTERFACES = 16
+REPEAT = 7 # Offline benchmarks
+SIMULATOR_RUNS = 3
+FILTER_ITERATIONS = 100 # Filters are built many times per measurement, the time of one construction is reported
+DEVICE_TIMEOUT = 300 # Seconds to wait for the devices to be brought up / committed
+
+QUICK_INTERFACE_COUNTS = [10, 100, 1000]
+QUICK_DEVICE_COUNTS = [5]
+QUICK_REPEAT = 3
+QUICK_SIMULATOR_RUNS = 1
+
+THRESHOLD = 0.25 # Slowdown (relative to the baseline) reported as a regression
+NOISE_FLOOR_MS = 0.5 # Differences below this are never reported as regressions (timer resolution, scheduling)
+
+
+# ---------- HELPERS: ----------
+class _RawReply:
+    """Stands for the ncclient reply, from which the NCElement is created."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def __str__(self):
+        return(self._raw)
+
+class _FixtureManager:
+    """Stands for the ncclient manager - answers every <get> with the recorded reply."""
+
+    def __init__(self, reply):
+        self.reply = reply
+
+    def get(self, filter=None):
+        return(self.reply)
+
+def _print(*args) -> None:
+    """Prints to the terminal, even when the application redirects stdout to its console."""
+
+    print(*args, file=sys.__stdout__, flush=True)
+
+def _recordReply(personality, interfaces) -> object:
+    """
+    Records the reply of a simulated device to the <get> of all the interfaces, in the form ncclient returns it:
+    GetReply (raw XML) for Cisco, NCElement (parsed by the Junos device handler) for Juniper.
+    """
+
+    return(_ncclientReply(personality, _recordRawReply(personality, interfaces)))
+
+def _recordRawReply(personality, interfaces) -> str:
+    """Records the raw reply (XML) of a simulated device to the <get> of all the interfaces."""
+
+    device = SimulatedDevice(personality, interfaces=interfaces, routes=0)
+    filter_xml = str(OpenconfigInterfaces_Get_GetAllInterfaces_Filter())
+    rpc = ET.fromstring(f'<rpc xmlns="{BASE_NS}" message-id="1"><get>{filter_xml}</get></rpc>')
+    return(f'<rpc-reply xmlns="{BASE_NS}" message-id="1">{device.handleRpc(0, rpc)}</rpc-reply>')
+
+def _ncclientReply(personality, raw_reply) -> object:
+    """Creates the reply object from the raw reply, the same as ncclient does (for Juniper, this is where the reply is parsed)."""
+
+    if personality == "iosxe":
+        return(GetReply(raw_reply))
+    return(NCElement(_RawReply(raw_reply), JunosDeviceHandler({"name": "junos"}).transform_reply()))
+
+def _fixtureDevice(personality, reply) -> bulk.HeadlessDevice:
+    device = bulk.HeadlessDevice({"address": ipaddress.ip_address("127.0.0.1"), "port": 830, "username": "admin", "password": "admin", "device_params": personality})
+    device.mngr = _FixtureManager(reply)
+    return(device)
+
+def _interfaceNames(personality, count) -> list:
+    if personality == "iosxe":
+        return([f"GigabitEthernet{index}" for index in range(1, count + 1)])
+    return([f"ge-0/0/{index}" for index in range(count)])
+
+def _ospfArguments(personality) -> tuple:
+    names = _interfaceNames(personality, OSPF_INTERFACES)
+    networks = {name: [ipaddress.IPv4Network(f"192.168.{index}.0/24")] for index, name in enumerate(names)}
+    return("0", 10, 40, 10000, "1.1.1.1", names[:2], networks)
+
+def _ipsecArguments(personality) -> tuple:
+    names = _interfaceNames(personality, 2)
+    dev_parameters = {
+        "LAN_interface": names[0],
+        "WAN_interface": names[1],
+        "local_private_network": ipaddress.IPv4Network("10.1.0.0/24"),
+        "remote_private_network": ipaddress.IPv4Network("10.2.0.0/24"),
+        "remote_peer_ip": ipaddress.IPv4Address("203.0.113.2"),
+        "local_peer_ip": ipaddress.IPv4Address("203.0.113.1"),
+        "cisco_specific": {"acl_number": 150, "isakmp_policy_number": 10, "crypto_map_sequence": 10}
+    }
+    ike_parameters = {"authentication": "sha256", "encryption": "aes-256", "dh": "group14", "lifetime": "86400", "psk": "benchmark"}
+    ipsec_parameters = {"authentication": "sha256-hmac", "encryption": "aes-256", "lifetime": "3600"}
+    return(dev_parameters, ike_parameters, ipsec_parameters)
+
+def _vlanInterfaces(count) -> dict:
+    return({f"GigabitEthernet1/0/{index}": {"vlan_data": {"port_mode": "trunk", "vlan": ["10", "20", "30"]}} for index in range(count)})
+
+def _measure(function, repeat, iterations=1) -> list:
+    """Returns the times (in seconds) of one call of the function, measured repeat times (each time as the average of iterations calls)."""
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        times.append((time.perf_counter() - start) / iterations)
+    return(times)
+
+def _summary(times) -> dict:
+    return({
+        "median_ms": round(statistics.median(times) * 1000, 4),
+        "min_ms": round(min(times) * 1000, 4),
+        "runs": len(times)
+    })
+
+def _waitUntil(app, condition, what) -> None:
+    """Processes the Qt events (signals from the worker threads) until the condition is met."""
+
+    deadline = time.monotonic() + DEVICE_TIMEOUT
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Timed out waiting for {what}.")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+# ---------- OFFLINE BENCHMARKS: ----------
+def benchmarkOffline(interface_counts, repeat, selected) -> dict:
+    """Benchmarks of the parsing and the filter construction, running against the recorded reply fixtures."""
+
+    results = {}
+
+    # INTERFACES PARSING
+    for personality in ("iosxe", "junos"):
+        for count in interface_counts:
+            name = f"interfaces.parse.{personality}.{count}"
+            if not selected(name):
+                continue
+            device = _fixtureDevice(personality, _recordReply(personality, count))
+            interfaces, _ = getInterfacesWithNetconf(device)
+            assert len(interfaces) == count, f"{name}: {len(interfaces)} interfaces parsed"
+            results[name] = _summary(_measure(lambda: getInterfacesWithNetconf(device), repeat))
+
+    # REPLY CONVERSION (largest reply)
+    # Juniper replies are parsed by ncclient, when the NCElement is created (convertToEtree only reuses its tree), so the creation is measured as well
+    for personality in ("iosxe", "junos"):
+        name = f"convert_to_etree.{personality}"
+        if not selected(name):
+            continue
+        if personality == "iosxe":
+            reply = _recordReply(personality, max(interface_counts))
+            results[name] = _summary(_measure(lambda: utils.convertToEtree(reply, personality), repeat))
+        else:
+            raw_reply = _recordRawReply(personality, max(interface_counts))
+            results[name] = _summary(_measure(lambda: utils.convertToEtree(_ncclientReply(personality, raw_reply), personality), repeat))
+
+    # FILTER CONSTRUCTION
+    ospf_iosxe, ospf_junos = _ospfArguments("iosxe"), _ospfArguments("junos")
+    ipsec_iosxe, ipsec_junos = _ipsecArguments("iosxe"), _ipsecArguments("junos")
+    filters = {
+        "filter.ospf.iosxe": lambda: CiscoIOSXEOspf_Editconfig_ConfigureOspf_Filter(*ospf_iosxe),
+        "filter.ospf.junos": lambda: OpenconfigNetworkInstance_Editconfig_ConfigureOspf_Filter(*ospf_junos),
+        "filter.ipsec.iosxe": lambda: CiscoIOSXENative_Editconfig_ConfigureIPSec_Filter(*ipsec_iosxe),
+        "filter.ipsec.junos": lambda: JunosConf_Editconfig_ConfigureIPSec_Filter(*ipsec_junos),
+    }
+    for count in VLAN_INTERFACE_COUNTS:
+        vlan_interfaces = _vlanInterfaces(count)
+        filters[f"filter.vlan.{count}"] = lambda vlan_interfaces=vlan_interfaces: OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter(vlan_interfaces)
+
+    for name, build in filters.items():
+        if selected(name):
+            results[name] = _summary(_measure(build, repeat, FILTER_ITERATIONS))
+
+    return(results)
+
+
+# ---------- SIMULATOR BENCHMARKS: ----------
+def benchmarkSimulator(device_counts, runs, latency, selected) -> dict:
+    """
+    Benchmarks of the application against simulated devices: loading the devices from file (bring-up of all of them)
+    and the commit fan-out (a staged hostname change on every device, committed from the Pending changes widget).
+    """
+
+    import main as application
+    from devices import Device
+
+    results = {}
+    device_counts = [count for count in device_counts if selected(f"load_devices.{count}") or selected(f"commit_fanout.{count}")]
+    if not device_counts:
+        return(results)
+
+    app = QApplication.instance() or QApplication([])
+    simulator = NetconfSimulator()
+    saved_devices = []
+    for index in range(max(device_counts)):
+        personality = ("iosxe", "junos")[index % 2]
+        port = simulator.addDevice(SimulatedDevice(personality, f"sim-{personality}-{index}", latency=latency))
+        saved_devices.append({
+            "type": PERSONALITY_DEVICE_TYPES[personality],
+            "ip_address": f"{simulator.host}:{port}",
+            "username": simulator.username,
+            "password": simulator.password,
+            "vendor": personality,
+            "location": {"x": float(index % 20 * 120), "y": float(index // 20 * 120)},
+        })
+    simulator.start()
+
+    window = application.MainWindow()
+    pending_changes = window.pendigChangesDockWidget
+    working_directory = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory) # The application loads "saved_devices.json" from the working directory
+            for count in device_counts:
+                with open("saved_devices.json", mode="w") as f:
+                    json.dump({"devices": saved_devices[:count]}, f)
+
+                load_times, commit_times = [], []
+                for run in range(runs):
+                    start = time.perf_counter()
+                    window._loadDevicesFromFile()
+                    _waitUntil(app, lambda: not window.devices_being_brought_up, f"{count} devices to be brought up")
+                    load_times.append(time.perf_counter() - start)
+
+                    devices = Device.getAllDevicesInstances()
+                    if len(devices) != count:
+                        raise RuntimeError(f"Only {len(devices)} of {count} devices have been brought up.")
+
+                    if selected(f"commit_fanout.{count}"):
+                        for device in devices:
+                            device.setHostname(f"bench-{run}-{device.id}".replace(":", "-"))
+                        start = time.perf_counter()
+                        pending_changes._commitPendingChanges()
+                        _waitUntil(app, lambda: pending_changes.fan_out_operation is None, f"the commit on {count} devices")
+                        commit_times.append(time.perf_counter() - start)
+                        if any(device.has_pending_changes for device in devices):
+                            raise RuntimeError(f"The commit has failed on some of the {count} devices.")
+
+                    for device in devices:
+                        device.deleteDevice()
+                    app.processEvents()
+
+                if selected(f"load_devices.{count}"):
+                    results[f"load_devices.{count}"] = _summary(load_times)
+                if commit_times:
+                    results[f"commit_fanout.{count}"] = _summary(commit_times)
+    finally:
+        os.chdir(working_directory)
+        window.close()
+        simulator.stop()
+
+    return(results)
+
+
+# ---------- RESULTS: ----------
+def compareResults(results, baseline, threshold) -> list:
+    """
+    Prints the comparison of the results with the baseline.
+    Returns:
+        list: Names of the benchmarks, which have become slower by more than the threshold (and more than NOISE_FLOOR_MS).
+    """
+
+    regressions = []
+    _print(f"{'benchmark':<32} {'baseline (ms)':>14} {'current (ms)':>13} {'change':>8}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            _print(f"{name:<32} {'-':>14} {result['median_ms']:>13.3f} {'new':>8}")
+            continue
+
+        change = result["median_ms"] / previous["median_ms"] - 1 if previous["median_ms"] else 0.0
+        regressed = change > threshold and result["median_ms"] - previous["median_ms"] > NOISE_FLOOR_MS
+        if regressed:
+            regressions.append(name)
+        _print(f"{name:<32} {previous['median_ms']:>14.3f} {result['median_ms']:>13.3f} {change:>+7.0%}{'  REGRESSION' if regressed else ''}")
+    return(regressions)
+
+
+# ---------- MAIN: ----------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end benchmark suite of the inventory, edit and commit paths.")
+    parser.add_argument("--output", metavar="PATH", help="Store the results as JSON.")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare the results with the results of an earlier run (JSON).")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help=f"Relative slowdown reported as a regression (default: {THRESHOLD}).")
+    parser.add_argument("--quick", action="store_true", help="Fewer sizes and repetitions (smoke run).")
+    parser.add_argument("--only", metavar="PREFIX", action="append", help="Run only the benchmarks starting with the prefix (can be repeated).")
+    parser.add_argument("--no-simulator", action="store_true", help="Run only the offline benchmarks (no simulated devices, no GUI).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Time (in seconds) the simulated devices wait before every reply.")
+    args = parser.parse_args()
+
+    selected = lambda name: not args.only or any(name.startswith(prefix) for prefix in args.only)
+    interface_counts = QUICK_INTERFACE_COUNTS if args.quick else INTERFACE_COUNTS
+    device_counts = QUICK_DEVICE_COUNTS if args.quick else DEVICE_COUNTS
+    repeat = QUICK_REPEAT if args.quick else REPEAT
+    runs = QUICK_SIMULATOR_RUNS if args.quick else SIMULATOR_RUNS
+
+    results = benchmarkOffline(interface_counts, repeat, selected)
+    if not args.no_simulator:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull): # RPCs printed by the application
+            results.update(benchmarkSimulator(device_counts, runs, args.latency, selected))
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compareResults(results, baseline, args.threshold)
+
+    if args.output:
+        with open(args.output, mode="w") as f:
+            json.dump({
+                "meta": {
+                    "date": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "quick": args.quick,
+                    "latency": args.latency
+                },
+                "results": results
+            }, f, indent=4)
+
+    if regressions:
+        _print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
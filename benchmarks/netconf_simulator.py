@@ -0,0 +1,794 @@
+# ---------- IMPORTS: ----------
+# Standard library
+import os
+import re
+import sys
+import copy
+import json
+import time
+import socket
+import logging
+import argparse
+import itertools
+import selectors
+import threading
+import functools
+import ipaddress
+import paramiko
+from lxml import etree as ET
+
+# Custom modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from yang.filters import listEntryKey
+
+# Local NETCONF-over-SSH simulator of Cisco IOS-XE and Juniper Junos devices, for the benchmarks and for trying the application
+# without real devices. Every simulated device listens on its own port of the localhost, has its own running and candidate datastore
+# and answers the RPCs used by the application: get, get-config, edit-config, validate, commit (confirmed and persistent confirmed as well), discard-changes,
+# cancel-commit, lock, unlock, close-session, kill-session and the Junos RPCs (commit-configuration, get-route-information, get-zones-information,
+# load-configuration).
+# The datastores are plain XML trees - the changes are not validated against the YANG models.
+#   Usage: python benchmarks/netconf_simulator.py [--devices N] [--personality iosxe|junos|mixed] [--interfaces N] [--routes N] [--latency S]
+#          [--save-devices saved_devices.json] (file, which can be loaded in the application - "Load devices")
+
+BASE_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+OPENCONFIG_INTERFACES_NS = "http://openconfig.net/yang/interfaces"
+OPENCONFIG_IP_NS = "http://openconfig.net/yang/interfaces/ip"
+OPENCONFIG_SYSTEM_NS = "http://openconfig.net/yang/system"
+IOSXE_NATIVE_NS = "http://cisco.com/ns/yang/Cisco-IOS-XE-native"
+IOSXE_VLAN_NS = "http://cisco.com/ns/yang/Cisco-IOS-XE-vlan"
+IETF_ROUTING_NS = "urn:ietf:params:xml:ns:yang:ietf-routing"
+JUNOS_CONF_NS = "http://yang.juniper.net/junos"
+JUNOS_ROUTING_NS = "http://xml.juniper.net/junos/24.2R1/junos-routing"
+
+END_OF_MESSAGE = b"]]>]]>" # NETCONF 1.0 framing (RFC 6242, section 4.3)
+CHUNK_HEADER = re.compile(rb"\n#(#|[1-9][0-9]*)\n") # NETCONF 1.1 chunked framing (RFC 6242, section 4.2)
+MAX_CHUNK_HEADER_LENGTH = 13 # "\n#" + up to 10 digits + "\n"
+BASE_CAPABILITIES = (
+    "urn:ietf:params:netconf:base:1.0",
+    "urn:ietf:params:netconf:base:1.1",
+    "urn:ietf:params:netconf:capability:candidate:1.0",
+    "urn:ietf:params:netconf:capability:confirmed-commit:1.0",
+    "urn:ietf:params:netconf:capability:confirmed-commit:1.1",
+    "urn:ietf:params:netconf:capability:validate:1.0",
+    "urn:ietf:params:netconf:capability:validate:1.1",
+    "urn:ietf:params:netconf:capability:rollback-on-error:1.0",
+    "http://openconfig.net/yang/interfaces?module=openconfig-interfaces",
+    "http://openconfig.net/yang/interfaces/ip?module=openconfig-if-ip",
+)
+PERSONALITY_CAPABILITIES = {
+    "iosxe": ("urn:ietf:params:netconf:capability:writable-running:1.0",
+              "http://cisco.com/ns/yang/Cisco-IOS-XE-native?module=Cisco-IOS-XE-native",
+              "urn:ietf:params:xml:ns:yang:ietf-routing?module=ietf-routing"),
+    "junos": ("http://xml.juniper.net/netconf/junos/1.0",
+              "http://xml.juniper.net/dmi/system/1.0",
+              "http://openconfig.net/yang/system?module=openconfig-system"),
+}
+# Device types, under which the simulated devices are saved for the application (see --save-devices)
+PERSONALITY_DEVICE_TYPES = {"iosxe": "IOSXERouter", "junos": "JUNOSFirewall"}
+
+# Leaves, which are leaf-lists - merging another value adds it, instead of overwriting the present one
+LEAF_LIST_NAMES = {"trunk-vlans", "interface"}
+
+MAX_ROLLBACK_HISTORY = 50
+session_ids = itertools.count(1)
+
+
+class RpcError(Exception):
+    """The <rpc-error> returned to the client (RFC 6241, appendix A)."""
+
+    def __init__(self, tag, message, error_type="application") -> "RpcError":
+        super().__init__(message)
+        self.tag = tag
+        self.error_type = error_type
+
+    def toXml(self) -> str:
+        return(f"<rpc-error><error-type>{self.error_type}</error-type><error-tag>{self.tag}</error-tag>"
+               f"<error-severity>error</error-severity><error-message>{_escape(str(self))}</error-message></rpc-error>")
+
+
+# ---------- SIMULATED DEVICE: ----------
+class SimulatedDevice:
+    """
+    The datastores and the RPC handlers of one simulated device. Used by all the NETCONF sessions to the device (guarded by a lock).
+    Attributes:
+        personality (str): "iosxe" or "junos" - the data models and the RPCs the device answers.
+        latency (float): Time (in seconds) waited before every reply.
+        running, candidate (lxml.etree._Element): The datastores (<data> elements).
+        locks (dict): Datastore -> ID of the session holding the lock.
+        history (list): The committed configurations, history[0] is the running one (Junos rollback numbers).
+    """
+
+    def __init__(self, personality="iosxe", hostname=None, interfaces=8, routes=100, vlans=4, zones=2, latency=0.0) -> "SimulatedDevice":
+        if personality not in PERSONALITY_CAPABILITIES:
+            raise ValueError(f"Unsupported personality: {personality}")
+        self.personality = personality
+        self.latency = latency
+        self.routes = routes
+        self.capabilities = BASE_CAPABILITIES + PERSONALITY_CAPABILITIES[personality]
+        self.lock = threading.RLock()
+        self.sessions = {} # session ID -> NetconfServerSession
+
+        self.running = _buildConfiguration(personality, hostname or f"sim-{personality}", interfaces, vlans, zones)
+        self.candidate = copy.deepcopy(self.running)
+        self.history = [copy.deepcopy(self.running)]
+        self.locks = {}
+        self.confirmed_commit = None # (session ID, configuration to revert to, timer, persist token) of the pending confirmed commit
+        self._operational = None # Running configuration with the state data, built on the first <get> after every change
+
+        self.handlers = {
+            "get": self._get,
+            "get-config": self._getConfig,
+            "edit-config": self._editConfig,
+            "validate": lambda session_id, operation: None,
+            "commit": self._commit,
+            "discard-changes": self._discardChanges,
+            "cancel-commit": self._cancelCommit,
+            "lock": self._lock,
+            "unlock": self._unlock,
+            "close-session": lambda session_id, operation: None,
+            "kill-session": self._killSession,
+        }
+        if personality == "junos":
+            self.handlers.update({
+                "get-route-information": self._getRouteInformation,
+                "get-zones-information": self._getZonesInformation,
+                "commit-configuration": self._commitConfiguration,
+                "load-configuration": self._loadConfiguration,
+            })
+
+    def handleRpc(self, session_id, rpc) -> str:
+        """
+        Performs the RPC and returns the body of the <rpc-reply> (<ok/>, <data>, ... or <rpc-error>).
+        Args:
+            session_id (int): The session, over which the RPC was received.
+            rpc (lxml.etree._Element): The <rpc> element.
+        """
+
+        operation = next(rpc.iterchildren(ET.Element), None)
+        if self.latency:
+            time.sleep(self.latency)
+        try:
+            if operation is None:
+                raise RpcError("missing-element", "The RPC does not contain any operation.", "rpc")
+            handler = self.handlers.get(ET.QName(operation).localname)
+            if handler is None:
+                raise RpcError("operation-not-supported", f"Operation {ET.QName(operation).localname} is not supported.", "protocol")
+            with self.lock:
+                reply = handler(session_id, operation)
+            return("<ok/>" if reply is None else reply)
+        except RpcError as e:
+            return(e.toXml())
+
+    def closeSession(self, session_id) -> None:
+        """Releases the locks of the session and reverts its pending confirmed commit (RFC 6241, section 8.4.1)."""
+
+        with self.lock:
+            self.sessions.pop(session_id, None)
+            self.locks = {datastore: owner for datastore, owner in self.locks.items() if owner != session_id}
+            if self.confirmed_commit is not None and self.confirmed_commit[0] == session_id:
+                self._revertConfirmedCommit()
+
+    # OPERATIONS
+    def _get(self, session_id, operation) -> str:
+        if self._operational is None:
+            self._operational = _addStateData(copy.deepcopy(self.running))
+        filter_element = operation.find(f"{{{BASE_NS}}}filter")
+        data = _subtreeFilter(self._operational, filter_element)
+        routes = ""
+        if self.personality == "iosxe" and (filter_element is None or any(ET.QName(node).localname == "routing-state" for node in filter_element.iterchildren(ET.Element))):
+            routes = _ietfRoutingState(self.routes, len(self.running.findall(f".//{{{OPENCONFIG_INTERFACES_NS}}}interface")))
+        return(_dataReply(data, routes))
+
+    def _getConfig(self, session_id, operation) -> str:
+        datastore = self._datastore(operation, "source")
+        return(_dataReply(_subtreeFilter(datastore, operation.find(f"{{{BASE_NS}}}filter"))))
+
+    def _editConfig(self, session_id, operation) -> None:
+        target = self._datastoreName(operation, "target")
+        self._checkLock(session_id, target)
+        config = next((child for child in operation.iterchildren(ET.Element) if ET.QName(child).localname == "config"), None)
+        if config is None:
+            raise RpcError("missing-element", "The <edit-config> does not contain any <config>.", "protocol")
+        default_operation = operation.findtext(f"{{{BASE_NS}}}default-operation") or "merge"
+
+        datastore = copy.deepcopy(self.running if target == "running" else self.candidate) # rollback-on-error
+        _mergeEdit(datastore, config, default_operation)
+        if target == "running":
+            self._setRunning(datastore)
+        else:
+            self.candidate = datastore
+
+    def _commit(self, session_id, operation) -> None:
+        confirmed = operation.find(f"{{{BASE_NS}}}confirmed") is not None
+        self._checkPersistId(operation)
+        self._commitCandidate(session_id, confirmed, int(operation.findtext(f"{{{BASE_NS}}}confirm-timeout") or 600), operation.findtext(f"{{{BASE_NS}}}persist"))
+
+    def _commitConfiguration(self, session_id, operation) -> None:
+        """Junos <commit-configuration> - the confirm timeout is in minutes, <check/> only validates the candidate."""
+
+        if operation.find("check") is not None:
+            return
+        confirmed = operation.find("confirmed") is not None
+        self._commitCandidate(session_id, confirmed, int(operation.findtext("confirm-timeout") or 10) * 60)
+
+    def _discardChanges(self, session_id, operation) -> None:
+        self._checkLock(session_id, "candidate")
+        self.candidate = copy.deepcopy(self.running)
+
+    def _cancelCommit(self, session_id, operation) -> None:
+        if self.confirmed_commit is None:
+            raise RpcError("operation-failed", "There is no confirmed commit to cancel.")
+        self._checkPersistId(operation)
+        self._revertConfirmedCommit()
+
+    def _lock(self, session_id, operation) -> None:
+        target = self._datastoreName(operation, "target")
+        owner = self.locks.get(target)
+        if owner is not None and owner in self.sessions:
+            raise RpcError("lock-denied", f"Lock failed, lock is already held by session {owner}.", "protocol")
+        self.locks[target] = session_id
+
+    def _unlock(self, session_id, operation) -> None:
+        target = self._datastoreName(operation, "target")
+        if self.locks.get(target) != session_id:
+            raise RpcError("operation-failed", f"The {target} datastore is not locked by this session.", "protocol")
+        del self.locks[target]
+
+    def _killSession(self, session_id, operation) -> None:
+        killed_id = int(operation.findtext(f"{{{BASE_NS}}}session-id") or 0)
+        session = self.sessions.get(killed_id)
+        if session is None or killed_id == session_id:
+            raise RpcError("invalid-value", f"Session {killed_id} can not be killed.", "protocol")
+        session.close()
+        self.closeSession(killed_id)
+
+    def _getRouteInformation(self, session_id, operation) -> str:
+        return(_junosRouteInformation(self.routes, len(self.running.findall(f".//{{{OPENCONFIG_INTERFACES_NS}}}interface"))))
+
+    def _getZonesInformation(self, session_id, operation) -> str:
+        parts = ["<zones-information>"]
+        for zone in self.running.iterfind(f".//{{{JUNOS_CONF_NS}}}security-zone"):
+            interfaces = zone.findall(f"{{{JUNOS_CONF_NS}}}interfaces/{{{JUNOS_CONF_NS}}}name")
+            parts.append(f"<zones-security><zones-security-zonename>{_escape(zone.findtext(f'{{{JUNOS_CONF_NS}}}name'))}</zones-security-zonename>"
+                         f"<zones-security-interfaces-bound>{len(interfaces)}</zones-security-interfaces-bound><zones-security-interfaces>")
+            parts.extend(f"<zones-security-interface-name>{_escape(interface.text)}</zones-security-interface-name>" for interface in interfaces)
+            parts.append("</zones-security-interfaces></zones-security>")
+        parts.append("</zones-information>")
+        return("".join(parts))
+
+    def _loadConfiguration(self, session_id, operation) -> str:
+        self._checkLock(session_id, "candidate")
+        rollback = int(operation.get("rollback", 0))
+        if rollback >= len(self.history):
+            raise RpcError("invalid-value", f"Rollback {rollback} does not exist.")
+        self.candidate = copy.deepcopy(self.history[rollback])
+        return("<load-configuration-results><ok/></load-configuration-results>")
+
+    # HELPERS
+    def _datastoreName(self, operation, parameter) -> str:
+        element = operation.find(f"{{{BASE_NS}}}{parameter}")
+        datastore = next(element.iterchildren(ET.Element), None) if element is not None else None
+        if datastore is None or ET.QName(datastore).localname not in ("running", "candidate"):
+            raise RpcError("invalid-value", f"Unsupported {parameter} datastore.", "protocol")
+        return(ET.QName(datastore).localname)
+
+    def _datastore(self, operation, parameter) -> ET.Element:
+        return(self.running if self._datastoreName(operation, parameter) == "running" else self.candidate)
+
+    def _checkLock(self, session_id, datastore) -> None:
+        owner = self.locks.get(datastore)
+        if owner is not None and owner != session_id and owner in self.sessions:
+            raise RpcError("in-use", f"The {datastore} datastore is locked by session {owner}.")
+
+    def _setRunning(self, configuration) -> None:
+        self.running = configuration
+        self._operational = None
+        self.history.insert(0, copy.deepcopy(configuration))
+        del self.history[MAX_ROLLBACK_HISTORY:]
+
+    def _checkPersistId(self, operation) -> None:
+        """The persistent confirmed commit can be confirmed or cancelled only with its persist token as the <persist-id> (RFC 6241, section 8.4.5.1)."""
+
+        persist_id = operation.findtext(f"{{{BASE_NS}}}persist-id")
+        if self.confirmed_commit is not None and self.confirmed_commit[3] is not None and persist_id != self.confirmed_commit[3]:
+            raise RpcError("invalid-value", "The persist-id does not match the pending confirmed commit.")
+
+    def _commitCandidate(self, session_id, confirmed, timeout, persist=None) -> None:
+        """
+        Commits the candidate. The confirmed commit is reverted, unless confirmed by another commit within the timeout (in seconds).
+        The confirmed commit with the persist token is not reverted, when its session is closed.
+        """
+
+        self._checkLock(session_id, "candidate")
+        previous = self.running
+        if self.confirmed_commit is not None: # The follow-up commit confirms the pending confirmed commit (or extends it)
+            previous = self.confirmed_commit[1]
+            self.confirmed_commit[2].cancel()
+            self.confirmed_commit = None
+
+        self._setRunning(copy.deepcopy(self.candidate))
+        if confirmed:
+            timer = threading.Timer(timeout, self._confirmedCommitExpired)
+            timer.daemon = True
+            self.confirmed_commit = (session_id if persist is None else None, previous, timer, persist)
+            timer.start()
+
+    def _revertConfirmedCommit(self) -> None:
+        self.confirmed_commit[2].cancel()
+        self._setRunning(self.confirmed_commit[1])
+        self.candidate = copy.deepcopy(self.running)
+        self.confirmed_commit = None
+
+    def _confirmedCommitExpired(self) -> None:
+        with self.lock:
+            if self.confirmed_commit is not None and self.confirmed_commit[2] is threading.current_thread():
+                self._revertConfirmedCommit()
+
+
+# ---------- DATA: ----------
+def _buildConfiguration(personality, hostname, interfaces, vlans, zones) -> ET.Element:
+    """Builds the initial configuration (<data> element) - OpenConfig interfaces, plus the native configuration of the personality."""
+
+    data = ET.Element(f"{{{BASE_NS}}}data", nsmap={None: BASE_NS})
+    interface_names = [_interfaceName(personality, index) for index in range(interfaces)]
+
+    if personality == "iosxe":
+        native = ET.SubElement(data, f"{{{IOSXE_NATIVE_NS}}}native", nsmap={None: IOSXE_NATIVE_NS})
+        ET.SubElement(native, f"{{{IOSXE_NATIVE_NS}}}version").text = "17.3"
+        ET.SubElement(native, f"{{{IOSXE_NATIVE_NS}}}hostname").text = hostname
+        vlan = ET.SubElement(native, f"{{{IOSXE_NATIVE_NS}}}vlan")
+        for vlan_id in range(10, 10 * (vlans + 1), 10):
+            vlan_list = ET.SubElement(vlan, f"{{{IOSXE_VLAN_NS}}}vlan-list", nsmap={None: IOSXE_VLAN_NS})
+            ET.SubElement(vlan_list, f"{{{IOSXE_VLAN_NS}}}id").text = str(vlan_id)
+            ET.SubElement(vlan_list, f"{{{IOSXE_VLAN_NS}}}name").text = f"VLAN{vlan_id}"
+    elif personality == "junos":
+        system = ET.SubElement(data, f"{{{OPENCONFIG_SYSTEM_NS}}}system", nsmap={None: OPENCONFIG_SYSTEM_NS})
+        ET.SubElement(ET.SubElement(system, f"{{{OPENCONFIG_SYSTEM_NS}}}config"), f"{{{OPENCONFIG_SYSTEM_NS}}}hostname").text = hostname
+        configuration = ET.SubElement(data, f"{{{JUNOS_CONF_NS}}}configuration", nsmap={None: JUNOS_CONF_NS})
+        ET.SubElement(configuration, f"{{{JUNOS_CONF_NS}}}version").text = "24.2R1.17"
+        ET.SubElement(ET.SubElement(configuration, f"{{{JUNOS_CONF_NS}}}system"), f"{{{JUNOS_CONF_NS}}}host-name").text = hostname
+        security_zones = ET.SubElement(ET.SubElement(configuration, f"{{{JUNOS_CONF_NS}}}security"), f"{{{JUNOS_CONF_NS}}}zones")
+        for zone in range(zones):
+            security_zone = ET.SubElement(security_zones, f"{{{JUNOS_CONF_NS}}}security-zone")
+            ET.SubElement(security_zone, f"{{{JUNOS_CONF_NS}}}name").text = ("trust", "untrust")[zone] if zone < 2 else f"zone{zone}"
+            for interface_name in interface_names[zone::max(zones, 1)]:
+                ET.SubElement(ET.SubElement(security_zone, f"{{{JUNOS_CONF_NS}}}interfaces"), f"{{{JUNOS_CONF_NS}}}name").text = f"{interface_name}.0"
+
+    interfaces_element = ET.SubElement(data, f"{{{OPENCONFIG_INTERFACES_NS}}}interfaces", nsmap={None: OPENCONFIG_INTERFACES_NS})
+    for index, interface_name in enumerate(interface_names):
+        interface = ET.SubElement(interfaces_element, f"{{{OPENCONFIG_INTERFACES_NS}}}interface")
+        ET.SubElement(interface, f"{{{OPENCONFIG_INTERFACES_NS}}}name").text = interface_name
+        config = ET.SubElement(interface, f"{{{OPENCONFIG_INTERFACES_NS}}}config")
+        ET.SubElement(config, f"{{{OPENCONFIG_INTERFACES_NS}}}name").text = interface_name
+        ET.SubElement(config, f"{{{OPENCONFIG_INTERFACES_NS}}}enabled").text = "true"
+        ET.SubElement(config, f"{{{OPENCONFIG_INTERFACES_NS}}}description").text = f"Simulated interface {index}"
+        subinterface = ET.SubElement(ET.SubElement(interface, f"{{{OPENCONFIG_INTERFACES_NS}}}subinterfaces"), f"{{{OPENCONFIG_INTERFACES_NS}}}subinterface")
+        ET.SubElement(subinterface, f"{{{OPENCONFIG_INTERFACES_NS}}}index").text = "0"
+        address = ET.SubElement(ET.SubElement(ET.SubElement(subinterface, f"{{{OPENCONFIG_IP_NS}}}ipv4", nsmap={None: OPENCONFIG_IP_NS}), f"{{{OPENCONFIG_IP_NS}}}addresses"), f"{{{OPENCONFIG_IP_NS}}}address")
+        ip = str(ipaddress.IPv4Address(0xC0A80001 + (index << 8))) # 192.168.<index>.1/24
+        ET.SubElement(address, f"{{{OPENCONFIG_IP_NS}}}ip").text = ip
+        address_config = ET.SubElement(address, f"{{{OPENCONFIG_IP_NS}}}config")
+        ET.SubElement(address_config, f"{{{OPENCONFIG_IP_NS}}}ip").text = ip
+        ET.SubElement(address_config, f"{{{OPENCONFIG_IP_NS}}}prefix-length").text = "24"
+    return(data)
+
+def _interfaceName(personality, index) -> str:
+    if personality == "iosxe":
+        return(f"GigabitEthernet{index + 1}")
+    return(f"ge-0/{index // 100}/{index % 100}")
+
+def _addStateData(data) -> ET.Element:
+    """Adds the state data (admin and operational status, addresses) to the OpenConfig interfaces, as returned by <get>."""
+
+    for interface in data.iterfind(f".//{{{OPENCONFIG_INTERFACES_NS}}}interface"):
+        enabled = interface.findtext(f"{{{OPENCONFIG_INTERFACES_NS}}}config/{{{OPENCONFIG_INTERFACES_NS}}}enabled") != "false"
+        state = ET.SubElement(interface, f"{{{OPENCONFIG_INTERFACES_NS}}}state")
+        ET.SubElement(state, f"{{{OPENCONFIG_INTERFACES_NS}}}name").text = interface.findtext(f"{{{OPENCONFIG_INTERFACES_NS}}}name")
+        ET.SubElement(state, f"{{{OPENCONFIG_INTERFACES_NS}}}admin-status").text = "UP" if enabled else "DOWN"
+        ET.SubElement(state, f"{{{OPENCONFIG_INTERFACES_NS}}}oper-status").text = "UP" if enabled else "DOWN"
+        for address_config in interface.iterfind(f".//{{{OPENCONFIG_IP_NS}}}address/{{{OPENCONFIG_IP_NS}}}config"):
+            address_state = copy.deepcopy(address_config)
+            address_state.tag = f"{{{OPENCONFIG_IP_NS}}}state"
+            address_config.addnext(address_state)
+    return(data)
+
+@functools.lru_cache(maxsize=16)
+def _ietfRoutingState(routes, interfaces) -> str:
+    """The ietf-routing <routing-state> with the specified number of routes. Serialized once, shared by all the devices of the same size."""
+
+    parts = [f'<routing-state xmlns="{IETF_ROUTING_NS}"><routing-instance><name>default</name><ribs><rib><name>ipv4-default</name>'
+             '<address-family>ipv4</address-family><default-rib>true</default-rib><routes>']
+    for index in range(routes):
+        prefix, next_hop, interface, protocol = _route(index, "iosxe", interfaces)
+        parts.append(f'<route><destination-prefix>{prefix}</destination-prefix><route-preference>{(1, 110, 20)[index % 3]}</route-preference>'
+                     f'<metric>0</metric><source-protocol>ietf-routing:{protocol}</source-protocol><active/>'
+                     f'<next-hop><outgoing-interface>{interface}</outgoing-interface><next-hop-address>{next_hop}</next-hop-address></next-hop></route>')
+    parts.append("</routes></rib></ribs></routing-instance></routing-state>")
+    return("".join(parts))
+
+@functools.lru_cache(maxsize=16)
+def _junosRouteInformation(routes, interfaces) -> str:
+    """The Junos <route-information> with the specified number of routes. Serialized once, shared by all the devices of the same size."""
+
+    parts = [f'<route-information xmlns="{JUNOS_ROUTING_NS}"><route-table><table-name>inet.0</table-name><destination-count>{routes}</destination-count>']
+    for index in range(routes):
+        prefix, next_hop, interface, protocol = _route(index, "junos", interfaces)
+        parts.append(f'<rt><rt-destination>{prefix}</rt-destination><rt-entry><active-tag>*</active-tag><current-active/><last-active/>'
+                     f'<protocol-name>{protocol.capitalize()}</protocol-name><preference>{(5, 10, 170)[index % 3]}</preference>'
+                     f'<nh><selected-next-hop/><to>{next_hop}</to><via>{interface}.0</via></nh></rt-entry></rt>')
+    parts.append("</route-table></route-information>")
+    return("".join(parts))
+
+def _route(index, personality, interfaces) -> tuple:
+    """Returns (prefix, next-hop, interface, protocol) of the route: 10.0.0.0/24, 10.0.1.0/24, ... over the interfaces of the device."""
+
+    prefix = f"{ipaddress.IPv4Address((0x0A000000 + (index << 8)) & 0xFFFFFFFF)}/24"
+    interface_index = index % max(interfaces, 1)
+    next_hop = str(ipaddress.IPv4Address(0xC0A80002 + (interface_index << 8))) # Neighbour on 192.168.<interface>.0/24
+    return(prefix, next_hop, _interfaceName(personality, interface_index), ("static", "ospf", "bgp")[index % 3])
+
+def _dataReply(data, extra="") -> str:
+    """Serializes the <data> element (with extra, already serialized, content)."""
+
+    content = "".join(ET.tostring(child, encoding="unicode") for child in data)
+    return(f"<data>{content}{extra}</data>")
+
+def _escape(text) -> str:
+    return((text or "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;"))
+
+
+# ---------- SUBTREE FILTERING: ----------
+def _subtreeFilter(data, filter_element) -> ET.Element:
+    """
+    Returns a copy of the data selected by the subtree filter (RFC 6241, section 6). All the data, when there is no filter.
+    The nodes of the filter without a namespace match the data nodes of any namespace.
+    """
+
+    if filter_element is None:
+        return(copy.deepcopy(data))
+    result = ET.Element(data.tag, nsmap=data.nsmap)
+    selected = _filterChildren(data, list(filter_element.iterchildren(ET.Element)))
+    if selected is not None and selected is not True:
+        result.extend(selected)
+    return(result)
+
+def _filterChildren(source, filter_nodes):
+    """
+    Filters the children of the source element.
+    Returns:
+        None if a content match node does not match, True if the whole source is selected (only content match nodes),
+        list of the selected children (copies) otherwise.
+    """
+
+    content_matches = [node for node in filter_nodes if not len(node) and (node.text or "").strip()]
+    for node in content_matches:
+        if not any(_tagMatches(child, node) and (child.text or "").strip() == node.text.strip() for child in source.iterchildren(ET.Element)):
+            return(None)
+    if len(content_matches) == len(filter_nodes):
+        return(True)
+
+    selected = []
+    for child in source.iterchildren(ET.Element):
+        for node in filter_nodes:
+            if not _tagMatches(child, node):
+                continue
+            if not len(node): # Content match or selection node
+                selected.append(copy.deepcopy(child))
+            else: # Containment node
+                children = _filterChildren(child, list(node.iterchildren(ET.Element)))
+                if children is True:
+                    selected.append(copy.deepcopy(child))
+                elif children:
+                    element = ET.Element(child.tag, nsmap=child.nsmap)
+                    element.extend(children)
+                    selected.append(element)
+            break
+    return(selected)
+
+def _tagMatches(element, filter_node) -> bool:
+    if filter_node.tag.startswith("{"):
+        return(element.tag == filter_node.tag)
+    return(ET.QName(element).localname == filter_node.tag)
+
+
+# ---------- EDIT-CONFIG: ----------
+def _mergeEdit(target, fragment, default_operation) -> None:
+    """
+    Applies the children of the fragment (<config> contents) to the target, following the "operation" attributes (RFC 6241, section 7.2):
+    merge, replace, create, delete and remove. List entries are matched by their keys (see yang.filters.LIST_KEYS).
+    """
+
+    for child in fragment.iterchildren(ET.Element):
+        operation = child.get(f"{{{BASE_NS}}}operation") or child.get("operation") or default_operation
+        match = _findEntry(target, child)
+
+        if operation in ("delete", "remove"):
+            if match is None:
+                if operation == "delete":
+                    raise RpcError("data-missing", f"The data to be deleted do not exist: {ET.QName(child).localname}.")
+                continue
+            target.remove(match)
+        elif operation == "create" and match is not None:
+            raise RpcError("data-exists", f"The data to be created already exist: {ET.QName(child).localname}.")
+        elif operation == "replace":
+            replacement = _stripOperations(copy.deepcopy(child))
+            if match is None:
+                target.append(replacement)
+            else:
+                target.replace(match, replacement)
+        else: # merge, create, none
+            if match is None:
+                match = ET.SubElement(target, child.tag, nsmap=child.nsmap)
+            if len(child):
+                _mergeEdit(match, child, "merge" if operation == "create" else operation)
+            else:
+                match.text = child.text
+
+def _findEntry(target, element) -> ET.Element:
+    """Returns the child of the target, which corresponds to the element (same list entry, same leaf-list value, same container or leaf)."""
+
+    candidates = [child for child in target.iterchildren(element.tag)]
+    if not candidates:
+        return(None)
+    key = listEntryKey(element)
+    if key is not None:
+        return(next((candidate for candidate in candidates if all((candidate.findtext(key_tag) or "").strip() == key_value for key_tag, key_value in key)), None))
+    if not len(element):
+        value = (element.text or "").strip()
+        same_value = next((candidate for candidate in candidates if (candidate.text or "").strip() == value), None)
+        if same_value is not None or ET.QName(element).localname in LEAF_LIST_NAMES or len(candidates) > 1:
+            return(same_value)
+    return(candidates[0])
+
+def _stripOperations(element) -> ET.Element:
+    for node in element.iter(ET.Element):
+        node.attrib.pop(f"{{{BASE_NS}}}operation", None)
+        node.attrib.pop("operation", None)
+    return(element)
+
+
+# ---------- SSH / NETCONF TRANSPORT: ----------
+class _SshServer(paramiko.ServerInterface):
+    """Password authentication and the "netconf" subsystem (RFC 6242) of one SSH connection."""
+
+    def __init__(self, username, password) -> "_SshServer":
+        self.username = username
+        self.password = password
+        self.subsystem_requested = threading.Event()
+        self.channel = None
+
+    def get_allowed_auths(self, username):
+        return("password")
+
+    def check_auth_password(self, username, password):
+        if self.username is None or (username == self.username and password == self.password):
+            return(paramiko.AUTH_SUCCESSFUL)
+        return(paramiko.AUTH_FAILED)
+
+    def check_channel_request(self, kind, chanid):
+        return(paramiko.OPEN_SUCCEEDED if kind == "session" else paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED)
+
+    def check_channel_subsystem_request(self, channel, name):
+        if name != "netconf":
+            return(False)
+        self.channel = channel
+        self.subsystem_requested.set()
+        return(True)
+
+
+class NetconfServerSession:
+    """One NETCONF session: the <hello> exchange, the framing (end-of-message or chunked) and the RPC loop."""
+
+    def __init__(self, device, channel) -> "NetconfServerSession":
+        self.device = device
+        self.channel = channel
+        self.session_id = next(session_ids)
+        self.chunked = False
+        self.buffer = b""
+        self.closed = False
+
+    def run(self) -> None:
+        with self.device.lock:
+            self.device.sessions[self.session_id] = self
+        try:
+            capabilities = "".join(f"<capability>{capability}</capability>" for capability in self.device.capabilities)
+            self._send(f'<?xml version="1.0" encoding="UTF-8"?><hello xmlns="{BASE_NS}"><capabilities>{capabilities}</capabilities>'
+                       f'<session-id>{self.session_id}</session-id></hello>')
+            client_hello = ET.fromstring(self._receive())
+            client_capabilities = {capability.text.strip() for capability in client_hello.iter(f"{{{BASE_NS}}}capability")}
+            self.chunked = "urn:ietf:params:netconf:base:1.1" in client_capabilities
+
+            while not self.closed:
+                message = self._receive()
+                if message is None:
+                    break
+                rpc = ET.fromstring(message)
+                attributes = "".join(f' {name}="{_escape(value)}"' for name, value in rpc.attrib.items())
+                reply = self.device.handleRpc(self.session_id, rpc)
+                self._send(f'<rpc-reply xmlns="{BASE_NS}"{attributes}>{reply}</rpc-reply>')
+                if ET.QName(next(rpc.iterchildren(ET.Element), rpc)).localname == "close-session":
+                    break
+        except (OSError, EOFError, ET.XMLSyntaxError, paramiko.SSHException):
+            pass
+        finally:
+            self.close()
+            self.device.closeSession(self.session_id)
+
+    def close(self) -> None:
+        self.closed = True
+        self.channel.close()
+
+    def _send(self, message) -> None:
+        data = message.encode("utf-8")
+        if self.chunked:
+            self.channel.sendall(b"\n#%d\n" % len(data) + data + b"\n##\n")
+        else:
+            self.channel.sendall(data + END_OF_MESSAGE)
+
+    def _receive(self) -> bytes:
+        """Returns the next message (None, when the channel was closed)."""
+
+        if not self.chunked:
+            while END_OF_MESSAGE not in self.buffer:
+                if not self._read():
+                    return(None)
+            message, self.buffer = self.buffer.split(END_OF_MESSAGE, 1)
+            return(message)
+
+        chunks = []
+        while True:
+            header = CHUNK_HEADER.match(self.buffer)
+            while header is None:
+                if len(self.buffer) > MAX_CHUNK_HEADER_LENGTH or not self._read():
+                    return(None)
+                header = CHUNK_HEADER.match(self.buffer)
+            self.buffer = self.buffer[header.end():]
+            if header.group(1) == b"#": # End of chunks
+                return(b"".join(chunks))
+
+            size = int(header.group(1))
+            while len(self.buffer) < size:
+                if not self._read():
+                    return(None)
+            chunks.append(self.buffer[:size])
+            self.buffer = self.buffer[size:]
+
+    def _read(self) -> bool:
+        data = self.channel.recv(65536)
+        self.buffer += data
+        return(bool(data))
+
+
+# ---------- SIMULATOR: ----------
+class NetconfSimulator:
+    """
+    Runs the simulated devices on the localhost, each on its own port. A single thread accepts the connections of all the devices,
+    every connection is then served by its own SSH transport (and session thread).
+        simulator = NetconfSimulator()
+        port = simulator.addDevice(SimulatedDevice("iosxe", routes=10000))
+        simulator.start()
+        ...
+        simulator.stop()
+    """
+
+    def __init__(self, host="127.0.0.1", username="admin", password="admin", host_key=None) -> "NetconfSimulator":
+        """
+        Args:
+            username, password (str): Credentials accepted by the devices. Any credentials are accepted, when username is None.
+            host_key (paramiko.PKey, optional): The SSH host key of the devices. A new RSA key is generated, when not specified.
+        """
+
+        self.host = host
+        self.username = username
+        self.password = password
+        self.host_key = host_key or paramiko.RSAKey.generate(2048)
+        self.devices = {} # port -> SimulatedDevice
+        self.selector = selectors.DefaultSelector()
+        self.transports = []
+        self.thread = None
+        self.running = False
+
+    def addDevice(self, device, port=0) -> int:
+        """Starts listening for the device. Returns the port (chosen by the system, when 0)."""
+
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((self.host, port))
+        listener.listen(64)
+        listener.setblocking(False)
+        port = listener.getsockname()[1]
+        self.devices[port] = device
+        self.selector.register(listener, selectors.EVENT_READ, device)
+        return(port)
+
+    def start(self) -> None:
+        self.running = True
+        self.thread = threading.Thread(target=self._acceptLoop, name="netconf-simulator", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+        for key in list(self.selector.get_map().values()):
+            self.selector.unregister(key.fileobj)
+            key.fileobj.close()
+        for transport in self.transports:
+            transport.close()
+
+    def _acceptLoop(self) -> None:
+        while self.running:
+            for key, _ in self.selector.select(timeout=0.2):
+                try:
+                    connection, _ = key.fileobj.accept()
+                except BlockingIOError:
+                    continue
+                connection.setblocking(True)
+                threading.Thread(target=self._serveConnection, args=(connection, key.data), daemon=True).start()
+
+    def _serveConnection(self, connection, device) -> None:
+        transport = paramiko.Transport(connection)
+        self.transports.append(transport)
+        transport.add_server_key(self.host_key)
+        server = _SshServer(self.username, self.password)
+        try:
+            transport.start_server(server=server)
+            channel = transport.accept(timeout=30)
+            if channel is None or not server.subsystem_requested.wait(timeout=30):
+                transport.close()
+                return
+            NetconfServerSession(device, channel).run()
+        except (paramiko.SSHException, EOFError, OSError):
+            pass
+        finally:
+            transport.close()
+            self.transports.remove(transport)
+
+
+# ---------- MAIN: ----------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulates NETCONF devices (Cisco IOS-XE / Juniper Junos) on the localhost.")
+    parser.add_argument("--devices", type=int, default=1, help="Number of the simulated devices.")
+    parser.add_argument("--base-port", type=int, default=8300, help="Port of the first device, the next devices use the next ports (0 - chosen by the system).")
+    parser.add_argument("--personality", choices=("iosxe", "junos", "mixed"), default="iosxe", help="Simulated operating system (mixed - alternating).")
+    parser.add_argument("--interfaces", type=int, default=8, help="Number of the interfaces of every device.")
+    parser.add_argument("--routes", type=int, default=100, help="Number of the routes of every device.")
+    parser.add_argument("--vlans", type=int, default=4, help="Number of the VLANs of every IOS-XE device.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Time (in seconds) waited before every reply.")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--save-devices", metavar="PATH", help="Save the devices in the format of saved_devices.json, so they can be loaded in the application.")
+    args = parser.parse_args()
+    logging.getLogger("paramiko").setLevel(logging.CRITICAL) # Clients closing the connection abruptly are not errors of the simulator
+
+    simulator = NetconfSimulator(username=args.username, password=args.password)
+    saved_devices = []
+    for index in range(args.devices):
+        personality = args.personality if args.personality != "mixed" else ("iosxe", "junos")[index % 2]
+        device = SimulatedDevice(personality, f"sim-{personality}-{index}", args.interfaces, args.routes, args.vlans, latency=args.latency)
+        port = simulator.addDevice(device, args.base_port + index if args.base_port else 0)
+        saved_devices.append({
+            "type": PERSONALITY_DEVICE_TYPES[personality],
+            "ip_address": f"{simulator.host}:{port}",
+            "username": args.username,
+            "password": args.password,
+            "vendor": personality,
+            "location": {"x": float(index % 20 * 120), "y": float(index // 20 * 120)},
+        })
+    simulator.start()
+
+    if args.save_devices:
+        with open(args.save_devices, mode="w") as f:
+            json.dump({"devices": saved_devices}, f, indent=4)
+    ports = sorted(simulator.devices)
+    print(f"{len(ports)} simulated devices on {simulator.host}, ports {ports[0]}-{ports[-1]} (username: {args.username}, password: {args.password}). Ctrl+C to stop.")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+# ---------- IMPORTS: ----------
+# Standard library
+import os
+import sys
+import csv
+import time
+import argparse
+import secrets
+import ipaddress
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# Custom modules
+import utils
+import modules.netconf as netconf
+import modules.interfaces as interfaces
+import modules.system as system
+import modules.vlan as vlan
+import modules.ospf as ospf
+from yang.filters import EditconfigBatch
+from definitions import CONFIGURATION_TARGET_DATASTORE, NETCONF_WORKER_POOL_SIZE
+
+# Headless runner of bulk changes. Loads a change plan (YAML or CSV, documented in doc/change_plan.md), connects to all the devices
+# in parallel, stages the changes through the same *WithNetconf functions the dialogs use, sends them in one edit-config per device
+# and commits them. No QApplication (and no window) is needed.
+#   Usage: python bulk.py plan.yaml [--workers N] [--no-commit] [--confirmed-commit TIMEOUT]
+
+DEFAULT_PORT = 830
+
+# CSV columns, which describe the device (the rest of the columns describe the changes)
+CSV_DEVICE_COLUMNS = ("address", "port", "username", "password", "vendor")
+
+# Capability needed by the confirmed commit of the runner - the commit has to survive the end of the session (the persist token),
+# until all the devices have been committed
+PERSISTENT_CONFIRMED_COMMIT_CAPABILITY = "urn:ietf:params:netconf:capability:confirmed-commit:1.1"
+
+
+# ---------- CHANGE PLAN: ----------
+def loadChangePlan(path) -> list:
+    """
+    Loads the change plan from a YAML or CSV file (based on the extension) and validates it.
+    Args:
+        path (str): Path to the change plan.
+    Returns:
+        list: The device plans (dictionaries, see _normalizeDevicePlan), in the order of the file.
+    Raises:
+        ValueError: If the plan is not valid.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".yaml", ".yml"):
+        return(_loadYamlPlan(path))
+    elif extension == ".csv":
+        return(_loadCsvPlan(path))
+    raise ValueError(f"Unsupported change plan format: {extension} (use .yaml, .yml or .csv)")
+
+def _loadYamlPlan(path) -> list:
+    """Loads the YAML change plan: a "devices" list and optional "defaults" applied to every device."""
+
+    try:
+        import yaml # Only needed for YAML change plans
+    except ImportError:
+        raise ValueError("YAML change plans require the PyYAML package (pip install pyyaml).")
+
+    with open(path) as f:
+        plan = yaml.safe_load(f) or {}
+    if not isinstance(plan, dict) or not isinstance(plan.get("devices"), list):
+        raise ValueError("The change plan must contain a \"devices\" list.")
+
+    defaults = plan.get("defaults") or {}
+    return([_normalizeDevicePlan({**defaults, **entry}) for entry in plan["devices"]])
+
+def _loadCsvPlan(path) -> list:
+    """
+    Loads the CSV change plan: one row per interface change, the rows of the same device (address and port) are grouped together.
+    Device-wide changes (hostname, OSPF process parameters) may be filled in any of the rows of the device.
+    """
+
+    devices = {} # (address, port) -> device entry, insertion ordered
+    with open(path, newline="") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            row = {column.strip(): value.strip() for column, value in row.items() if column and value and value.strip()}
+            if "address" not in row:
+                raise ValueError(f"Line {line}: missing address.")
+
+            key = (row["address"], str(row.get("port", DEFAULT_PORT)))
+            entry = devices.setdefault(key, {column: row[column] for column in CSV_DEVICE_COLUMNS if column in row})
+            entry.setdefault("interfaces", [])
+            if "hostname" in row:
+                entry["hostname"] = row["hostname"]
+
+            # OSPF - process parameters from any row, networks and passive flags per interface
+            ospf_columns = {column[5:]: value for column, value in row.items() if column.startswith("ospf_")}
+            if ospf_columns:
+                entry_ospf = entry.setdefault("ospf", {"networks": {}, "passive_interfaces": []})
+                for parameter in ("area", "hello_interval", "dead_interval", "reference_bandwidth", "router_id"):
+                    if parameter in ospf_columns:
+                        entry_ospf[parameter] = ospf_columns[parameter]
+                if "interface" in row and "network" in ospf_columns:
+                    entry_ospf["networks"].setdefault(row["interface"], []).extend(ospf_columns["network"].split())
+                if "interface" in row and ospf_columns.get("passive", "").lower() in ("1", "true", "yes"):
+                    entry_ospf["passive_interfaces"].append(row["interface"])
+
+            interface_change = {column: row[column] for column in ("interface", "subinterface", "ip", "delete_ip", "description", "port_mode", "vlan") if column in row}
+            if len(interface_change) > 1:
+                for column in ("ip", "delete_ip", "vlan"): # Multiple values are separated by spaces
+                    if column in interface_change:
+                        interface_change[column] = interface_change[column].split()
+                entry["interfaces"].append(interface_change)
+
+    return([_normalizeDevicePlan(entry) for entry in devices.values()])
+
+def _normalizeDevicePlan(entry) -> dict:
+    """
+    Validates the plan of one device and converts the values to the types expected by the *WithNetconf functions.
+    Returns:
+        dict:
+            - device_parameters (dict): address, port, username, password, device_params (same as Device.device_parameters).
+            - hostname (str or None): New hostname.
+            - interfaces (list): Interface changes, each with: interface, subinterface, ip and delete_ip (list of ipaddress.IPv4Interface/IPv6Interface),
+              description (str or None) and vlan_data (dict or None - same as in doc/interfaces_dictionary.md).
+            - ospf (dict or None): area, hello_interval, dead_interval, reference_bandwidth, router_id, passive_interfaces, networks (doc/ospf_networks.md).
+    Raises:
+        ValueError: If the plan is not valid.
+    """
+
+    address = entry.get("address")
+    try:
+        device_parameters = {
+            "address": ipaddress.ip_address(str(address)),
+            "port": int(entry.get("port", DEFAULT_PORT)),
+            "username": str(entry["username"]),
+            "password": str(entry["password"]),
+            "device_params": str(entry.get("vendor", "iosxe")),
+        }
+    except KeyError as e:
+        raise ValueError(f"Device {address}: missing {e.args[0]}.")
+    except ValueError as e:
+        raise ValueError(f"Device {address}: {e}")
+    if device_parameters["device_params"] not in ("iosxe", "junos"):
+        raise ValueError(f"Device {address}: unsupported vendor: {device_parameters['device_params']} (use iosxe or junos).")
+
+    device_plan = {
+        "device_parameters": device_parameters,
+        "hostname": str(entry["hostname"]) if entry.get("hostname") else None,
+        "interfaces": [],
+        "ospf": None,
+    }
+
+    for change in entry.get("interfaces") or []:
+        if not change.get("interface"):
+            raise ValueError(f"Device {address}: interface change without an interface name.")
+        try:
+            interface_change = {
+                "interface": str(change["interface"]),
+                "subinterface": str(change.get("subinterface", 0)),
+                "delete_ip": [ipaddress.ip_interface(ip) for ip in _asList(change.get("delete_ip"))],
+                "ip": [ipaddress.ip_interface(ip) for ip in _asList(change.get("ip"))],
+                "description": str(change["description"]) if change.get("description") is not None else None,
+                "vlan_data": None,
+            }
+        except ValueError as e:
+            raise ValueError(f"Device {address}, interface {change['interface']}: {e}")
+
+        if change.get("port_mode"):
+            if change["port_mode"] not in ("access", "trunk", "routed-port"):
+                raise ValueError(f"Device {address}, interface {change['interface']}: unsupported port mode: {change['port_mode']} (use access, trunk or routed-port).")
+            vlans = [str(vlan_id) for vlan_id in _asList(change.get("vlan"))]
+            if change["port_mode"] != "routed-port" and not vlans:
+                raise ValueError(f"Device {address}, interface {change['interface']}: port mode {change['port_mode']} needs a VLAN.")
+            interface_change["vlan_data"] = {"port_mode": change["port_mode"], "vlan": vlans}
+        device_plan["interfaces"].append(interface_change)
+
+    entry_ospf = entry.get("ospf")
+    if entry_ospf:
+        if entry_ospf.get("area") in (None, ""):
+            raise ValueError(f"Device {address}: OSPF area is required.")
+        try:
+            device_plan["ospf"] = {
+                "area": str(entry_ospf["area"]),
+                "hello_interval": _asOptionalString(entry_ospf.get("hello_interval")),
+                "dead_interval": _asOptionalString(entry_ospf.get("dead_interval")),
+                "reference_bandwidth": _asOptionalString(entry_ospf.get("reference_bandwidth")),
+                "router_id": str(ipaddress.IPv4Address(str(entry_ospf["router_id"]))) if entry_ospf.get("router_id") else None,
+                "passive_interfaces": [str(interface) for interface in _asList(entry_ospf.get("passive_interfaces"))],
+                "networks": {str(interface): [ipaddress.ip_network(network) for network in _asList(networks)] for interface, networks in (entry_ospf.get("networks") or {}).items()},
+            }
+        except ValueError as e:
+            raise ValueError(f"Device {address}, OSPF: {e}")
+
+    return(device_plan)
+
+def _asList(value) -> list:
+    """Accepts a single value or a list (YAML allows both), returns a list. None means an empty list."""
+
+    if value is None:
+        return([])
+    if isinstance(value, (list, tuple)):
+        return(list(value))
+    return([value])
+
+
+def _asOptionalString(value):
+    """The OSPF filters expect the same strings the dialog reads from its inputs. None (or empty) means not set."""
+
+    return(str(value) if value not in (None, "") else None)
+
+
+# ---------- HEADLESS DEVICE: ----------
+class HeadlessDevice:
+    """
+    Stands for the Device (devices.py) in the *WithNetconf functions, without being a QGraphicsItem - so no QApplication is needed.
+    Carries only what the functions use: the device parameters, the NETCONF session and the edit batch.
+    """
+
+    def __init__(self, device_parameters) -> "HeadlessDevice":
+        self.id = f"{device_parameters['address']}:{device_parameters['port']}"
+        self.device_parameters = device_parameters
+        self.mngr = None
+        self.edit_batch = EditconfigBatch()
+
+
+class HeadlessOSPFDevice:
+    """Stands for the OSPFDevice (devices.py) in ospf.configureOSPFWithNetconf."""
+
+    def __init__(self, original_device, router_id, passive_interfaces, ospf_networks) -> "HeadlessOSPFDevice":
+        self.original_device = original_device
+        self.device_parameters = original_device.device_parameters
+        self.router_id = router_id
+        self.passive_interfaces = passive_interfaces
+        self.ospf_networks = ospf_networks
+
+
+# ---------- OPERATIONS: ----------
+def stageDevicePlan(device, device_plan) -> list:
+    """
+    Stages the changes of the device plan through the *WithNetconf functions (in the edit batch of the device, see netconf.editNetconfConfig).
+    Returns:
+        list: Descriptions of the staged changes, in the same form as in the pending changes of the application.
+    Raises:
+        RuntimeError: If a change could not be staged.
+    """
+
+    changes = []
+
+    def stage(result, description) -> None:
+        if not result or not result[0]:
+            raise RuntimeError(f"Failed to stage: {description}")
+        changes.append(description)
+
+    if device_plan["hostname"]:
+        stage(system.setHostnameWithNetconf(device, device_plan["hostname"]), f"Set hostname: {device_plan['hostname']}")
+
+    for change in device_plan["interfaces"]:
+        interface_id, subinterface_index = change["interface"], change["subinterface"]
+        for old_ip in change["delete_ip"]:
+            stage(interfaces.deleteIpWithNetconf(device, interface_id, subinterface_index, old_ip), f"Delete IP: {old_ip} from interface: {interface_id}.{subinterface_index}")
+        for new_ip in change["ip"]:
+            stage(interfaces.setIpWithNetconf(device, interface_id, subinterface_index, new_ip), f"Set IP: {new_ip} on interface: {interface_id}.{subinterface_index}")
+        if change["description"] is not None:
+            stage(interfaces.editDescriptionWithNetconf(device, interface_id, change["description"]), f"Edit description of interface: {interface_id}")
+        if change["vlan_data"] is not None:
+            stage(vlan.setInterfaceVlanWithNetconf(device, {interface_id: {"vlan_data": change["vlan_data"]}}), f"Set VLAN configuration on interface: {interface_id}")
+
+    device_ospf = device_plan["ospf"]
+    if device_ospf:
+        ospf_device = HeadlessOSPFDevice(device, device_ospf["router_id"], device_ospf["passive_interfaces"], device_ospf["networks"])
+        stage(ospf.configureOSPFWithNetconf(ospf_device, device_ospf["area"], device_ospf["hello_interval"], device_ospf["dead_interval"], device_ospf["reference_bandwidth"]),
+              f"Configure OSPF area: {device_ospf['area']}")
+
+    return(changes)
+
+def runDevicePlan(device_plan, commit=True, confirmed=False, confirm_timeout=None, persist=None) -> dict:
+    """
+    Connects to the device, locks the datastore, stages and sends the changes of the device plan and commits them. Runs in a worker thread.
+    When anything fails, the changes are discarded from the candidate datastore, so the device is left as it was.
+    The confirmed commit is made persistent (with the persist token), so it is not reverted when the session is closed - it is confirmed
+    or cancelled later on, once all the devices have been committed (see finishConfirmedCommit).
+    Returns:
+        dict: id, status ("committed", "unconfirmed", "applied" or "failed"), changes (list of descriptions), error (str or None) and time (seconds).
+    """
+
+    start = time.perf_counter()
+    device = HeadlessDevice(device_plan["device_parameters"])
+    result = {"id": device.id, "status": "failed", "changes": [], "error": None, "time": 0.0}
+    locked = False
+
+    try:
+        device.mngr = netconf.establishNetconfConnection(device.device_parameters, device.id)
+        if CONFIGURATION_TARGET_DATASTORE == "candidate" and ":candidate" not in device.mngr.server_capabilities:
+            raise RuntimeError("The device does not support the candidate datastore.")
+        if confirmed and (device.device_parameters["device_params"] == "junos" or PERSISTENT_CONFIRMED_COMMIT_CAPABILITY not in device.mngr.server_capabilities):
+            raise RuntimeError("The device does not support the persistent confirmed commit (:confirmed-commit:1.1), which is needed by --confirmed-commit.")
+        device.mngr.lock(target=CONFIGURATION_TARGET_DATASTORE)
+        locked = True
+
+        result["changes"] = stageDevicePlan(device, device_plan)
+        for rpc_reply in netconf.applyNetconfChanges(device):
+            utils.printRpc(rpc_reply, "Apply staged changes", device)
+
+        if commit and CONFIGURATION_TARGET_DATASTORE == "candidate":
+            rpc_reply = netconf.commitNetconfChanges(device, confirmed, confirm_timeout, persist=persist if confirmed else None)
+            utils.printRpc(rpc_reply, "Commit changes", device)
+            result["status"] = "unconfirmed" if confirmed else "committed"
+        else:
+            result["status"] = "applied"
+    except Exception as e:
+        result["error"] = str(e)
+        utils.printGeneral(f"Bulk change on device {device.id} failed: {e}")
+        utils.printGeneral(traceback.format_exc())
+        if locked and CONFIGURATION_TARGET_DATASTORE == "candidate":
+            try:
+                netconf.discardNetconfChanges(device)
+            except Exception:
+                pass # Reported by discardNetconfChanges, the lock is released by closing the session anyway
+    finally:
+        if device.mngr is not None:
+            netconf.demolishNetconfConnection(device)
+
+    result["time"] = time.perf_counter() - start
+    return(result)
+
+def finishConfirmedCommit(device_plan, result, persist, confirm) -> dict:
+    """
+    Confirms (or cancels) the persistent confirmed commit made by runDevicePlan, over a new session. Runs in a worker thread.
+    Returns:
+        dict: The result of runDevicePlan, with the status changed to "committed", "cancelled" or "failed".
+    """
+
+    start = time.perf_counter()
+    device = HeadlessDevice(device_plan["device_parameters"])
+    try:
+        device.mngr = netconf.establishNetconfConnection(device.device_parameters, device.id)
+        device.mngr.lock(target=CONFIGURATION_TARGET_DATASTORE) # Nobody else's changes are committed together with the confirming commit
+        if confirm:
+            rpc_reply = netconf.commitNetconfChanges(device, persist_id=persist)
+            utils.printRpc(rpc_reply, "Confirm commit", device)
+            result["status"] = "committed"
+        else:
+            rpc_reply = netconf.cancelNetconfCommit(device, persist_id=persist)
+            utils.printRpc(rpc_reply, "Cancel commit", device)
+            result["status"] = "cancelled"
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"Failed to {'confirm' if confirm else 'cancel'} the commit (reverted by the device after the confirm timeout): {e}"
+        utils.printGeneral(f"Bulk change on device {device.id} failed: {result['error']}")
+    finally:
+        if device.mngr is not None:
+            netconf.demolishNetconfConnection(device)
+
+    result["time"] += time.perf_counter() - start
+    return(result)
+
+def runChangePlan(device_plans, workers=NETCONF_WORKER_POOL_SIZE, commit=True, confirmed=False, confirm_timeout=None) -> list:
+    """
+    Runs the device plans in parallel (at most "workers" devices at the same time).
+    The confirmed commit is confirmed on all the devices only after all of them have been committed. When any of the devices fails,
+    the confirmed commit is cancelled on the others, so the devices are left as they were.
+    Returns:
+        list: The results of runDevicePlan, in the order of the device plans.
+    """
+
+    persist = secrets.token_hex(16) if confirmed else None
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="bulk") as executor:
+        results = list(executor.map(lambda device_plan: runDevicePlan(device_plan, commit, confirmed, confirm_timeout, persist), device_plans))
+        unconfirmed = [(device_plan, result) for device_plan, result in zip(device_plans, results) if result["status"] == "unconfirmed"]
+        if unconfirmed:
+            confirm = len(unconfirmed) == len(results)
+            list(executor.map(lambda entry: finishConfirmedCommit(entry[0], entry[1], persist, confirm), unconfirmed))
+    return(results)
+
+def printSummary(results, elapsed) -> None:
+    """Prints one line per device and the totals."""
+
+    print(f"{'device':<28} {'status':<10} {'changes':>8} {'time (s)':>9}  error")
+    for result in results:
+        print(f"{result['id']:<28} {result['status']:<10} {len(result['changes']):>8} {result['time']:>9.2f}  {result['error'] or ''}")
+    succeeded = sum(1 for result in results if result["status"] in ("committed", "applied"))
+    print(f"{len(results)} devices, {succeeded} succeeded, {len(results) - succeeded} failed or cancelled, {elapsed:.1f} s")
+
+
+# ---------- MAIN: ----------
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Applies a change plan (YAML or CSV, see doc/change_plan.md) to the devices, without the GUI.")
+    parser.add_argument("plan", help="Path to the change plan (.yaml, .yml or .csv).")
+    parser.add_argument("--workers", type=int, default=NETCONF_WORKER_POOL_SIZE, help=f"Number of devices configured at the same time (default: {NETCONF_WORKER_POOL_SIZE}).")
+    parser.add_argument("--no-commit", action="store_true", help="Send the changes to the candidate datastore, but do not commit them.")
+    parser.add_argument("--confirmed-commit", type=int, metavar="TIMEOUT",
+                        help="Use the confirmed commit with the specified timeout (seconds). It is confirmed once all the devices have been committed, or cancelled when any of them fails.")
+    args = parser.parse_args()
+
+    try:
+        device_plans = loadChangePlan(args.plan)
+    except (OSError, ValueError) as e:
+        print(f"Invalid change plan: {e}", file=sys.stderr)
+        return(2)
+
+    start = time.perf_counter()
+    results = runChangePlan(device_plans, args.workers, not args.no_commit, args.confirmed_commit is not None, args.confirmed_commit)
+    printSummary(results, time.perf_counter() - start)
+    return(1 if any(result["status"] in ("failed", "cancelled") for result in results) else 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -80,15 +80,7 @@ class Cable(QGraphicsLineItem):
     def updatePosition(self) -> None:
         """Updates the position of the cable line to connect the centers of the two devices."""
 
-        device_1_center = self.device1.sceneBoundingRect().center()
-        device_2_center = self.device2.sceneBoundingRect().center()
-
-        self.setLine(device_1_center.x(), 
-                     device_1_center.y(), 
-                     device_2_center.x(), 
-                     device_2_center.y())
-        
-        self.updateLabelsPosition()
+        updateCablesGeometry([self])
 
     def updateLabelsPosition(self) -> None:
         """Updates the positions of the interface labels associated with the cable."""
@@ -148,8 +140,14 @@ class CableInterfaceLabel(QGraphicsTextItem):
         self.setFont(QFont('Arial', 8))
         self.setDefaultTextColor(Qt.white)
 
-        # LABEL TEXT
+        # LABEL TEXT (rendered again only when the version of the interface data changes, see setLabelText)
         self.label_holder = QGraphicsRectItem(self.boundingRect(), self.parent)
+        self.label_holder.setBrush(QColor(0, 0, 0))
+        self.label_holder.setPen(Qt.NoPen)
+        self.setParentItem(self.label_holder)
+        self.text = None
+        self.rendered_version = None
+        self.label_width, self.label_height = 0.0, 0.0 # Size of the laid out text, cached for positioning the label
         self.setLabelText()
 
         # TOOLTIP
@@ -164,36 +162,35 @@ class CableInterfaceLabel(QGraphicsTextItem):
     def _calculatePosition(self, distance_offset) -> QPointF:
         """Calculates the position of the label based on the distance offset and connected devices."""
         line = self.parent.line()
-        device1_point = line.p1() # where the line begins
-        device2_point = line.p2() # where the line ends
+        device1_x, device1_y = line.x1(), line.y1() # where the line begins
+        device2_x, device2_y = line.x2(), line.y2() # where the line ends
 
         # Direction vector
-        dx = device2_point.x() - device1_point.x()
-        dy = device2_point.y() - device1_point.y()
+        dx = device2_x - device1_x
+        dy = device2_y - device1_y
         line_length = math.sqrt(dx**2 + dy**2)
         if line_length == 0:
-            return device1_point if self.device1 else device2_point
+            return line.p1() if self.device1 else line.p2()
 
-        # Normalize the direction vector
-        unit_dx = dx / line_length
-        unit_dy = dy / line_length
+        return(self._positionOnLine(device1_x, device1_y, device2_x, device2_y, dx / line_length, dy / line_length, distance_offset))
+
+    def _positionOnLine(self, device1_x, device1_y, device2_x, device2_y, unit_dx, unit_dy, distance_offset) -> QPointF:
+        """
+        Calculates the position of the label on the line with the normalized direction vector (unit_dx, unit_dy).
+        The label is centered using its size cached by setLabelText, so the text is not laid out again while the device is being dragged.
+        """
 
         if self.device1:
             distance_offset = distance_offset
-            device_point = device1_point
+            device_x, device_y = device1_x, device1_y
         elif self.device2:
             distance_offset = -distance_offset
-            device_point = device2_point
-
-        # Calculate the position of the label (move away from the device by distance offset)
-        label_x = device_point.x() + unit_dx * distance_offset
-        label_y = device_point.y() + unit_dy * distance_offset
-        label_pos = QPointF(label_x, label_y)
+            device_x, device_y = device2_x, device2_y
 
-        # Center the label
-        label_pos_centered = label_pos - QPointF(self.boundingRect().width() / 2, self.boundingRect().height() / 2)
-        
-        return(label_pos_centered)
+        # Calculate the position of the label (move away from the device by distance offset) and center the label
+        label_x = device_x + unit_dx * distance_offset - self.label_width / 2
+        label_y = device_y + unit_dy * distance_offset - self.label_height / 2
+        return(QPointF(label_x, label_y))
     
     def updatePosition(self) -> None:
         """Updates the position of the label based on the current configuration."""
@@ -213,25 +210,68 @@ class CableInterfaceLabel(QGraphicsTextItem):
         QToolTip.hideText()
     
     def setLabelText(self) -> None:
-        """Sets the text of the label based on the interface name and associated IP addresses."""
+        """
+        Sets the text of the label based on the interface name and associated IP addresses.
+        The text is derived again only when the version of the interface data has changed (see devices.Device.interface_versions),
+        and the label is laid out again only when the text differs.
+        """
+
+        version = self.device.interface_versions.get(self.interface_name, 0)
+        if version == self.rendered_version:
+            return
+        self.rendered_version = version
+
         subinterfaces = self.device.interfaces[self.interface_name]['subinterfaces']
         ipv4_data, ipv6_data = utils.getFirstIPAddressesFromSubinterfaces(subinterfaces)
 
-        self.text = str(f"{self.interface_name}")
+        text = str(f"{self.interface_name}")
         if ipv4_data:
             if not ipv4_data.get("flag", "") == "deleted":
-                self.text += str(f"\n{ipv4_data['value']}")
+                text += str(f"\n{ipv4_data['value']}")
         if ipv6_data:
-            if not ipv4_data.get("flag", "") == "deleted":
-                self.text += str(f"\n{ipv6_data['value']}")
+            if not ipv6_data.get("flag", "") == "deleted":
+                text += str(f"\n{ipv6_data['value']}")
 
+        if text == self.text:
+            return
+        self.text = text
         self.setPlainText(self.text)
         self.tooltip_text = self.text
+        label_rect = self.boundingRect()
+        self.label_holder.setRect(label_rect)
+        self.label_width, self.label_height = label_rect.width(), label_rect.height()
 
-        self.label_holder.setRect(self.boundingRect())
-        self.label_holder.setBrush(QColor(0, 0, 0))
-        self.label_holder.setPen(Qt.NoPen)
-        self.setParentItem(self.label_holder)
+
+# ---------- CABLE GEOMETRY: ----------
+def updateCablesGeometry(cables) -> None:
+    """
+    Updates the lines and the label positions of the cables in a single pass (e.g. all the cables of the dragged devices, once per frame).
+    The center of every device is computed only once, even when the device has many cables, and the labels are positioned
+    from the direction vector of their cable, using their cached size (the text is not laid out again).
+
+    Args:
+        cables (iterable): The cables to be updated (each cable is updated once, even when both its devices have moved).
+    """
+
+    centers = {} # device -> (x, y) of the center of the device
+    for cable in cables:
+        for device in (cable.device1, cable.device2):
+            if device not in centers:
+                center = device.sceneBoundingRect().center()
+                centers[device] = (center.x(), center.y())
+        device1_x, device1_y = centers[cable.device1]
+        device2_x, device2_y = centers[cable.device2]
+        cable.setLine(device1_x, device1_y, device2_x, device2_y)
+
+        dx = device2_x - device1_x
+        dy = device2_y - device1_y
+        line_length = math.hypot(dx, dy)
+        for interface_label in cable.device_interface_labels:
+            if line_length == 0:
+                label_pos = QPointF(device1_x, device1_y) if interface_label.device1 else QPointF(device2_x, device2_y)
+            else:
+                label_pos = interface_label._positionOnLine(device1_x, device1_y, device2_x, device2_y, dx / line_length, dy / line_length, interface_label.distance_offset)
+            interface_label.label_holder.setPos(label_pos)
 
 
 class TempCable(QGraphicsLineItem):
@@ -372,7 +412,7 @@ class CableEditMode(QObject):
     def _device1SelectionHandler(self, event) -> None:
         """ Wait for the user to select the starting device """
         self.device1 = self._getItemClickedAtPos(event, Device) 
-        if not self.device1: # Ignore clicks on anything else than a device
+        if not self.device1 or self.device1.state != "ready": # Ignore clicks on anything else than a device (which has been brought up)
             return
         
         self._promptInterfaceSelection(self.device1, self._device1InterfaceSelected)
@@ -392,7 +432,7 @@ class CableEditMode(QObject):
         """ Wait for the user to select the ending device """
 
         self.device2 = self._getItemClickedAtPos(event, Device) 
-        if not self.device2 or self.device2 == self.device1: # Ignore clicks on anything else than a device, or connecting a device to itself
+        if not self.device2 or self.device2 == self.device1 or self.device2.state != "ready": # Ignore clicks on anything else than a device (which has been brought up), or connecting a device to itself
             return
         
         self._promptInterfaceSelection(self.device2, self._device2InterfaceSelected)
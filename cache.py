@@ -0,0 +1,79 @@
+# ---------- IMPORTS: ----------
+# Standard library
+import copy
+import time
+import threading
+
+# Custom modules
+from definitions import SNAPSHOT_CACHE_TTL
+
+# ---------- CACHE: ----------
+class SnapshotCache:
+    """
+    Per-device cache of the data retrieved from the device (hostname, interfaces, VLANs, security zones, running-config sections, ...).
+    The data are served from memory, until they expire (TTL) or until the cache is invalidated - which is done whenever the configuration
+    of the device changes (commit, discard, cancel-commit). The getters of the device accept force=True to bypass the cache.
+    Every caller gets its own (deep) copy of the cached data, so the callers are free to modify it.
+    The cache is used from the worker threads as well (see workers.FanOutExecutor), so it is guarded by a lock.
+    """
+
+    def __init__(self, ttl=SNAPSHOT_CACHE_TTL) -> "SnapshotCache":
+        """
+        Args:
+            ttl (float): Time (in seconds) for which the data are valid. 0 disables the cache.
+        """
+
+        self.ttl = ttl
+        self._entries = {} # key -> (time of the retrieval, data)
+        self._generation = 0 # Incremented by every invalidation, so the data retrieved before the invalidation are not stored
+        self._lock = threading.Lock()
+
+    def get(self, key, load, force=False):
+        """
+        Returns the cached data, or retrieves them (and caches them), if they are not cached or have expired.
+        Args:
+            key (hashable): Identifies the data (e.g. "interfaces").
+            load (callable): Retrieves the data from the device. Returning None means failure - nothing is cached.
+            force (bool): Retrieve the data from the device, even if they are cached.
+        Returns:
+            The data (None, if they could not be retrieved).
+        """
+
+        if not force:
+            data = self.peek(key)
+            if data is not None:
+                return(data)
+
+        with self._lock:
+            generation = self._generation
+        data = load() # Not under the lock - the retrieval can take a long time
+        if data is None:
+            return None
+
+        with self._lock:
+            if generation == self._generation and self.ttl > 0:
+                self._entries[key] = (time.monotonic(), copy.deepcopy(data))
+        return(data)
+
+    def peek(self, key):
+        """Returns a copy of the cached data, without retrieving them (None, if they are not cached or have expired)."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            data = entry[1]
+        return(copy.deepcopy(data))
+
+    def invalidate(self, *keys) -> None:
+        """Drops the specified data from the cache. Drops all the data, when called without any key."""
+
+        with self._lock:
+            self._generation += 1
+            if not keys:
+                self._entries.clear()
+            for key in keys:
+                self._entries.pop(key, None)
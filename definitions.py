@@ -13,11 +13,85 @@ VLAN_YANG_DIR = os.path.join(YANG_DIR, "vlan/")
 # CONSTANTS
 # Defines the target datastore for configuration changes
 CONFIGURATION_TARGET_DATASTORE = "candidate"
+# Defines whether the changes (edit-config operations) are staged locally and sent to the device in a single RPC (Apply, or before the commit),
+# instead of sending every change as soon as it is made. The staged changes are still listed one by one in the pending changes
+EDIT_CONFIG_BATCHING = True
+# Defines the timeout (in seconds) of the confirmed commit used by the transactional commit ("Commit all or nothing"). 
+# If the transaction is not finished within the timeout (e.g. the application crashes), the devices revert the changes themselves
+TRANSACTION_CONFIRM_TIMEOUT = 120
+# Defines the sections (top-level containers) of the running configuration, which are shown by the running configuration dialog.
+# NETCONF cannot list the top-level containers without retrieving their content, so the dialog shows these names
+# and retrieves every section (with a subtree filter) only when it is expanded. Format: device type -> (root container, sections)
+RUNNING_CONFIG_SECTIONS = {
+    "iosxe": ("native", (
+        "version", "service", "platform", "hostname", "enable", "username", "vrf", "ip", "ipv6", "interface", "vlan", "spanning-tree",
+        "router", "crypto", "aaa", "logging", "snmp-server", "ntp", "banner", "license", "control-plane", "line")),
+    "junos": ("configuration", (
+        "version", "system", "chassis", "services", "security", "interfaces", "snmp", "forwarding-options", "event-options", "policy-options",
+        "class-of-service", "firewall", "access", "applications", "routing-instances", "routing-options", "protocols", "vlans", "switch-options")),
+}
+# Name of the additional section of the running configuration dialog, which holds all the top-level containers not listed above
+# (e.g. route-map on IOS-XE, groups on Junos). It is retrieved with the whole running configuration, so only when it is expanded
+OTHER_RUNNING_CONFIG_SECTIONS = "other-sections"
+
+# SNAPSHOT CACHE
+# Defines the time (in seconds), for which the data retrieved from the device (hostname, interfaces, VLANs, security zones, running-config sections)
+# are served from memory. The cache is also invalidated on commit, discard and cancel-commit. 0 disables the cache
+SNAPSHOT_CACHE_TTL = 300
+
+# CONCURRENCY
+# Defines the maximum number of devices, with which the NETCONF operations (connecting, retrieving information, ...) are performed at the same time
+NETCONF_WORKER_POOL_SIZE = 16
+
+# NETCONF SESSIONS
+# Interval (in seconds) of the keepalive RPCs, that are sent over every NETCONF session in order to detect dead sessions
+NETCONF_KEEPALIVE_INTERVAL = 30
+# Exponential backoff (in seconds) used when re-establishing a dead NETCONF session
+NETCONF_RECONNECT_BACKOFF_INITIAL = 1
+NETCONF_RECONNECT_BACKOFF_MAX = 60
+# Number of attempts to re-establish the session, before the operation called over a dead session fails
+NETCONF_RECONNECT_ATTEMPTS = 3
+# Number of attempts of the background re-establishment started by the keepalive. When it gives up, the next keepalive starts it again
+NETCONF_BACKGROUND_RECONNECT_ATTEMPTS = 8
+
+# RPC METRICS
+# Defines whether the metrics of every RPC (round-trip time, parse time, request and reply size, errors) are collected, per device and operation.
+# The metrics are shown in the "RPC metrics" dock and can be exported as JSON or in the Prometheus text format
+RPC_METRICS_ENABLED = True
+# Upper bounds (in seconds) of the buckets of the round-trip and parse time histograms
+RPC_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Interval (in milliseconds) of refreshing the "RPC metrics" dock, while it is visible
+RPC_METRICS_REFRESH_INTERVAL = 2000
+
+# CANVAS
+# Interval (in milliseconds), in which the cables (lines and interface labels) of the dragged devices are updated - about once per frame
+CABLE_GEOMETRY_UPDATE_INTERVAL = 16
 
 # OUTPUT REDIRECTION
 # Defines whether to redirect stdout and stderr to the integrated console
 STDOUT_TO_CONSOLE = True
 STDERR_TO_CONSOLE = False
 
+# CONSOLE
+# Defines the maximum number of lines kept in the console. The oldest lines are dropped from the console (the whole output is in the log file)
+CONSOLE_MAX_LINES = 20000
+# Defines the maximum size (in characters) of the output waiting to be shown in the console (e.g. while the console is not visible).
+# When exceeded, the oldest output is written to the log file only
+CONSOLE_BUFFER_MAX_BYTES = 8 * 1024 * 1024
+# Defines the maximum size (in characters) of a single message shown in the console. Larger messages (e.g. full routing tables) are truncated
+# in the console and not formatted - they are whole in the log file
+CONSOLE_MESSAGE_MAX_BYTES = 1024 * 1024
+# Interval (in milliseconds), in which the output is shown in the console (in batches)
+CONSOLE_FLUSH_INTERVAL = 100
+# Rotating log file with the whole console output (relative to the working directory, the same as "saved_devices.json")
+CONSOLE_LOG_FILE = "console.log"
+CONSOLE_LOG_MAX_BYTES = 10 * 1024 * 1024
+CONSOLE_LOG_BACKUP_COUNT = 3
+
+# PENDING CHANGES
+# Directory of the pending change journal (relative to the working directory, the same as "saved_devices.json"). Every pending change is written
+# to the journal file of its device, until it is committed or discarded, so the changes can be replayed after the application is restarted (e.g. after a crash)
+PENDING_CHANGE_JOURNAL_DIR = "pending_changes"
+
 # DARK MODE
 DARK_MODE = False
\ No newline at end of file
@@ -4,6 +4,7 @@ import os
 import traceback
 import ipaddress
 from lxml import etree as ET
+from natsort import natsorted
 
 # Custom modules
 import utils
@@ -13,9 +14,13 @@ import modules.system as system
 import modules.ospf as ospf
 import modules.security as security
 import modules.vlan as vlan
+import modules.routing as routing
 from signals import signal_manager
-from yang.filters import DispatchFilter, GetFilter
-from definitions import ROOT_DIR, ROUTING_YANG_DIR, CONFIGURATION_TARGET_DATASTORE
+from workers import FanOutExecutor
+from cache import SnapshotCache
+from journal import pending_change_journal
+from yang.filters import EditconfigBatch
+from definitions import ROOT_DIR, CONFIGURATION_TARGET_DATASTORE, RUNNING_CONFIG_SECTIONS, OTHER_RUNNING_CONFIG_SECTIONS
 
 # Qt
 from PySide6.QtWidgets import (
@@ -24,6 +29,7 @@ from PySide6.QtWidgets import (
     QLineEdit, 
     QMenu,
     QGraphicsTextItem,
+    QGraphicsSimpleTextItem,
     QToolTip,
     QVBoxLayout,
     QDialogButtonBox,
@@ -37,7 +43,9 @@ from PySide6.QtGui import (
     QAction,
     QFont,
     QAction,
-    QIcon)
+    QIcon,
+    QBrush,
+    QColor)
 from PySide6.QtCore import QTimer
 
 # QtCreator
@@ -45,44 +53,175 @@ from ui.ui_xmldatadialog import Ui_XMLDataDialog
 
 # ---------- HELPER FUNCTIONS: ----------
 def addRouter(device_parameters, scene, class_type, x=0, y=0) -> "Router":
-    """Creates a router object and adds it to the scene."""
+    """Creates a router object, adds it to the scene and starts its bring-up in the background."""
 
     if class_type == "IOSXERouter":
-        router = IOSXERouter(device_parameters, x, y)
+        router = IOSXERouter(device_parameters, x, y, bring_up=False)
     elif class_type == "JUNOSRouter":
-        router = JUNOSRouter(device_parameters, x, y)
+        router = JUNOSRouter(device_parameters, x, y, bring_up=False)
 
     scene.addItem(router)
+    bringUpInBackground(router)
     return(router)
 
 def addFirewall(device_parameters, scene, class_type, x=0, y=0) -> "Firewall":
-    """Creates a firewall object and adds it to the scene."""
+    """Creates a firewall object, adds it to the scene and starts its bring-up in the background."""
 
     if class_type == "JUNOSFirewall":
-        firewall = JUNOSFirewall(device_parameters, x, y)
+        firewall = JUNOSFirewall(device_parameters, x, y, bring_up=False)
 
     scene.addItem(firewall)
+    bringUpInBackground(firewall)
     return(firewall)
 
 def addSwitch(device_parameters, scene, class_type, x=0, y=0) -> "Switch":
-    """Creates a switch object and adds it to the scene."""
+    """Creates a switch object, adds it to the scene and starts its bring-up in the background."""
 
     if class_type == "IOSXESwitch":
-        switch = IOSXESwitch(device_parameters, x, y)
+        switch = IOSXESwitch(device_parameters, x, y, bring_up=False)
 
     scene.addItem(switch)
+    bringUpInBackground(switch)
     return(switch)
 
-# ---------- FILTERS: ----------
-class JunosRpcRoute_Dispatch_GetRoutingInformation_Filter(DispatchFilter):
-    def __init__(self) -> None:
-        self.filter_xml = ET.parse(ROUTING_YANG_DIR + "junos-rpc-route_dispatch_get-routing-information.xml")
-    
-    
-class IetfRouting_Get_GetRoutingState_Filter(GetFilter):
-    def __init__(self) -> None:
-        self.filter_xml = ET.parse(ROUTING_YANG_DIR + "ietf-routing_get_get-routing-state.xml")
+# ---------- BACKGROUND BRING-UP: ----------
+# The devices are placed on the canvas immediately (in the "connecting" state), while the NETCONF operations needed
+# for their initialization run in the worker pool. The results are handled in the GUI thread by the functions below.
+bring_up_executor = FanOutExecutor()
+
+def bringUpInBackground(device) -> None:
+    """Submits the bring-up of the device (already placed on the canvas) to the worker pool."""
+
+    device._setState("connecting")
+    bring_up_executor.submit(device, device.bringUp)
+
+def _onBringUpSucceeded(device, _) -> None:
+    """Finishes the bring-up of the device in the GUI thread."""
+
+    if device.scene() is None: # The device was removed from the canvas while it was being brought up
+        netconf.demolishNetconfConnection(device)
+        return
+    device.finishBringUp()
+
+def _onBringUpFailed(device, error) -> None:
+    """Marks the device as failed in the GUI thread."""
+
+    device.failBringUp(error)
+
+bring_up_executor.taskSucceeded.connect(_onBringUpSucceeded)
+bring_up_executor.taskFailed.connect(_onBringUpFailed)
+signal_manager.deviceStateChanged.connect(lambda device: device.refreshStateBadge()) # Emited from the worker threads, handled in the GUI thread
+
+# ---------- DEVICE REGISTRY: ----------
+class DeviceRegistry:
+    """
+    Registry of the devices, with secondary indexes, so the devices can be looked up in constant time (instead of scanning the scene):
+        - by ID, hostname, vendor (device_params) and capability ("ospf", "ipsec", "vlan") - the devices, which are ready (brought up),
+        - by address and port - all the devices placed on the canvas (also while they are being brought up, or have failed),
+          so the duplicates are detected as soon as the device is placed.
+    The indexes are kept up to date by the device (see Device.__init__, finishBringUp, refreshHostnameLabel, deleteDevice and Switch.enableL3Functions).
+    Used from the GUI thread only.
+    """
+
+    CAPABILITIES = ("ospf", "ipsec", "vlan")
+
+    def __init__(self) -> "DeviceRegistry":
+        self.by_id = {} # device ID -> device
+        self.by_address = {} # "address:port" -> device
+        self.by_hostname = {} # hostname -> {device ID: device}
+        self.by_vendor = {} # device_params ("iosxe", "junos") -> {device ID: device}
+        self.by_capability = {capability: {} for capability in self.CAPABILITIES} # capability -> {device ID: device}
+
+    def __len__(self) -> int:
+        return(len(self.by_id))
+
+    def place(self, device) -> None:
+        """Indexes the device placed on the canvas by its address and port."""
 
+        self.by_address[addressKey(device.device_parameters["address"], device.device_parameters["port"])] = device
+
+    def add(self, device) -> None:
+        """Indexes the device, which has been brought up."""
+
+        self.by_id[device.id] = device
+        self._indexHostname(device, device.hostname)
+        self.by_vendor.setdefault(device.device_parameters["device_params"], {})[device.id] = device
+        self.updateCapabilities(device)
+
+    def remove(self, device) -> None:
+        """Removes the device from all the indexes (the device has been removed from the canvas)."""
+
+        key = addressKey(device.device_parameters["address"], device.device_parameters["port"])
+        if self.by_address.get(key) is device:
+            del self.by_address[key]
+        if self.by_id.pop(device.id, None) is None: # Not brought up - not in the other indexes
+            return
+        self._unindexHostname(device, device.hostname)
+        self.by_vendor.get(device.device_parameters["device_params"], {}).pop(device.id, None)
+        for devices in self.by_capability.values():
+            devices.pop(device.id, None)
+
+    def rename(self, device, old_hostname) -> None:
+        """Moves the device in the hostname index, after its hostname has changed."""
+
+        if self.by_id.get(device.id) is not device:
+            return
+        self._unindexHostname(device, old_hostname)
+        self._indexHostname(device, device.hostname)
+
+    def updateCapabilities(self, device) -> None:
+        """Moves the device in the capability indexes, after its capability flags (is_ospf_capable, ...) have changed."""
+
+        if self.by_id.get(device.id) is not device:
+            return
+        for capability in self.CAPABILITIES:
+            if getattr(device, f"is_{capability}_capable"):
+                self.by_capability[capability][device.id] = device
+            else:
+                self.by_capability[capability].pop(device.id, None)
+
+    def get(self, device_id) -> "Device":
+        return(self.by_id.get(device_id))
+
+    def getByAddress(self, address, port) -> "Device":
+        """Returns the device placed on the canvas with the address and port (None, if there is none)."""
+
+        return(self.by_address.get(addressKey(address, port)))
+
+    def find(self, hostname=None, vendor=None, capability=None) -> list:
+        """
+        Returns the devices, which match all the specified criteria (e.g. find(vendor="iosxe", capability="vlan") - all the IOS-XE switches).
+        Only the smallest of the matching indexes is iterated.
+        """
+
+        candidates = []
+        if hostname is not None:
+            candidates.append(self.by_hostname.get(hostname, {}))
+        if vendor is not None:
+            candidates.append(self.by_vendor.get(vendor, {}))
+        if capability is not None:
+            candidates.append(self.by_capability[capability])
+        if not candidates:
+            return(list(self.by_id.values()))
+
+        candidates.sort(key=len)
+        return([device for device_id, device in candidates[0].items() if all(device_id in devices for devices in candidates[1:])])
+
+    def _indexHostname(self, device, hostname) -> None:
+        if hostname is not None:
+            self.by_hostname.setdefault(hostname, {})[device.id] = device
+
+    def _unindexHostname(self, device, hostname) -> None:
+        devices = self.by_hostname.get(hostname)
+        if devices is not None:
+            devices.pop(device.id, None)
+            if not devices:
+                del self.by_hostname[hostname]
+
+def addressKey(address, port) -> str:
+    """Returns the key of the device in the address index. The address and port may be strings (saved devices), or ipaddress objects and integers."""
+
+    return(f"{address}:{port}")
 
 # ---------- DEVICE CLASSES: ----------
 # GENERAL CLASSES
@@ -93,17 +232,23 @@ class Device(QGraphicsPixmapItem):
     NETCONF connection, interfaces, hostname, and graphical representation. The class also supports interaction 
     through context menus, tooltips, and mouse events.
     Attributes:
-        _registry (dict): A registry to store device instances.
+        _registry (DeviceRegistry): A registry to store device instances (indexed by ID, address and port, hostname, vendor and capability).
         _device_type (str): The type of the device, used for ID generation.
         is_ospf_capable (bool): Indicates if the device supports OSPF.
         is_ipsec_capable (bool): Indicates if the device supports IPsec.
         is_vlan_capable (bool): Indicates if the device supports VLANs.
         device_parameters (dict): Parameters for the device, including connection details (IP, username, password, ...).
-        mngr: The NETCONF connection manager for the device (ncclient).
+        mngr: The NETCONF connection manager for the device (ncclient manager proxy, owned by the session pool in modules/netconf.py).
         cables (list): A list of cables connected to the device on the canvas.
         cable_connected_interfaces (list): A list of interfaces connected to cables on the canvas.
         has_pending_changes (bool): Indicates if there are uncommitted changes on the device. Used when "commiting" the changes.
         has_updated_hostname (bool): Indicates if the hostname has been updated. Used to determine, whether it needs to be updated on the canvas.
+        interface_journal (set or None): Names of the interfaces touched by the pending changes. Only these are retrieved again after commit/discard/cancel.
+            None means that the touched interfaces are not known and all the interfaces have to be retrieved.
+        interface_versions (dict): Interface name -> version of the interface data, incremented whenever the data change. Used to render again
+            only the cable labels of the changed interfaces.
+        state (str): The lifecycle state of the device: "connecting" -> "inventorying" -> "ready" / "failed". Only "ready" devices can be configured.
+        state_badge (QGraphicsSimpleTextItem): The badge displaying the state of the device, while it is not "ready".
         id (str): The unique identifier of the device.
         netconf_capabilities: The NETCONF capabilities of the device.
         interfaces (dict): A dictionary containing the device's interfaces.
@@ -112,12 +257,16 @@ class Device(QGraphicsPixmapItem):
         tooltip_text (str): The text displayed in the tooltip.
         tooltip_timer (QTimer): A timer for showing the tooltip after a delay.
     Methods:
-        __init__(device_parameters, x=0, y=0): Initializes the device with given parameters and position.
+        __init__(device_parameters, x=0, y=0, bring_up=True): Initializes the device with given parameters and position.
+        bringUp(): Connects to the device and retrieves the device information. Safe to be called from a worker thread.
+        finishBringUp(): Finishes the initialization of the device in the GUI thread, after bringUp() has completed.
+        failBringUp(error): Marks the device as failed in the GUI thread, after bringUp() has failed.
+        refreshStateBadge(): Updates the state badge and the appearance of the device, based on its state.
         getNetconfCapabilities(): Retrieves the NETCONF capabilities of the device.
         refreshHostnameLabel(new_hostname=None): Updates the hostname label on the canvas.
         deleteDevice(): Deletes the device from the canvas and disconnects it.
         updateCablePositions(): Updates the positions of connected cables.
-        updateCableLabelsText(): Updates the labels of connected cables.
+        updateCableLabelsText(): Updates the labels of connected cables (only the labels of the changed interfaces are rendered again).
         hoverEnterEvent(event): Handles mouse hover enter events.
         hoverLeaveEvent(event): Handles mouse hover leave events.
         _getContextMenuItems(): Retrieves the context menu items for the device.
@@ -125,53 +274,52 @@ class Device(QGraphicsPixmapItem):
         _showNetconfCapabilitiesDialog(): Displays the NETCONF capabilities dialog.
         _showDeviceInterfacesDialog(): Displays the device interfaces dialog.
         _showHostnameDialog(): Displays the hostname configuration dialog.
-        getHostname(): Retrieves the hostname of the device using NETCONF.
+        getHostname(force=False): Retrieves the hostname of the device using NETCONF (served from the snapshot cache, unless forced).
         setHostname(new_hostname): Sets the hostname of the device using NETCONF.
-        getInterfaces(): Retrieves the interfaces of the device using NETCONF.
+        getInterfaces(interface_ids=None, force=False): Retrieves the interfaces of the device (or only the specified ones) using NETCONF.
+        refreshInterfaces(snapshot=None): Retrieves again only the interfaces recorded in the interface journal (or its snapshot). Safe to be called from a worker thread.
         deleteInterfaceIP(interface_id, subinterface_index, old_ip): Deletes an IP address from an interface.
         setInterfaceIP(interface_id, subinterface_index, new_ip): Sets an IP address on an interface.
         addInterface(interface_id, interface_type): Adds a new interface to the device.
         configureInterfaceDescription(interface_id, description): Configures the description of an interface.
         cloneToOSPFDevice(): Clones the router to an `OSPFDevice` object for use in OSPF configuration dialogs.
         getRoutingTable(): Retrieves the routing table from the device based on its operating system.
-        _showRoutingTable(): Displays the routing table in a dialog window by retrieving it and converting it to an XML tree.
+        _showRoutingTable(): Displays the routing table in a dialog window (table of the routes).
+        getRunningConfigSection(section, force=False): Retrieves a section of the running configuration (served from the snapshot cache, unless forced).
+        _showRunningConfig(): Displays the running configuration in a dialog window (sections are retrieved when expanded).
+        replayPendingChanges(): Stages again the pending changes left in the journal by an earlier run of the application.
+        performApply(): Sends the staged changes to the device in a single edit-config. Safe to be called from a worker thread.
         discardChanges(): Discards all pending changes on the device.
         commitChanges(confirmed=False, confirm_timeout=None): Commits all pending changes on the device.
         cancelCommit(): Cancels a confirmed commit operation.
+        performDiscard(), performCommit(confirmed=False, confirm_timeout=None), performCancelCommit(): NETCONF parts of the operations above, safe to be called from a worker thread.
+        finishDiscard(result), finishCommit(result, confirmed=False), finishCancelCommit(result): Apply the results of the NETCONF parts to the device (GUI thread).
+        beginRefresh(), performRefresh(snapshot), finishRefresh(result), abortRefresh(snapshot): Retrieve the interfaces (and the updated hostname) after the commit
+            and apply them to the device, except for the interfaces changed again meanwhile.
         _generateID(): Generates a unique ID for the device.
         _getBaseClass(): Retrieves the base class of the current device class. Used for ID generation.
         getDeviceInstance(device_id): Retrieves a device instance by its ID.
         getAllDevicesInstancesKeys(): Retrieves all device instance keys.
         getAllDevicesInstances(): Retrieves all device instances.
+        getPlacedDevicesInstances(): Retrieves all the devices placed on the canvas (also the ones, which are not brought up).
+        getDeviceInstanceByAddress(address, port): Retrieves the device placed on the canvas with the address and port.
+        findDevicesInstances(hostname=None, vendor=None, capability=None): Retrieves the device instances by hostname, vendor and capability.
 
     """
     
-    _registry = {} # Used to store device instances
+    _registry = DeviceRegistry() # Used to store device instances
     _device_type = "dv"
     is_ospf_capable = False
     is_ipsec_capable = False
     is_vlan_capable = False
     
-    def __init__(self, device_parameters, x=0, y=0) -> "Device":
+    def __init__(self, device_parameters, x=0, y=0, bring_up=True) -> "Device":
         super().__init__()
 
         self.setAcceptHoverEvents(True) # Enable mouse hover over events
 
         self.device_parameters = device_parameters
-
-        # NETCONF CONNECTION
-        try:
-            self.mngr = netconf.establishNetconfConnection(self.device_parameters)
-            if CONFIGURATION_TARGET_DATASTORE == "running":
-                assert(":writable-running" in self.mngr.server_capabilities)
-            elif CONFIGURATION_TARGET_DATASTORE == "candidate":                
-                assert(":candidate" in self.mngr.server_capabilities)
-            self.mngr.lock(target=CONFIGURATION_TARGET_DATASTORE) # lock the datastore
-        except Exception as e:
-            utils.printGeneral(f"Error establishing NETCONF connection: {e}")
-            utils.printGeneral(traceback.format_exc())
-            QMessageBox.critical(None, "Error", f"Error establishing NETCONF connection: {e}")
-            raise ConnectionError(f"Error establishing NETCONF connection: {e}")
+        self.mngr = None
 
         # ICON + CANVAS PLACEMENT
         device_icon_img = QImage(os.path.join(ROOT_DIR, "graphics/devices/general.png"))
@@ -189,20 +337,29 @@ class Device(QGraphicsPixmapItem):
         # FLAGS
         self.has_pending_changes = False
         self.has_updated_hostname = False
+        self.interface_journal = set()
+        self.interface_versions = {} # Interface name -> version, incremented whenever the data of the interface change (see cable.CableInterfaceLabel)
+        self._interfaces = None
+        self.edit_batch = EditconfigBatch() # Staged changes, sent to the device in a single edit-config (see performApply)
+
+        # CACHES
+        self.snapshot_cache = SnapshotCache() # Data retrieved from the device, invalidated on commit, discard and cancel-commit
 
         # ID
         self.id = self._generateID()
 
-        # DEVICE INFORMATION
-        self.netconf_capabilities = self.getNetconfCapabilities()
-        self.interfaces = self.getInterfaces() # Documented in doc/interfaces_dictionary.md
-        print(self.interfaces)
-        self.hostname = self.getHostname()
-
-        # LABEL (Hostname)
+        # LABEL (Hostname) - the address is shown, until the hostname is retrieved
+        self.hostname = None
         self.label = QGraphicsTextItem(self)
         self.label.setFont(QFont('Arial', 10))
-        self.refreshHostnameLabel(self.hostname)
+        self._setLabelText(f"{self.device_parameters['address']} (ID: {self.id})")
+
+        # STATE (connecting -> inventorying -> ready / failed)
+        self.state = "connecting"
+        self.bring_up_error = None
+        self.state_badge = QGraphicsSimpleTextItem(self)
+        self.state_badge.setFont(QFont('Arial', 8))
+        self.refreshStateBadge()
 
         # TOOLTIP
         self.tooltip_text = (
@@ -214,8 +371,121 @@ class Device(QGraphicsPixmapItem):
         self.tooltip_timer.setSingleShot(True) # only once per hover event
         self.tooltip_timer.timeout.connect(lambda: QToolTip.showText(self.hover_pos, self.tooltip_text))
 
+        # NETCONF CONNECTION + DEVICE INFORMATION
+        # When bring_up is False, the caller is responsible for calling bringUp() (usually from a worker thread) and finishBringUp() (from the GUI thread) later on.
+        Device._registry.place(self)
+        if bring_up:
+            try:
+                self.bringUp()
+            except ConnectionError as e:
+                Device._registry.remove(self)
+                QMessageBox.critical(None, "Error", str(e))
+                raise
+            self.finishBringUp()
+
+    def bringUp(self) -> None:
+        """
+        Performs all the NETCONF operations needed before the device can be placed on the canvas: establishes the connection,
+        locks the configuration datastore and retrieves the device information (capabilities, interfaces, hostname, ...).
+        Does not work with any Qt objects, so it can be called from a worker thread (see workers.FanOutExecutor).
+        Raises:
+            ConnectionError: If the connection could not be established, or the datastore could not be locked.
+        """
+
+        self._setState("connecting")
+        self._establishSession()
+        self._setState("inventorying")
+        self._retrieveDeviceInformation()
+
+    def finishBringUp(self) -> None:
+        """
+        Finishes the initialization of the device, after bringUp() has completed. Must be called from the GUI thread.
+        Refreshes the hostname label and stores the device in the registry.
+        """
+
+        self.refreshHostnameLabel(self.hostname)
+        self._setState("ready")
+
         # REGISTRY
-        type(self)._registry[self.id] = self
+        Device._registry.add(self)
+
+        # PENDING CHANGES left in the journal by an earlier run of the application (e.g. after a crash) - offered for replay by the pending changes dock
+        leftovers = pending_change_journal.leftovers(self)
+        if leftovers:
+            signal_manager.pendingChangeJournalFound.emit(self.id, len(leftovers))
+
+    def failBringUp(self, error) -> None:
+        """
+        Marks the device as failed, after bringUp() has failed. Must be called from the GUI thread.
+        The device stays on the canvas, so the bring-up can be retried (or the device removed) from its context menu.
+        """
+
+        utils.printGeneral(f"Failed to bring up the device with ID: {self.id} ({self.device_parameters['address']}): {error}")
+        self.bring_up_error = error
+        self._setState("failed")
+
+    def retryBringUp(self) -> None:
+        """Retries the bring-up of the failed device in the background."""
+
+        bringUpInBackground(self)
+
+    def _setState(self, state) -> None:
+        """
+        Sets the lifecycle state of the device. Can be called from a worker thread - the badge on the canvas
+        is refreshed in the GUI thread, using the deviceStateChanged signal.
+        """
+
+        self.state = state
+        signal_manager.deviceStateChanged.emit(self)
+
+    def refreshStateBadge(self) -> None:
+        """
+        Updates the state badge and the appearance of the device, based on its state. Must be called from the GUI thread.
+        Devices, that are not "ready", are semi-transparent and cannot be selected (so they are left out of the batch configuration).
+        """
+
+        if self.state == "ready":
+            self.state_badge.setVisible(False)
+            self.setOpacity(1.0)
+            self.setFlag(QGraphicsItem.ItemIsSelectable, True)
+            return
+
+        if self.state == "failed":
+            self.state_badge.setText("failed")
+            self.state_badge.setBrush(QBrush(QColor("red")))
+        else:
+            self.state_badge.setText(f"{self.state}...")
+            self.state_badge.setBrush(QBrush(QColor("darkorange")))
+        self.state_badge.setVisible(True)
+        self.state_badge.setPos(self.pixmap().width() - self.state_badge.boundingRect().width() / 2, -self.state_badge.boundingRect().height())
+        self.setOpacity(0.5)
+        self.setSelected(False)
+        self.setFlag(QGraphicsItem.ItemIsSelectable, False)
+
+    def _establishSession(self) -> None:
+        """Establishes the NETCONF connection, checks the capabilities needed for the configuration target datastore and locks the datastore."""
+
+        try:
+            self.mngr = netconf.establishNetconfConnection(self.device_parameters, self.id)
+            if CONFIGURATION_TARGET_DATASTORE == "running":
+                assert(":writable-running" in self.mngr.server_capabilities)
+            elif CONFIGURATION_TARGET_DATASTORE == "candidate":                
+                assert(":candidate" in self.mngr.server_capabilities)
+            self.mngr.lock(target=CONFIGURATION_TARGET_DATASTORE) # lock the datastore
+        except Exception as e:
+            utils.printGeneral(f"Error establishing NETCONF connection: {e}")
+            utils.printGeneral(traceback.format_exc())
+            if self.mngr is not None: # Do not leave the session open, when the device will not be used
+                netconf.demolishNetconfConnection(self)
+                self.mngr = None
+            raise ConnectionError(f"Error establishing NETCONF connection: {e}")
+
+    def _retrieveDeviceInformation(self) -> None:
+        """Retrieves the information about the device, which is needed for working with the device in the application."""
+
+        self.netconf_capabilities = self.getNetconfCapabilities()
+        self.interfaces = self.getInterfaces() # Documented in doc/interfaces_dictionary.md
+        self.hostname = self.getHostname()
 
     def getNetconfCapabilities(self) -> list:
         return(netconf.getNetconfCapabilities(self))
@@ -228,18 +498,35 @@ class Device(QGraphicsPixmapItem):
         hostname (str, optional): The new hostname to set. If not provided, the hostname will be retrieved using getHostname().
         """
 
+        old_hostname = self.hostname
         if new_hostname is not None:
             self.hostname = new_hostname
         else:
             self.hostname = self.getHostname()
+        Device._registry.rename(self, old_hostname)
+
+        self._setLabelText(f"{str(self.hostname)} (ID: {self.id})")
 
-        self.label.setPlainText(f"{str(self.hostname)} (ID: {self.id})")
+    def _setLabelText(self, text) -> None:
+        """Sets the text of the label and centers the label under the device icon."""
+
+        self.label.setPlainText(text)
         self.label_border = self.label.boundingRect()
         self.label.setPos((self.pixmap().width() - self.label_border.width()) / 2, self.pixmap().height())
 
     def deleteDevice(self) -> None:
         """Deletes the device from the canvas and disconnects it."""
 
+        if self.state != "ready": # Device, that is still being brought up (the session is closed once the bring-up finishes), or has failed
+            Device._registry.remove(self)
+            self.scene().removeItem(self)
+            utils.printGeneral(f"Device: {self.device_parameters['address']} has been removed from the canvas.")
+            return
+
+        if self.has_pending_changes: # The staged changes are lost with the session, they are not kept for a replay
+            self.edit_batch.clear()
+            utils.clearPendingChanges(self)
+
         rpc_reply = netconf.demolishNetconfConnection(self) # Disconnect from NETCONF server
 
         self.scene().removeItem(self)
@@ -247,7 +534,7 @@ class Device(QGraphicsPixmapItem):
         for cable in self.cables.copy(): # cannot modify contents of a list, while iterating through it! => .copy()
             cable.removeCable()
 
-        del type(self)._registry[self.id]
+        Device._registry.remove(self)
         utils.printRpc(rpc_reply, "Close NETCONF connection", self)
         utils.printGeneral(f"Connection to device: {self.device_parameters['address']} has been closed.")
 
@@ -258,7 +545,7 @@ class Device(QGraphicsPixmapItem):
             cable.updatePosition()    
 
     def updateCableLabelsText(self):
-        """Updates the labels of all connected cables."""
+        """Updates the labels of all connected cables. Only the labels of the interfaces, whose data have changed, are rendered again."""
 
         for cable in self.cables:
             cable.updateLabelsText()
@@ -322,15 +609,38 @@ class Device(QGraphicsPixmapItem):
 
         return(items)
 
+    def _getBringUpContextMenuItems(self) -> list:
+        """Returns the context menu items for the device, that is not "ready" yet."""
+
+        items = []
+        # Retry the bring-up
+        if self.state == "failed":
+            retry_action = QAction("Retry connecting")
+            retry_action.triggered.connect(self.retryBringUp)
+            retry_action.setToolTip(f"Last error: {self.bring_up_error}")
+            items.append(retry_action)
+
+        # Remove from canvas
+        remove_action = QAction("Remove")
+        remove_action.triggered.connect(self.deleteDevice)
+        remove_action.setToolTip("Removes the device from the canvas.")
+        items.append(remove_action)
+
+        return(items)
+
     def contextMenuEvent(self, event) -> None:
         """
         Context menu event for the device.
         This method handles showing of the context menu.
+        Until the device is "ready", only the actions related to its bring-up are available.
         """
 
         self.menu = QMenu()
 
-        context_menu_items = self._getContextMenuItems()
+        if self.state == "ready":
+            context_menu_items = self._getContextMenuItems()
+        else:
+            context_menu_items = self._getBringUpContextMenuItems()
         for action in context_menu_items:
             self.menu.addAction(action)
 
@@ -357,8 +667,15 @@ class Device(QGraphicsPixmapItem):
         dialog.exec()
     
     # ---------- HOSTNAME MANIPULATION FUNCTIONS ---------- 
-    def getHostname(self) -> str:
-        """Retrieves the hostname of the device using NETCONF."""
+    def getHostname(self, force=False) -> str:
+        """
+        Retrieves the hostname of the device using NETCONF.
+        The hostname is served from the snapshot cache, unless it has expired, or force is True.
+        """
+
+        return(self.snapshot_cache.get("hostname", self._getHostnameWithNetconf, force))
+
+    def _getHostnameWithNetconf(self) -> str:
         try:
             hostname, rpc_reply = system.getHostnameWithNetconf(self)
             utils.printRpc(rpc_reply, "Get Hostname", self)
@@ -391,21 +708,89 @@ class Device(QGraphicsPixmapItem):
             return False
 
     # ---------- INTERFACE MANIPULATION FUNCTIONS ---------- 
-    def getInterfaces(self) -> dict:
+    def getInterfaces(self, interface_ids=None, force=False) -> dict:
         """
         Retrieves the interfaces of the device using NETCONF.
+        All the interfaces are served from the snapshot cache, unless they have expired, or force is True. The specified interfaces are always retrieved.
+        Args:
+            interface_ids (list, optional): Names of the interfaces to be retrieved (in a single RPC). All the interfaces are retrieved, when not specified.
+            force (bool, optional): Retrieve the interfaces from the device, even if they are cached.
         Returns:
             dict: The interfaces data.
         """
 
+        if interface_ids:
+            return(self._getInterfacesWithNetconf(interface_ids))
+        return(self.snapshot_cache.get("interfaces", self._getInterfacesWithNetconf, force))
+
+    def _getInterfacesWithNetconf(self, interface_ids=None) -> dict:
         try:
-            interfaces_data, rpc_reply = interfaces.getInterfacesWithNetconf(self)
+            interfaces_data, rpc_reply = interfaces.getInterfacesWithNetconf(self, interface_ids)
             utils.printRpc(rpc_reply, "Get Interfaces", self)
             return(interfaces_data)
         except Exception as e:
             utils.printGeneral(f"Error getting interfaces: {e}")
             utils.printGeneral(traceback.format_exc())
             return None
+
+    def refreshInterfaces(self, snapshot=None) -> dict:
+        """
+        Retrieves again only the interfaces touched by the pending changes (recorded in the interface journal), instead of all the interfaces of the device.
+        The touched interfaces are retrieved in a single RPC and merged into a copy of self.interfaces. Interfaces missing in the reply
+        (e.g. an added interface, which was discarded) are removed. All the interfaces are retrieved, when the journal does not know the touched interfaces.
+        Safe to be called from a worker thread.
+        Args:
+            snapshot (dict, optional): The interface journal and the interfaces taken by beginRefresh(), used instead of the current ones.
+        Returns:
+            dict: The interfaces data.
+        """
+
+        journal, interfaces_data = (snapshot["interface_journal"], snapshot["interfaces"]) if snapshot is not None else (self.interface_journal, self.interfaces)
+        if journal is None or interfaces_data is None:
+            return(self.getInterfaces())
+        if not journal: # No interfaces have been touched
+            return(interfaces_data)
+
+        refreshed_interfaces = self.getInterfaces(natsorted(journal))
+        if refreshed_interfaces is None:
+            return(self.getInterfaces())
+
+        interfaces_data = {name: data for name, data in interfaces_data.items() if name not in journal}
+        interfaces_data.update(refreshed_interfaces)
+        return({key: interfaces_data[key] for key in natsorted(interfaces_data)}) # sort the interfaces by name
+
+    def _recordInterfaceChange(self, *interface_ids) -> None:
+        """
+        Records the interfaces touched by a pending change in the interface journal and increments their versions (the data of the interfaces are changed by the caller).
+        When called without any interface, the touched interfaces are not known and all of them will be retrieved after the commit.
+        """
+
+        if not interface_ids:
+            self.interface_journal = None
+        elif self.interface_journal is not None:
+            self.interface_journal.update(interface_ids)
+        self._incrementInterfaceVersions(*interface_ids)
+
+    @property
+    def interfaces(self) -> dict:
+        """The interfaces data (documented in doc/interfaces_dictionary.md)."""
+
+        return(self._interfaces)
+
+    @interfaces.setter
+    def interfaces(self, interfaces) -> None:
+        """Replaces the interfaces data. Only the interfaces, whose data differ from the previous data, get a new version."""
+
+        previous = self._interfaces or {}
+        current = interfaces or {}
+        self._incrementInterfaceVersions(*(name for name in previous.keys() | current.keys() if previous.get(name) != current.get(name)))
+        self._interfaces = interfaces
+
+    def _incrementInterfaceVersions(self, *interface_ids) -> None:
+        """Increments the versions of the interfaces, so the cable labels showing them are rendered again (see cable.CableInterfaceLabel)."""
+
+        for interface_id in interface_ids:
+            self.interface_versions[interface_id] = self.interface_versions.get(interface_id, 0) + 1
     
     def deleteInterfaceIP(self, interface_id, subinterface_index, old_ip) -> bool:
         """
@@ -419,6 +804,7 @@ class Device(QGraphicsPixmapItem):
             rpc_reply, filter = interfaces.deleteIpWithNetconf(self, interface_id, subinterface_index, old_ip)
             if rpc_reply:
                 utils.addPendingChange(self, f"Delete IP: {old_ip} from interface: {interface_id}.{subinterface_index}", rpc_reply, filter)
+                self._recordInterfaceChange(interface_id)
                 utils.printRpc(rpc_reply, "Delete IP", self)
 
                 # Delete the IP from the self.interfaces dictionary
@@ -458,6 +844,7 @@ class Device(QGraphicsPixmapItem):
             rpc_reply, filter = interfaces.setIpWithNetconf(self, interface_id, subinterface_index, new_ip)
             if rpc_reply:
                 utils.addPendingChange(self, f"Set IP: {new_ip} on interface: {interface_id}.{subinterface_index}", rpc_reply, filter)
+                self._recordInterfaceChange(interface_id)
                 utils.printRpc(rpc_reply, "Set IP", self)
                 
                 # Add the IP to the self.interfaces dictionary
@@ -496,6 +883,7 @@ class Device(QGraphicsPixmapItem):
             rpc_reply, filter = interfaces.addInterfaceWithNetconf(self, interface_id, interface_type)
             if rpc_reply:
                 utils.addPendingChange(self, f"Add interface: {interface_id}", rpc_reply, filter)
+                self._recordInterfaceChange(interface_id)
                 utils.printRpc(rpc_reply, "Add Interface", self)
                 self.interfaces[interface_id] = {
                     "flag": "uncommited",
@@ -521,6 +909,7 @@ class Device(QGraphicsPixmapItem):
             rpc_reply, filter = interfaces.editDescriptionWithNetconf(self, interface_id, description)
             if rpc_reply:
                 utils.addPendingChange(self, f"Edit description on interface: {interface_id}", rpc_reply, filter)
+                self._recordInterfaceChange(interface_id)
                 utils.printRpc(rpc_reply, "Edit description on interface", self)
                 self.interfaces[interface_id]["description"] = description
                 self.interfaces[interface_id]["flag"] = "uncommited"
@@ -543,23 +932,18 @@ class Device(QGraphicsPixmapItem):
         return OSPFDevice(self)
     
     # ---------- ROUTING TABLE FUNCTIONS ---------- 
-    def getRoutingTable(self) -> ET.Element:
+    def getRoutingTable(self) -> "routing.RouteStore":
         """
         Retrieves the routing table from the device based on its operating system.
+        The routes are streamed from the reply into a columnar store (see modules/routing.py), the reply is never turned into a DOM.
         Returns:
-            rpc_reply: The routing table information.
+            RouteStore: The routes of the device (None, if the routing table could not be retrieved).
         """
 
         try:
-            if self.device_parameters["device_params"] == "iosxe":
-                rpc_filter = IetfRouting_Get_GetRoutingState_Filter()
-                rpc_reply = self.mngr.get(str(rpc_filter))
-            elif self.device_parameters["device_params"] == "junos":
-                rpc_payload = JunosRpcRoute_Dispatch_GetRoutingInformation_Filter()
-                rpc_reply = self.mngr.dispatch(rpc_payload.__ele__())
-            
-            utils.printRpc(rpc_reply, "Get Routing Table", self)
-            return (rpc_reply)
+            routes = routing.getRoutingTableWithNetconf(self)
+            utils.printGeneral(f"Retrieved routing table of device with ID: {self.id}: {len(routes)} routes.")
+            return(routes)
         except Exception as e:
             utils.printGeneral(f"Error getting routing table: {e}")
             utils.printGeneral(traceback.format_exc())
@@ -567,64 +951,72 @@ class Device(QGraphicsPixmapItem):
     def _showRoutingTable(self) -> None:
         """
         Displays the routing table in a dialog window.
-        This method retrieves the routing table using the `getRoutingTable` method,
-        converts it to an XML tree using the `helper.convertToEtree` function, and
-        then displays it in a `RoutingTableDialog` window.
+        This method retrieves the routing table using the `getRoutingTable` method and displays it in a `ShowRoutingTableDialog` window.
         """
 
-        routing_table = self.getRoutingTable()
-
-        if routing_table is None:
-            routing_table_dialog = ShowRoutingTableDialog(None, self)
-            routing_table_dialog.exec()
-            return
-
-        if self.device_parameters["device_params"] == "iosxe":
-            routing_table_dialog = ShowRoutingTableDialog(utils.convertToEtree(routing_table, "iosxe"), self)
-        elif self.device_parameters["device_params"] == "junos":
-            routing_table_dialog = ShowRoutingTableDialog(utils.convertToEtree(routing_table, "junos"), self)
-
+        routing_table_dialog = routing.ShowRoutingTableDialog(self, self.getRoutingTable())
         routing_table_dialog.exec()
 
     # ---------- RUNNING CONFIGARATION FUNCTIONS ----------
-    def getRunningConfig(self) -> ET.Element:
+    def getRunningConfigSection(self, section, force=False) -> ET.Element:
         """
-        Retrieves the running-configuration from the device.
+        Retrieves a section (top-level container) of the running configuration, using a subtree filter.
+        The section is served from the snapshot cache, unless it has expired, or force is True.
+        Args:
+            section (str): The name of the section (see RUNNING_CONFIG_SECTIONS and OTHER_RUNNING_CONFIG_SECTIONS).
+            force (bool, optional): Retrieve the section from the device, even if it is cached.
         Returns:
-            rpc_reply: The running config information.
+            lxml.etree._Element: The section (None, if it could not be retrieved).
         """
 
+        return(self.snapshot_cache.get(("running-config", section), lambda: self._getRunningConfigSectionWithNetconf(section), force))
+
+    def _getRunningConfigSectionWithNetconf(self, section) -> ET.Element:
         try:
-            rpc_reply = self.mngr.get_config(source="running")
-            utils.printRpc(rpc_reply, "Get Running-Configuration", self)
-            return (rpc_reply)
+            section_element, rpc_reply = system.getRunningConfigSectionWithNetconf(self, section)
+            utils.printRpc(rpc_reply, f"Get Running-Configuration section: {section}", self)
+            return(section_element)
         except Exception as e:
-            utils.printGeneral(f"Error getting running-config: {e}")
+            utils.printGeneral(f"Error getting running-config section {section}: {e}")
             utils.printGeneral(traceback.format_exc())
 
     def _showRunningConfig(self) -> None:
         """
-        Displays the routing table in a dialog window.
-        This method retrieves the routing table using the `getRoutingTable` method,
-        converts it to an XML tree using the `helper.convertToEtree` function, and
-        then displays it in a `RoutingTableDialog` window.
+        Displays the running configuration in a dialog window.
+        The dialog shows the sections of the running configuration, every section is retrieved (see `getRunningConfigSection`) only when it is expanded.
         """
 
-        running_config = self.getRunningConfig()
+        running_config_dialog = ShowRunningConfigDialog(self)
+        running_config_dialog.exec()
 
-        if running_config is None:
-            running_config_dialog = ShowRunningConfigDialog(None, self)
-            running_config_dialog.exec()
-            return
+    # ---------- CANDIDATE DATASTORE MANIPULATION FUNCTIONS ----------
+    # Each operation is split into two parts, so it can be performed on multiple devices at the same time (see workers.FanOutExecutor):
+    #   - perform...(): NETCONF operations only, safe to be called from a worker thread. Returns the result, raises an exception on failure.
+    #   - finish...(result): Applies the result to the device and the canvas. Must be called from the GUI thread.
+    def replayPendingChanges(self) -> int:
+        """
+        Stages again the pending changes left in the journal by an earlier run of the application (see journal.PendingChangeJournal),
+        e.g. after the application has crashed. The changes are staged (or sent) in the order, in which they were made.
+        Returns:
+            int: The number of the replayed changes.
+        """
 
-        if self.device_parameters["device_params"] == "iosxe":
-            running_config_dialog = ShowRunningConfigDialog(utils.convertToEtree(running_config, "iosxe"), self)
-        elif self.device_parameters["device_params"] == "junos":
-            running_config_dialog = ShowRunningConfigDialog(utils.convertToEtree(running_config, "junos"), self)
+        records = pending_change_journal.takeLeftovers(self)
+        for record in records:
+            try:
+                rpc_reply = netconf.editNetconfConfig(self, record)
+                utils.printRpc(rpc_reply, f"Replay: {record.operation}", self)
+            except Exception as e:
+                record.reply_status = "error"
+                utils.printGeneral(f"Failed to replay the pending change \"{record.operation}\" on device {self.id}: {e}")
+            signal_manager.pendingChangeAdded.emit(record)
 
-        running_config_dialog.exec()
+        if records:
+            self.has_pending_changes = True
+            self.has_updated_hostname = True # The hostname may have been changed by the replayed changes
+            self._recordInterfaceChange() # The touched interfaces are not known - all of them will be retrieved after the commit
+        return(len(records))
 
-    # ---------- CANDIDATE DATASTORE MANIPULATION FUNCTIONS ----------
     def discardChanges(self) -> bool:
         """
         Discards all pending changes on the device.
@@ -635,20 +1027,60 @@ class Device(QGraphicsPixmapItem):
         """
         
         try:
-            rpc_reply = netconf.discardNetconfChanges(self)
-            if rpc_reply:
-                utils.printRpc(rpc_reply, "Discard changes", self)
-                self.interfaces = self.getInterfaces() # Refresh interfaces after discard
-                self.has_pending_changes = False
-                signal_manager.deviceNoLongerHasPendingChanges.emit(self.id)
-                self.updateCableLabelsText()
-                return True
+            result = self.performDiscard()
+            self.finishDiscard(result)
+            return True
         except Exception as e:
             utils.printGeneral(f"Error discarding changes: {e}")
             utils.printGeneral(traceback.format_exc())
             QMessageBox.critical(None, "Error", f"Error discarding changes: {e}")
             return False
 
+    def performDiscard(self) -> dict:
+        """Performs the <discard-changes> operation and retrieves the interfaces. Safe to be called from a worker thread."""
+
+        self.edit_batch.clear() # The staged changes are dropped without being sent
+        rpc_reply = netconf.discardNetconfChanges(self)
+        if not rpc_reply:
+            raise RuntimeError(f"Failed to discard changes on device {self.id}")
+        utils.printRpc(rpc_reply, "Discard changes", self)
+        self.snapshot_cache.invalidate()
+        return({"interfaces": self.refreshInterfaces()}) # Refresh the touched interfaces after discard
+
+    def performApply(self) -> dict:
+        """
+        Sends the staged changes (see EditconfigBatch) to the configuration target datastore, in a single edit-config.
+        Called on Apply and before every validation and commit. Safe to be called from a worker thread.
+        """
+
+        for rpc_reply in netconf.applyNetconfChanges(self):
+            utils.printRpc(rpc_reply, "Apply staged changes", self)
+        return({})
+
+    def finishDiscard(self, result) -> None:
+        """Applies the result of performDiscard() to the device."""
+
+        self.interfaces = result["interfaces"]
+        self.interface_journal = set()
+        utils.clearPendingChanges(self)
+        self.updateCableLabelsText()
+
+    def performValidate(self) -> None:
+        """
+        Performs the <validate> operation on the candidate datastore (first phase of the transactional commit). Raises an exception, if the validation fails.
+        Devices without the :validate capability are skipped - the configuration is then checked by the device during the commit.
+        Safe to be called from a worker thread.
+        """
+
+        self.performApply()
+        if not any(":validate" in capability for capability in self.mngr.server_capabilities):
+            utils.printGeneral(f"Device {self.id} does not support the <validate> operation, skipping validation.")
+            return None
+
+        rpc_reply = netconf.validateNetconfChanges(self)
+        utils.printRpc(rpc_reply, "Validate changes", self)
+        return None
+
     def commitChanges(self, confirmed=False, confirm_timeout=None) -> bool:
         """
         Commits all pending changes on the device.
@@ -656,21 +1088,94 @@ class Device(QGraphicsPixmapItem):
         """
         
         try:
-            rpc_reply = netconf.commitNetconfChanges(self, confirmed, confirm_timeout)
-            if rpc_reply:
-                utils.printRpc(rpc_reply, "Commit changes", self)
-                self.interfaces = self.getInterfaces() # Refresh interfaces after commit
-
-                if not confirmed: # Dont remove the pending changes flag, if the commit is of the confirmed type
-                    self.has_pending_changes = False
-                    signal_manager.deviceNoLongerHasPendingChanges.emit(self.id)
-                    self.updateCableLabelsText()
-                return True
+            result = self.performCommit(confirmed, confirm_timeout)
+            self.finishCommit(result, confirmed)
+            if not confirmed:
+                self.finishRefresh(self.performRefresh(self.beginRefresh()))
+            return True
         except Exception as e:
             utils.printGeneral(f"Error committing changes: {e}")
             utils.printGeneral(traceback.format_exc())
             QMessageBox.critical(None, "Error", f"Error committing changes: {e}")
             return False
+
+    def performCommit(self, confirmed=False, confirm_timeout=None) -> dict:
+        """
+        Performs the <commit> operation. The interfaces are retrieved afterwards, once all the devices have been committed (see performRefresh).
+        Safe to be called from a worker thread.
+        """
+
+        self.performApply()
+        rpc_reply = netconf.commitNetconfChanges(self, confirmed, confirm_timeout)
+        if not rpc_reply:
+            raise RuntimeError(f"Failed to commit changes on device {self.id}")
+        utils.printRpc(rpc_reply, "Commit changes", self)
+        self.snapshot_cache.invalidate() # The running configuration has changed (even by the confirmed commit)
+        return({})
+
+    def finishCommit(self, result, confirmed=False) -> None:
+        """Applies the result of performCommit() to the device."""
+
+        if not confirmed: # Dont remove the pending changes flag, if the commit is of the confirmed type
+            utils.clearPendingChanges(self)
+
+    def beginRefresh(self) -> dict:
+        """
+        Takes the snapshot of the interface journal, the interfaces and the updated hostname flag for performRefresh(). Must be called from the GUI thread,
+        when the refresh is submitted. The journal is started anew, so the changes made during the refresh are recorded separately.
+        Returns:
+            dict: The snapshot (passed to performRefresh, or to abortRefresh, if the refresh fails).
+        """
+
+        snapshot = {
+            "interface_journal": self.interface_journal,
+            "interfaces": dict(self.interfaces) if self.interfaces is not None else None,
+            "has_updated_hostname": self.has_updated_hostname
+        }
+        self.interface_journal = set()
+        self.has_updated_hostname = False
+        return(snapshot)
+
+    def performRefresh(self, snapshot) -> dict:
+        """
+        Retrieves the interfaces touched by the committed changes (and the hostname, if it was updated). Called after the commit of all the devices
+        has finished, so the commit of the other devices never waits for the retrieval. Not needed after the confirmed commit - the interfaces
+        are retrieved after its confirmation or cancellation. Works only with the snapshot taken by beginRefresh(), safe to be called from a worker thread.
+        """
+
+        result = {"snapshot": snapshot, "interfaces": self.refreshInterfaces(snapshot), "hostname": None} # Refresh the touched interfaces after commit
+        if snapshot["has_updated_hostname"]:
+            result["hostname"] = self.getHostname()
+        return(result)
+
+    def finishRefresh(self, result) -> None:
+        """
+        Applies the result of performRefresh() to the device. The interfaces changed again during the refresh (recorded in the new interface journal)
+        keep their current data and stay in the journal. When the touched interfaces are not known, the current data are kept and all the interfaces
+        are retrieved after the next commit.
+        """
+
+        if result["interfaces"] is None:
+            self.abortRefresh(result["snapshot"])
+            return
+
+        changed_again = self.interface_journal
+        if changed_again is not None:
+            interfaces_data = {name: data for name, data in result["interfaces"].items() if name not in changed_again}
+            interfaces_data.update({name: data for name, data in (self.interfaces or {}).items() if name in changed_again})
+            self.interfaces = {key: interfaces_data[key] for key in natsorted(interfaces_data)} # sort the interfaces by name
+            self.updateCableLabelsText()
+        if result["hostname"] is not None and not self.has_updated_hostname: # Refresh the hostname label on canvas, unless it was updated again
+            self.refreshHostnameLabel(result["hostname"])
+
+    def abortRefresh(self, snapshot) -> None:
+        """Returns the snapshot taken by beginRefresh() to the interface journal, when the refresh has failed, so the interfaces are retrieved after the next commit."""
+
+        if snapshot["interface_journal"] is None or self.interface_journal is None:
+            self.interface_journal = None
+        else:
+            self.interface_journal.update(snapshot["interface_journal"])
+        self.has_updated_hostname = self.has_updated_hostname or snapshot["has_updated_hostname"]
         
     def cancelCommit(self) -> bool:
         """
@@ -682,25 +1187,40 @@ class Device(QGraphicsPixmapItem):
         """
         
         try:
-            if self.device_parameters["device_params"] == "iosxe": # Cisco SUPPORTS the standard <cancel-commit> operation
-                rpc_reply = netconf.cancelNetconfCommit(self) 
-            elif self.device_parameters["device_params"] == "junos": # Juniper DOES NOT support the <cancel-commit> operation
-                rpc_reply = netconf.rollbackNetconfChanges(self) 
-                self.commitChanges()
-
-            if rpc_reply:
-                utils.printRpc(rpc_reply, "Cancel commit", self)
-                self.interfaces = self.getInterfaces()
-                self.has_pending_changes = False
-                signal_manager.deviceNoLongerHasPendingChanges.emit(self.id)
-                self.updateCableLabelsText()
-                return True
-
+            result = self.performCancelCommit()
+            self.finishCancelCommit(result)
+            return True
         except Exception as e:
             utils.printGeneral(f"Error cancelling commit: {e}")
             utils.printGeneral(traceback.format_exc())
             QMessageBox.critical(None, "Error", f"Error cancelling commit: {e}")
             return False
+
+    def performCancelCommit(self) -> dict:
+        """Performs the operations needed to cancel the confirmed commit and retrieves the interfaces. Safe to be called from a worker thread."""
+
+        self.edit_batch.clear() # The changes staged since the confirmed commit are dropped as well
+
+        if self.device_parameters["device_params"] == "iosxe": # Cisco SUPPORTS the standard <cancel-commit> operation
+            rpc_reply = netconf.cancelNetconfCommit(self) 
+        elif self.device_parameters["device_params"] == "junos": # Juniper DOES NOT support the <cancel-commit> operation
+            rpc_reply = netconf.rollbackNetconfChanges(self) 
+            commit_rpc_reply = netconf.commitNetconfChanges(self) # Commit the rolled back configuration (the interfaces are retrieved only once, below)
+            utils.printRpc(commit_rpc_reply, "Commit rollback", self)
+
+        if not rpc_reply:
+            raise RuntimeError(f"Failed to cancel commit on device {self.id}")
+        utils.printRpc(rpc_reply, "Cancel commit", self)
+        self.snapshot_cache.invalidate()
+        return({"interfaces": self.refreshInterfaces()})
+
+    def finishCancelCommit(self, result) -> None:
+        """Applies the result of performCancelCommit() to the device."""
+
+        self.interfaces = result["interfaces"]
+        self.interface_journal = set()
+        utils.clearPendingChanges(self)
+        self.updateCableLabelsText()
     
     # ---------- REGISTRY FUNCTIONS ---------- 
     @classmethod
@@ -739,13 +1259,31 @@ class Device(QGraphicsPixmapItem):
     def getAllDevicesInstancesKeys(cls) -> list:
         """Retrieves all device instance keys."""
 
-        return list(cls._registry.keys())
+        return list(cls._registry.by_id.keys())
     
     @classmethod
     def getAllDevicesInstances(cls) -> list:
         """Retrieves all device instances."""
 
-        return list(cls._registry.values())
+        return list(cls._registry.by_id.values())
+
+    @classmethod
+    def getPlacedDevicesInstances(cls) -> list:
+        """Retrieves all the devices placed on the canvas, including the devices, which are being brought up or have failed."""
+
+        return list(cls._registry.by_address.values())
+
+    @classmethod
+    def getDeviceInstanceByAddress(cls, address, port) -> "Device":
+        """Retrieves the device placed on the canvas with the address and port (also a device, which is not brought up yet)."""
+
+        return cls._registry.getByAddress(address, port)
+
+    @classmethod
+    def findDevicesInstances(cls, hostname=None, vendor=None, capability=None) -> list:
+        """Retrieves the device instances matching all the specified criteria (see DeviceRegistry.find)."""
+
+        return cls._registry.find(hostname, vendor, capability)
 
     
 class Router(Device):
@@ -771,8 +1309,8 @@ class Router(Device):
     is_ipsec_capable = False # Cisco routers are capable, Juniper routers are not
     is_vlan_capable = False
 
-    def __init__(self, device_parameters, x=0, y=0) -> "Router":
-        super().__init__(device_parameters, x, y)
+    def __init__(self, device_parameters, x=0, y=0, bring_up=True) -> "Router":
+        super().__init__(device_parameters, x, y, bring_up)
 
         # ICON
         router_icon_img = QImage(os.path.join(ROOT_DIR, "graphics/devices/router.png"))
@@ -825,13 +1363,17 @@ class Switch(Device):
     is_ipsec_capable = False
     is_vlan_capable = True
 
-    def __init__(self, device_parameters, x=0, y=0) -> "Switch":
-        super().__init__(device_parameters, x, y)
+    def __init__(self, device_parameters, x=0, y=0, bring_up=True) -> "Switch":
+        super().__init__(device_parameters, x, y, bring_up)
 
         # ICON
         switch_icon_img = QImage(os.path.join(ROOT_DIR, "graphics/devices/switch.png"))
         self.setPixmap(QPixmap.fromImage(switch_icon_img))
 
+    def _retrieveDeviceInformation(self) -> None:
+        """Switch-specific device information (VLANs)."""
+
+        super()._retrieveDeviceInformation()
         self.vlans = self.getVlans()
 
     def _getContextMenuItems(self) -> list:
@@ -871,19 +1413,24 @@ class Switch(Device):
             utils.addPendingChange(self, f"Enable L3 functions", rpc_reply, filter)
             utils.printRpc(rpc_reply, "Enable L3 functions", self)
             self.is_ospf_capable = True
+            Device._registry.updateCapabilities(self)
             return True
         except Exception as e:
             utils.printGeneral(f"Error enabling L3 functions: {e}")
             utils.printGeneral(traceback.format_exc())
             return False
 
-    def getVlans(self) -> dict:
+    def getVlans(self, force=False) -> dict:
         """
         Retrieves VLAN information from the switch using NETCONF.
+        The VLANs are served from the snapshot cache, unless they have expired, or force is True.
         Returns:
             dict: The VLAN information
         """
 
+        return(self.snapshot_cache.get("vlans", self._getVlansWithNetconf, force))
+
+    def _getVlansWithNetconf(self) -> dict:
         try:
             vlan_data, rpc_reply = vlan.getVlansWithNetconf(self)
             utils.printRpc(rpc_reply, "Get VLANs", self)
@@ -921,6 +1468,7 @@ class Switch(Device):
         try:
             rpc_reply, filter = vlan.deleteInterfaceVlanWithNetconf(self, interfaces)
             utils.addPendingChange(self, f"Delete VLANs on interfaces", rpc_reply, filter)
+            self._recordInterfaceChange(*interfaces)
             utils.printRpc(rpc_reply, "Delete VLANs on interfaces", self)
             return True
         except Exception as e:
@@ -938,6 +1486,7 @@ class Switch(Device):
         try:
             rpc_reply, filter = vlan.setInterfaceVlanWithNetconf(self, interfaces)
             utils.addPendingChange(self, f"Set VLANs on interfaces", rpc_reply, filter)
+            self._recordInterfaceChange(*interfaces)
             utils.printRpc(rpc_reply, "Set VLANs on interfaces", self)
             return True
         except Exception as e:
@@ -962,8 +1511,8 @@ class Firewall(Router):
     _counter = 0
     is_security_zone_capable = False
 
-    def __init__(self, device_parameters, x=0, y=0) -> "Firewall":
-        super().__init__(device_parameters, x, y)
+    def __init__(self, device_parameters, x=0, y=0, bring_up=True) -> "Firewall":
+        super().__init__(device_parameters, x, y, bring_up)
 
         # ICON
         firewall_icon_img = QImage(os.path.join(ROOT_DIR, "graphics/devices/firewall.png"))
@@ -988,8 +1537,8 @@ class IOSXERouter(Router):
     
     is_ipsec_capable = True
 
-    def __init__(self, device_parameters, x=0, y=0):
-        super().__init__(device_parameters, x, y)
+    def __init__(self, device_parameters, x=0, y=0, bring_up=True):
+        super().__init__(device_parameters, x, y, bring_up)
 
     def configureIPSec(self, dev_parameters, ike_parameters, ipsec_parameters) -> bool:
         """
@@ -1002,6 +1551,7 @@ class IOSXERouter(Router):
         try:
             rpc_reply, filter = security.configureIPSecWithNetconf(self, dev_parameters, ike_parameters, ipsec_parameters)
             utils.addPendingChange(self, f"Configure IPSec tunnel", rpc_reply, filter)
+            self._recordInterfaceChange() # The tunnel interfaces are created by the device
             utils.printRpc(rpc_reply, "Configure IPSec", self)
             return True
         except Exception as e:
@@ -1022,8 +1572,8 @@ class JUNOSRouter(Router):
 
     is_ipsec_capable = False
 
-    def __init__(self, device_parameters, x=0, y=0) -> "JUNOSRouter":
-        super().__init__(device_parameters, x, y)
+    def __init__(self, device_parameters, x=0, y=0, bring_up=True) -> "JUNOSRouter":
+        super().__init__(device_parameters, x, y, bring_up)
 
 
 class IOSXESwitch(Switch):
@@ -1036,8 +1586,8 @@ class IOSXESwitch(Switch):
             device parameters and optional position coordinates.
     """
 
-    def __init__(self, device_parameters, x=0, y=0):
-        super().__init__(device_parameters, x, y)
+    def __init__(self, device_parameters, x=0, y=0, bring_up=True):
+        super().__init__(device_parameters, x, y, bring_up)
 
 
 class JUNOSFirewall(Firewall):
@@ -1050,9 +1600,9 @@ class JUNOSFirewall(Firewall):
     Methods:
         __init__(device_parameters, x=0, y=0):
             Initializes the JUNOSFirewall instance with device parameters and optional coordinates.
-        getInterfaces():
-            Retrieves the interfaces of the device and enriches the data with security zone information.
-        addSecurityZoneDataToInterfacesDict(interfaces_dict: dict):
+        getInterfaces(interface_ids=None, force=False):
+            Retrieves the interfaces of the device (or only the specified ones) and enriches the data with security zone information.
+        addSecurityZoneDataToInterfacesDict(interfaces_dict: dict, force=False):
             Internal method to add security zone data to the provided interfaces dictionary.
         configureInterfacesSecurityZone(interface_id, security_zone, remove_interface_from_zone=False):
             Configures or removes a security zone on a specified interface.
@@ -1063,12 +1613,12 @@ class JUNOSFirewall(Firewall):
     is_ipsec_capable = True
     is_security_zone_capable = True
 
-    def __init__(self, device_parameters, x=0, y=0) -> "JUNOSFirewall":
-        super().__init__(device_parameters, x, y)
+    def __init__(self, device_parameters, x=0, y=0, bring_up=True) -> "JUNOSFirewall":
+        super().__init__(device_parameters, x, y, bring_up)
 
-    def getInterfaces(self) -> dict:
+    def getInterfaces(self, interface_ids=None, force=False) -> dict:
         """
-        Retrieves the interfaces of the device and enriches them with security zone data.
+        Retrieves the interfaces of the device (or only the specified ones) and enriches them with security zone data.
         This method first calls the parent class's `getInterfaces` method to obtain
         the base interface information. It then adds additional security zone data
         to the interfaces dictionary. The security zone information is not present
@@ -1077,11 +1627,11 @@ class JUNOSFirewall(Firewall):
             dict: A dictionary containing the interfaces with added security zone data.
         """
 
-        interfaces = super().getInterfaces()
-        interfaces_with_security_zone_data = self.addSecurityZoneDataToInterfacesDict(interfaces)
+        interfaces = super().getInterfaces(interface_ids, force)
+        interfaces_with_security_zone_data = self.addSecurityZoneDataToInterfacesDict(interfaces, force)
         return interfaces_with_security_zone_data
 
-    def addSecurityZoneDataToInterfacesDict(self, interfaces_dict: dict) -> dict:
+    def addSecurityZoneDataToInterfacesDict(self, interfaces_dict: dict, force=False) -> dict:
         """
         Adds security zone data to the provided interfaces dictionary.
         This method retrieves security zone information from the device using NETCONF,
@@ -1091,6 +1641,7 @@ class JUNOSFirewall(Firewall):
             interfaces_dict (dict): A dictionary containing interface data. The keys
                 are interface names, and the values are dictionaries with interface
                 attributes.
+            force (bool, optional): Retrieve the security zones from the device, even if they are cached.
         Returns:
             dict: The updated interfaces dictionary with security zone information added.
         Raises:
@@ -1109,21 +1660,15 @@ class JUNOSFirewall(Firewall):
         """
 
         try:
-            rpc_payload, rpc_reply = security.getSecurityZonesWithNetconf(self)
-            utils.printRpc(rpc_reply, "Get Security Zones", self)
-            
-            # Extract security zones names
-            rpc_reply_etree = utils.convertToEtree(rpc_reply, self.device_parameters["device_params"])
-            security_zones_tags = rpc_reply_etree.findall(".//zones-information/zones-security/zones-security-zonename")
-            self.security_zones = [zone.text for zone in security_zones_tags]
+            security_zones_data = self.snapshot_cache.get("security_zones", self._getSecurityZonesWithNetconf, force)
+            self.security_zones = list(security_zones_data)
     
             # Add security zones data to the interfaces dictionary
-            for zone in self.security_zones:
-                interfaces_tags = rpc_reply_etree.findall(f".//zones-information/zones-security[zones-security-zonename='{zone}']/zones-security-interfaces/zones-security-interface-name")
-                interfaces = [interface.text for interface in interfaces_tags]
+            for zone, interfaces in security_zones_data.items():
                 for interface in interfaces:
                     interface_stripped = interface.split(".")[0] # remove subinterface number
-                    interfaces_dict[interface_stripped]["security_zone"] = zone
+                    if interface_stripped in interfaces_dict: # Only some of the interfaces might have been retrieved
+                        interfaces_dict[interface_stripped]["security_zone"] = zone
 
             return(interfaces_dict)
 
@@ -1131,6 +1676,25 @@ class JUNOSFirewall(Firewall):
             utils.printGeneral(f"Error getting security zones: {e}")
             utils.printGeneral(traceback.format_exc())
             return
+
+    def _getSecurityZonesWithNetconf(self) -> dict:
+        """
+        Retrieves the security zones and their interfaces.
+        Returns:
+            dict: Security zone name -> list of the interface names in the zone.
+        """
+
+        rpc_payload, rpc_reply = security.getSecurityZonesWithNetconf(self)
+        utils.printRpc(rpc_reply, "Get Security Zones", self)
+
+        # Extract security zones names and their interfaces
+        rpc_reply_etree = utils.convertToEtree(rpc_reply, self.device_parameters["device_params"])
+        security_zones_data = {}
+        for zone in rpc_reply_etree.findall(".//zones-information/zones-security"):
+            zone_name = zone.findtext("zones-security-zonename")
+            interfaces_tags = zone.findall("zones-security-interfaces/zones-security-interface-name")
+            security_zones_data[zone_name] = [interface.text for interface in interfaces_tags]
+        return(security_zones_data)
         
     def configureInterfacesSecurityZone(self, interface_id, security_zone, remove_interface_from_zone=False) -> bool:
         """
@@ -1148,6 +1712,7 @@ class JUNOSFirewall(Firewall):
                 return False
 
             rpc_reply, filter = security.configureSecurityZoneToInterfaceWithNetconf(self, interface_id, security_zone, remove_interface_from_zone)
+            self._recordInterfaceChange(interface_id)
             if remove_interface_from_zone:
                 utils.addPendingChange(self, f"Remove security zone: {security_zone} from interface: {interface_id}", rpc_reply, filter)
                 utils.printRpc(rpc_reply, "Remove Security Zone", self)
@@ -1176,6 +1741,7 @@ class JUNOSFirewall(Firewall):
         try:
             rpc_reply, filter = security.configureIPSecWithNetconf(self, dev_parameters, ike_parameters, ipsec_parameters)
             utils.addPendingChange(self, f"Configure IPSec tunnel", rpc_reply, filter)
+            self._recordInterfaceChange() # The tunnel interfaces are created by the device
             utils.printRpc(rpc_reply, "Configure IPSec", self)
             return True
         except Exception as e:
@@ -1231,6 +1797,7 @@ class ClonedDevice(QGraphicsPixmapItem):
 
         # INTERFACES
         self.interfaces = original_device.interfaces
+        self.interface_versions = original_device.interface_versions
 
         # ID
         self.id = original_device.id
@@ -1432,12 +1999,10 @@ class AddDeviceDialog(QDialog):
             elif "Juniper JunOS" in self.deviceTypeComboInput.currentText():
                 self.device_parameters["device_params"] = "junos"
 
-            # Check if the device with the same address is not already in the scene
-            for device in self.view.scene.items():
-                if isinstance(device, Device):
-                    if device.device_parameters["address"] == self.device_parameters["address"]:
-                        QMessageBox.warning(self, "Device already exists", "The device with the same address is already in the scene.")
-                        raise ValueError("Device already exists")
+            # Check if the device with the same address (and port) is not already in the scene
+            if Device.getDeviceInstanceByAddress(self.device_parameters["address"], self.device_parameters["port"]) is not None:
+                QMessageBox.warning(self, "Device already exists", "The device with the same address and port is already in the scene.")
+                raise ValueError("Device already exists")
 
             # Add the device with the correct type               
             if self.deviceTypeComboInput.currentText() == "Router - Cisco IOS XE":
@@ -1486,62 +2051,56 @@ class ShowXMLDialog(QDialog):
         self.ui.expand_button.clicked.connect(self.ui.data_tree.expandAll)
         self.ui.close_button_box.rejected.connect(self.reject)
         self.ui.refresh_button.setEnabled(False)
-        # Fill the QTreeWidget with the data, takes the XML root element and the QTreeWidget as arguments
-        utils.populateTreeWidget(self.ui.data_tree, self.xml_data)
+        # Show the data in the QTreeView, the rows are created lazily (when their branch is expanded)
+        utils.populateTreeView(self.ui.data_tree, self.xml_data)
 
-class ShowRoutingTableDialog(ShowXMLDialog):
-    def __init__(self, data, device, data_type = "Routing Table"):
+class ShowRunningConfigDialog(ShowXMLDialog):
+    def __init__(self, device, data_type = "Running Configuration"):
         """
-        Initializes the dialog for showing the routing table.
+        Initializes the dialog for showing the running configuration.
+        Only the sections of the running configuration are shown at first, every section is retrieved when it is expanded.
         Args:
-            data: The XML data (XML root element, specifically).
             device (Device): The device object for which to display the data.
-            data_type (str): The type of data being displayed (default is "Routing Table").
+            data_type (str): The type of data being displayed (default is "Running Configuration").
         """
-        super().__init__(data, device, data_type)
-        self.setWindowTitle("Routing Table")
+        super().__init__(None, device, data_type)
+        self.device = device
+        self.setWindowTitle("Running Configuration")
         self.ui.refresh_button.setEnabled(True)
-        self.ui.refresh_button.clicked.connect(lambda: self._refreshRoutingTable(device))
+        self.ui.refresh_button.clicked.connect(self._refreshRunningConfig)
+        self.ui.expand_button.clicked.disconnect()
+        self.ui.expand_button.clicked.connect(self._expandAll)
+        self._showSections()
 
-    def _refreshRoutingTable(self, router):
+    def _showSections(self) -> None:
         """
-        Refreshes the routing table of the selected router. This method is called when the user clicks the "Refresh" button in the routing table dialog.
-        Args:
-            router (Router): The router for which to refresh the routing table.
+        Shows the sections of the running configuration (the already retrieved ones with their content).
+        The last section holds the top-level containers, which are not in the list of the sections (see OTHER_RUNNING_CONFIG_SECTIONS).
         """
 
-        routing_table = router.getRoutingTable()
-        if router.device_parameters["device_params"] == "iosxe":
-            routing_table_etree = utils.convertToEtree(routing_table, "iosxe")
-        elif router.device_parameters["device_params"] == "junos":
-            routing_table_etree = utils.convertToEtree(routing_table, "junos")
+        container, sections = RUNNING_CONFIG_SECTIONS[self.device.device_parameters["device_params"]]
+        sections = sections + (OTHER_RUNNING_CONFIG_SECTIONS,)
+        cached_sections = {}
+        for section in sections:
+            section_element = self.device.snapshot_cache.peek(("running-config", section))
+            if section_element is not None:
+                cached_sections[section] = section_element
+        model = utils.SectionedXmlTreeModel(container, sections, self.device.getRunningConfigSection, cached_sections, self.ui.data_tree)
+        self.ui.data_tree.setModel(model)
+        self.ui.data_tree.expand(model.index(0, 0))
 
-        utils.populateTreeWidget(self.ui.data_tree, routing_table_etree)
+    def _expandAll(self) -> None:
+        """Retrieves all the sections, which were not retrieved yet, and expands the whole tree."""
 
-class ShowRunningConfigDialog(ShowXMLDialog):
-    def __init__(self, data, device, data_type = "Running Configuration"):
-        """
-        Initializes the dialog for showing the running configuration.
-        Args:
-            data: The XML data (XML root element, specifically).
-            device (Device): The device object for which to display the data.
-            data_type (str): The type of data being displayed (default is "Running Configuration").
-        """
-        super().__init__(data, device, data_type)
-        self.setWindowTitle("Running Configuration")
-        self.ui.refresh_button.setEnabled(True)
-        self.ui.refresh_button.clicked.connect(lambda: self._refreshRunningConfig(device))
+        self.ui.data_tree.model().fetchAll()
+        self.ui.data_tree.expandAll()
 
-    def _refreshRunningConfig(self, device):
+    def _refreshRunningConfig(self):
         """
         Refreshes the running configuration of the selected device. This method is called when the user clicks the "Refresh" button in the running configuration dialog.
-        Args:
-            device (Device): The device for which to refresh the running configuration.
+        The cached sections are dropped, so they are retrieved again when expanded.
         """
 
-        running_config = device.getRunningConfig()
-        if device.device_parameters["device_params"] == "iosxe":
-            running_config_etree = utils.convertToEtree(running_config, "iosxe")
-        elif device.device_parameters["device_params"] == "junos":
-            running_config_etree = utils.convertToEtree(running_config, "junos")
-        utils.populateTreeWidget(self.ui.data_tree, running_config_etree)
\ No newline at end of file
+        container, sections = RUNNING_CONFIG_SECTIONS[self.device.device_parameters["device_params"]]
+        self.device.snapshot_cache.invalidate(*[("running-config", section) for section in sections + (OTHER_RUNNING_CONFIG_SECTIONS,)])
+        self._showSections()
\ No newline at end of file
@@ -0,0 +1,262 @@
+# ---------- IMPORTS: ----------
+# Standard library
+import os
+import re
+import json
+import time
+import zlib
+import base64
+import logging
+import itertools
+import threading
+from lxml import etree as ET
+
+# Custom modules
+from yang.filters import listEntryKey
+from definitions import PENDING_CHANGE_JOURNAL_DIR
+
+# ---------- PENDING CHANGE JOURNAL: ----------
+class PendingChangeRecord:
+    """
+    Compact record of one pending change, kept by the PendingChangeJournal (and shown by the pending changes table).
+    Attributes:
+        sequence (int): Identifies the record within the running application.
+        device_id (str): ID of the device, on which the change was made.
+        operation (str): Name of the change (e.g. "Set IP: 10.0.0.1/24 on interface: GigabitEthernet1.0").
+        target (str): Path of the configuration changed by the filter (e.g. "/native/interface/GigabitEthernet[name=1]").
+        filter (bytes): The serialized filter (edit-config <config>), compressed with zlib.
+        reply_status (str): "staged" (the change was staged, see netconf.editNetconfConfig), "ok", or "error".
+        time (float): Time of the change.
+    """
+
+    __slots__ = ("sequence", "device_id", "operation", "target", "filter", "reply_status", "time")
+
+    def __init__(self, sequence, device_id, operation, target, filter, reply_status, time) -> "PendingChangeRecord":
+        self.sequence = sequence
+        self.device_id = device_id
+        self.operation = operation
+        self.target = target
+        self.filter = filter
+        self.reply_status = reply_status
+        self.time = time
+
+    def filterXml(self) -> bytes:
+        """Returns the serialized (uncompressed) filter."""
+
+        return(zlib.decompress(self.filter) if self.filter else b"")
+
+    def __ele__(self) -> ET._Element:
+        """
+        Returns the filter parsed again (None, if the change has no filter). The record can be then passed to netconf.editNetconfConfig
+        instead of the filter, when the change is replayed.
+        """
+
+        filter_xml = self.filterXml()
+        return(ET.fromstring(filter_xml) if filter_xml else None)
+
+    def toJson(self) -> str:
+        return(json.dumps({
+            "device_id": self.device_id,
+            "operation": self.operation,
+            "target": self.target,
+            "filter": base64.b64encode(self.filter).decode("ascii"),
+            "reply_status": self.reply_status,
+            "time": self.time
+        }))
+
+    @classmethod
+    def fromJson(cls, sequence, line) -> "PendingChangeRecord":
+        data = json.loads(line)
+        return(cls(sequence, data["device_id"], data["operation"], data["target"], base64.b64decode(data["filter"]), data["reply_status"], data["time"]))
+
+
+class PendingChangeJournal:
+    """
+    Append-only journal of the pending changes, one file per device (identified by its address and port, so the changes are found again
+    after the application is restarted). Every change is written to the file as soon as it is made, so the pending changes survive
+    a crash of the application and can be replayed (staged again) once the device is brought up again.
+    The journal is cleared, when the changes of the device are committed or discarded.
+    Only the compact records are kept in memory (see PendingChangeRecord) - the filter is compressed and the RPC reply is reduced to its status.
+
+    Records in the files found on the start of the application (not cleared by the last run) are the leftovers. They stay in their files,
+    until they are replayed (see devices.Device.replayPendingChanges) or discarded.
+    The journal is a single instance shared by all the devices (see pending_change_journal), so it is guarded by a lock.
+    """
+
+    def __init__(self, directory=PENDING_CHANGE_JOURNAL_DIR) -> "PendingChangeJournal":
+        """
+        Args:
+            directory (str): Directory of the journal files (relative to the working directory, the same as "saved_devices.json").
+        """
+
+        self.directory = directory
+        self._records = {} # device key -> [PendingChangeRecord], the pending changes made in this run of the application
+        self._leftovers = None # device key -> [PendingChangeRecord], loaded from the files on the first use
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger("gnc.journal")
+
+    def append(self, device, operation, rpc_reply=None, filter=None) -> PendingChangeRecord:
+        """
+        Records the pending change of the device and writes it to the journal file of the device.
+        Args:
+            device (Device): The device, on which the change was made.
+            operation (str): Name of the change.
+            rpc_reply: The RPC reply to the change (or netconf.STAGED_EDIT_REPLY).
+            filter (EditconfigFilter): The filter of the change.
+        Returns:
+            PendingChangeRecord: The record of the change.
+        """
+
+        element = filter.__ele__() if filter is not None else None
+        filter_bytes = zlib.compress(ET.tostring(element)) if element is not None else b""
+        key = deviceKey(device)
+
+        with self._lock:
+            self._loadLeftovers()
+            record = PendingChangeRecord(next(self._sequence), device.id, operation, targetPath(element), filter_bytes, replyStatus(rpc_reply), time.time())
+            self._records.setdefault(key, []).append(record)
+            self._write(key, [record], mode="a")
+        return(record)
+
+    def records(self, device) -> list:
+        """Returns the records of the pending changes of the device (made in this run of the application)."""
+
+        with self._lock:
+            return(list(self._records.get(deviceKey(device), [])))
+
+    def clear(self, device) -> None:
+        """Drops the pending changes of the device (committed or discarded). The leftovers of the device are kept, until they are replayed or discarded."""
+
+        key = deviceKey(device)
+        with self._lock:
+            self._loadLeftovers()
+            if self._records.pop(key, None) is not None:
+                self._rewrite(key)
+
+    def leftovers(self, device) -> list:
+        """Returns the records of the pending changes of the device, which were left in the journal by an earlier run of the application."""
+
+        with self._lock:
+            self._loadLeftovers()
+            return(list(self._leftovers.get(deviceKey(device), [])))
+
+    def takeLeftovers(self, device) -> list:
+        """
+        Moves the leftovers of the device to the pending changes of this run (the caller stages them again, see devices.Device.replayPendingChanges).
+        The records are already in the journal file, so the file is not modified.
+        Returns:
+            list: The records (with the device ID updated to the current ID of the device).
+        """
+
+        key = deviceKey(device)
+        with self._lock:
+            self._loadLeftovers()
+            records = self._leftovers.pop(key, [])
+            for record in records:
+                record.device_id = device.id
+            self._records.setdefault(key, []).extend(records)
+        return(records)
+
+    def discardLeftovers(self, device) -> None:
+        key = deviceKey(device)
+        with self._lock:
+            self._loadLeftovers()
+            if self._leftovers.pop(key, None) is not None:
+                self._rewrite(key)
+
+    def _loadLeftovers(self) -> None:
+        """Loads the records from the journal files, once (on the first use of the journal). Must be called under the lock."""
+
+        if self._leftovers is not None:
+            return
+        self._leftovers = {}
+        if not os.path.isdir(self.directory):
+            return
+        for file_name in sorted(os.listdir(self.directory)):
+            if not file_name.endswith(".jsonl"):
+                continue
+            try:
+                with open(os.path.join(self.directory, file_name), encoding="utf-8") as file:
+                    lines = [line for line in file if line.strip()]
+                key = json.loads(lines[0])["device_key"] if lines else None
+            except (OSError, ValueError, KeyError) as e:
+                self._logger.warning(f"Skipping the pending change journal file {file_name}: {e}")
+                continue
+
+            records = []
+            for line in lines[1:]:
+                try:
+                    records.append(PendingChangeRecord.fromJson(next(self._sequence), line))
+                except (ValueError, KeyError): # The line was not written completely (the application crashed meanwhile)
+                    self._logger.warning(f"Skipping a damaged record in the pending change journal file {file_name}")
+            if key is not None and records:
+                self._leftovers[key] = records
+
+    def _rewrite(self, key) -> None:
+        """Writes the journal file of the device again, with its remaining records (removes the file, if there are none). Must be called under the lock."""
+
+        records = self._leftovers.get(key, []) + self._records.get(key, [])
+        if records:
+            self._write(key, records, mode="w")
+            return
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self._logger.warning(f"Failed to remove the pending change journal of {key}: {e}")
+
+    def _write(self, key, records, mode) -> None:
+        """Writes (mode "w") or appends (mode "a") the records to the journal file of the device. The file starts with a header with the device key."""
+
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, mode, encoding="utf-8") as file:
+                if mode == "w" or file.tell() == 0:
+                    file.write(json.dumps({"device_key": key}) + "\n")
+                file.write("".join(record.toJson() + "\n" for record in records))
+        except OSError as e: # The change is still pending (and shown), it just would not survive a crash
+            self._logger.warning(f"Failed to write the pending change journal of {key}: {e}")
+
+    def _path(self, key) -> str:
+        return(os.path.join(self.directory, re.sub(r"[^A-Za-z0-9.-]", "_", key) + ".jsonl"))
+
+pending_change_journal = PendingChangeJournal()
+
+# ---------- HELPER FUNCTIONS: ----------
+def deviceKey(device) -> str:
+    """Returns the key of the device in the journal - its address and port, which stay the same after the application is restarted."""
+
+    return(f"{device.device_parameters['address']}:{device.device_parameters['port']}")
+
+def replyStatus(rpc_reply) -> str:
+    """Reduces the RPC reply of the change to its status. The staged changes have no reply, just the netconf.STAGED_EDIT_REPLY string."""
+
+    if rpc_reply is None or isinstance(rpc_reply, str):
+        return("staged")
+    return("ok" if getattr(rpc_reply, "ok", True) else "error")
+
+def targetPath(element) -> str:
+    """
+    Returns the path of the configuration changed by the filter - the elements are followed from the <config> element down,
+    as long as there is a single one on the level. The list entries are shown with their keys (e.g. "/native/interface/GigabitEthernet[name=1]").
+    """
+
+    if element is None:
+        return("")
+    if ET.QName(element).localname == "config":
+        element = next(element.iterchildren(ET.Element), None)
+
+    parts = []
+    while element is not None:
+        children = list(element.iterchildren(ET.Element))
+        part = ET.QName(element).localname
+        key = listEntryKey(element)
+        if key is not None:
+            part += "[" + ",".join(f"{ET.QName(key_tag).localname}={key_value}" for key_tag, key_value in key) + "]"
+            children = children[len(key):]
+        parts.append(part)
+        element = children[0] if len(children) == 1 else None
+    return("/" + "/".join(parts))
@@ -4,20 +4,40 @@ import sys
 import os
 import json
 import time
+import logging
+import threading
 import traceback
 from io import StringIO
 from contextlib import contextmanager
-from threading import Thread, Event
+from collections import deque
+from logging.handlers import RotatingFileHandler
 
 # Custom modules
-from devices import Device, AddDeviceDialog, addFirewall, addRouter, addSwitch
-from cable import Cable, CableEditMode
+from devices import Device, AddDeviceDialog, addFirewall, addRouter, addSwitch, bring_up_executor
+from cable import Cable, CableEditMode, updateCablesGeometry
 from signals import signal_manager
+from workers import FanOutExecutor
+from metrics import rpc_metrics
+from journal import pending_change_journal
 import utils
 import modules.ospf as ospf
 import modules.security as security
 import modules.vlan as vlan
-from definitions import ROOT_DIR, STDOUT_TO_CONSOLE, STDERR_TO_CONSOLE, DARK_MODE
+from definitions import (
+    ROOT_DIR,
+    STDOUT_TO_CONSOLE,
+    STDERR_TO_CONSOLE,
+    DARK_MODE,
+    TRANSACTION_CONFIRM_TIMEOUT,
+    RPC_METRICS_REFRESH_INTERVAL,
+    CABLE_GEOMETRY_UPDATE_INTERVAL,
+    CONSOLE_MAX_LINES,
+    CONSOLE_BUFFER_MAX_BYTES,
+    CONSOLE_MESSAGE_MAX_BYTES,
+    CONSOLE_FLUSH_INTERVAL,
+    CONSOLE_LOG_FILE,
+    CONSOLE_LOG_MAX_BYTES,
+    CONSOLE_LOG_BACKUP_COUNT)
 
 # Qt
 from PySide6.QtWidgets import (
@@ -34,20 +54,25 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QTableWidget,
     QTableWidgetItem,
+    QTableView,
     QWidget,
     QPushButton,
     QHeaderView,
     QLabel,
     QMessageBox,
     QDialog,
-    QComboBox)
+    QComboBox,
+    QProgressDialog,
+    QFileDialog)
 from PySide6.QtGui import ( 
     QIcon, 
     QAction,
     QPixmap,
     QCursor,
-    QPen)
-from PySide6.QtCore import Qt, QRectF
+    QPen,
+    QColor,
+    QTextCursor)
+from PySide6.QtCore import Qt, QRectF, QTimer, QAbstractTableModel, QModelIndex
 
 # QtCreator
 from ui.ui_pendingchangedetailsdialog import Ui_PendingChangeDetailsDialog
@@ -70,6 +95,13 @@ class MainView(QGraphicsView):
         self.rubber_band = None
         self.start_pos = None
 
+        # Cables of the dragged devices are updated at most once per frame (see _scheduleCableGeometryUpdate)
+        self.moved_devices = set()
+        self.cable_geometry_timer = QTimer(self)
+        self.cable_geometry_timer.setSingleShot(True)
+        self.cable_geometry_timer.setInterval(CABLE_GEOMETRY_UPDATE_INTERVAL)
+        self.cable_geometry_timer.timeout.connect(self._updateCableGeometry)
+
         self._loadCursors()
 
     @contextmanager
@@ -97,7 +129,7 @@ class MainView(QGraphicsView):
         
         cloned_scene = QGraphicsScene()
         cloned_devices = []
-        cloned_devices_ids = []
+        cloned_devices_ids = set()
         device_id_map = {}
 
         # Create cloned devices, based on selection
@@ -107,7 +139,7 @@ class MainView(QGraphicsView):
                     new_device = item.cloneToOSPFDevice()
                 cloned_scene.addItem(new_device)
                 cloned_devices.append(new_device)
-                cloned_devices_ids.append(new_device.id)
+                cloned_devices_ids.add(new_device.id)
                 device_id_map[item.id] = new_device
 
         # Create cables between cloned devices, if the cables exist in the original scene
@@ -218,6 +250,7 @@ class MainView(QGraphicsView):
 
         self.start_pos = None
         super().mouseReleaseEvent(event)
+        self._updateCableGeometry() # The final position of the dragged devices
 
     def mouseMoveEvent(self, event) -> None:
         """
@@ -225,19 +258,36 @@ class MainView(QGraphicsView):
         This method performs the following actions:
         1. Updates the rubber band selection rectangle if it exists, the starting position is set,
            no items are selected in the scene, and the cable mode button is not checked.
-        2. Updates the cable positions for all selected items in the scene that are instances of the `Device` class.
-        3. Calls the parent class's `mouseMoveEvent` to ensure default behavior is preserved.
+        2. Calls the parent class's `mouseMoveEvent` to ensure default behavior is preserved (moves the dragged devices).
+        3. Schedules the update of the cables of all selected items in the scene that are instances of the `Device` class (once per frame).
         """
 
         if self.rubber_band and self.start_pos:
             if not self.scene.selectedItems() and not self.window()._cableModeButtonIsChecked():
                 self._updateRubberBand(event)
-        
-        for item in self.scene.selectedItems():
-            if isinstance(item, Device):
-                item.updateCablePositions()
 
         super().mouseMoveEvent(event)
+
+        if event.buttons() & Qt.LeftButton:
+            self._scheduleCableGeometryUpdate(item for item in self.scene.selectedItems() if isinstance(item, Device) and item.cables)
+
+    def _scheduleCableGeometryUpdate(self, devices) -> None:
+        """
+        Marks the cables of the devices for an update. The mouse move events come much more often than the frames are drawn,
+        so the cables are updated at most once per CABLE_GEOMETRY_UPDATE_INTERVAL, all of them in a single pass.
+        """
+
+        self.moved_devices.update(devices)
+        if self.moved_devices and not self.cable_geometry_timer.isActive():
+            self.cable_geometry_timer.start()
+
+    def _updateCableGeometry(self) -> None:
+        """Updates the cables of the devices moved since the last update (each cable once, even when both its devices have moved)."""
+
+        self.cable_geometry_timer.stop()
+        cables = {cable: None for device in self.moved_devices for cable in device.cables} # Ordered set
+        self.moved_devices = set()
+        updateCablesGeometry(cables)
         
     # ---------- RUBBER BAND FUNCTIONS ---------- 
     def _createRubberBand(self, event) -> None:
@@ -318,6 +368,12 @@ class MainWindow(QMainWindow):
         self.consoleDockWidget = ConsoleWidget()
         self.addDockWidget(Qt.BottomDockWidgetArea, self.consoleDockWidget)
 
+        # RPC metrics dock (tab next to the console)
+        self.rpcMetricsDockWidget = RpcMetricsWidget()
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.rpcMetricsDockWidget)
+        self.tabifyDockWidget(self.consoleDockWidget, self.rpcMetricsDockWidget)
+        self.consoleDockWidget.raise_()
+
         # Protocols configuration dock
         self.batchConfigurationWidget = BatchConfigurationWidget(self.view)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.batchConfigurationWidget)
@@ -326,6 +382,14 @@ class MainWindow(QMainWindow):
         self.pendigChangesDockWidget = PendingChangesWidget()
         self.addDockWidget(Qt.RightDockWidgetArea, self.pendigChangesDockWidget)
 
+        # Progress of the parallel bring-up of the devices loaded from file (the bring-up itself is handled in devices.py)
+        bring_up_executor.taskSucceeded.connect(self._onDeviceBroughtUp)
+        bring_up_executor.taskFailed.connect(self._onDeviceBringUpFailed)
+        self.bring_up_progress_dialog = None
+        self.bring_up_finished = 0
+        self.devices_being_brought_up = set() # devices loaded from file, that are being brought up at the moment
+        self.bring_up_failures = []
+
     def _createToolBar(self) -> None:
         """Creates a toolbar with buttons for adding devices, toggling cable edit mode, and saving/loading devices."""
         self.toolbar = QToolBar("Toolbar", self)
@@ -392,7 +456,8 @@ class MainWindow(QMainWindow):
         - Device location (x, y coordinates)
         """
 
-        if not self.view.scene.items():
+        devices = Device.getPlacedDevicesInstances() # All the devices on the canvas (also the ones, which are not brought up)
+        if not devices:
             QMessageBox.warning(self, "No devices", "There are no devices in the scene to save.", QMessageBox.Ok)
             return
         
@@ -401,25 +466,28 @@ class MainWindow(QMainWindow):
                 "devices": []
             }
 
-            for device in self.view.scene.items():
-                if isinstance(device, Device): # ignore cables
-                    device_data = {
-                        "type": type(device).__name__,
-                        "ip_address": f"{device.device_parameters['address']}:{device.device_parameters['port']}",
-                        "username": device.device_parameters["username"],
-                        "password": device.device_parameters["password"],
-                        "vendor": device.device_parameters["device_params"],
-                        "location": {
-                            "x": device.pos().x(),
-                            "y": device.pos().y()
-                        }
+            for device in devices:
+                device_data = {
+                    "type": type(device).__name__,
+                    "ip_address": f"{device.device_parameters['address']}:{device.device_parameters['port']}",
+                    "username": device.device_parameters["username"],
+                    "password": device.device_parameters["password"],
+                    "vendor": device.device_parameters["device_params"],
+                    "location": {
+                        "x": device.pos().x(),
+                        "y": device.pos().y()
                     }
-                    data["devices"].append(device_data)
+                }
+                data["devices"].append(device_data)
             
             json.dump(data, f, indent=4)
 
     def _loadDevicesFromFile(self) -> None:
-        """Loads device configurations from a JSON file and creates device instances."""
+        """
+        Loads device configurations from a JSON file and creates device instances.
+        The devices are placed on the canvas immediately and brought up (connected to and their information retrieved) in parallel, using 
+        the worker pool. The devices, that could not be brought up, are reported at the end in a single message.
+        """
 
         try:
             with open("saved_devices.json") as f:
@@ -446,6 +514,11 @@ class MainWindow(QMainWindow):
                     # Create the device instance
                     self._createDeviceFromSave(device_parameters, device["type"], x=device["location"]["x"], y=device["location"]["y"])
 
+            if self.devices_being_brought_up:
+                self._showBringUpProgress()
+            else: # Nothing to wait for (all the devices were skipped)
+                self._showBringUpReport()
+
         except FileNotFoundError:
             QMessageBox.warning(self, "File not found", "File \"saved_devices.json\" not found.", QMessageBox.Ok)
         except Exception as e:
@@ -454,27 +527,91 @@ class MainWindow(QMainWindow):
 
     def _createDeviceFromSave(self, device_parameters, device_type, x, y) -> None:
         """
-        Creates a device in the scene based on the provided parameters if a device with the same address
-        does not already exist.
+        Creates a device in the scene based on the provided parameters if a device with the same address and port
+        does not already exist. The bring-up of the device continues in the background.
         """
 
-        # Check if the device with the same address is not already in the scene
-        for device in self.view.scene.items():
-            if isinstance(device, Device):
-                if device.device_parameters["address"] == device_parameters["address"]:
-                    QMessageBox.warning(self, "Device already exists", f"The device with the address: {device_parameters["address"]} is already in the scene.")
-                    return
+        # Check if the device with the same address (and port) is not already in the scene
+        if Device.getDeviceInstanceByAddress(device_parameters["address"], device_parameters["port"]) is not None:
+            self.bring_up_failures.append(f"{device_parameters['address']}:{device_parameters['port']} ({device_type}) - The device with the same address and port is already in the scene.")
+            return
         
         if "Router" in device_type:
-            addRouter(device_parameters, self.view.scene, device_type, x, y)
+            device = addRouter(device_parameters, self.view.scene, device_type, x, y)
         elif "Switch" in device_type:
-            addSwitch(device_parameters, self.view.scene, device_type, x, y)
+            device = addSwitch(device_parameters, self.view.scene, device_type, x, y)
         elif "Firewall" in device_type:
-            addFirewall(device_parameters, self.view.scene, device_type, x, y)
+            device = addFirewall(device_parameters, self.view.scene, device_type, x, y)
+        self.devices_being_brought_up.add(device)
+
+    # ---------- DEVICE BRING-UP FUNCTIONS ----------
+    def _onDeviceBroughtUp(self, device, _) -> None:
+        """Called in the GUI thread, when the bring-up of the device has succeeded (the device itself is finished in devices.py)."""
+
+        if device in self.devices_being_brought_up:
+            self._updateBringUpProgress(device)
+
+    def _onDeviceBringUpFailed(self, device, error) -> None:
+        """Called in the GUI thread, when the bring-up of the device has failed. The error is stored for the final report."""
+
+        if device in self.devices_being_brought_up:
+            self.bring_up_failures.append(f"{device.device_parameters['address']}:{device.device_parameters['port']} ({type(device).__name__}) - {error}")
+            self._updateBringUpProgress(device)
+
+    def _onAllDevicesBroughtUp(self) -> None:
+        """Called in the GUI thread, when there are no more devices loaded from file being brought up."""
+
+        if self.bring_up_progress_dialog is not None:
+            self.bring_up_progress_dialog.close()
+            self.bring_up_progress_dialog = None
+        self.bring_up_finished = 0
+        self._showBringUpReport()
+
+    def _showBringUpProgress(self) -> None:
+        """Shows (or updates the range of) the non-modal progress dialog for the devices being brought up."""
+
+        if self.bring_up_progress_dialog is None:
+            self.bring_up_progress_dialog = QProgressDialog("Connecting to devices...", None, 0, 0, self)
+            self.bring_up_progress_dialog.setWindowTitle("Loading devices")
+            self.bring_up_progress_dialog.setMinimumDuration(0)
+            self.bring_up_progress_dialog.setAutoClose(False)
+            self.bring_up_progress_dialog.setAutoReset(False)
+            self.bring_up_progress_dialog.show()
+        self.bring_up_progress_dialog.setMaximum(self.bring_up_finished + len(self.devices_being_brought_up))
+        self.bring_up_progress_dialog.setValue(self.bring_up_finished)
+
+    def _updateBringUpProgress(self, device) -> None:
+        """Marks the device as no longer being brought up and updates the progress dialog."""
+
+        self.devices_being_brought_up.discard(device)
+        self.bring_up_finished += 1
+        if self.bring_up_progress_dialog is not None:
+            self.bring_up_progress_dialog.setValue(self.bring_up_finished)
+            self.bring_up_progress_dialog.setLabelText(f"Connecting to devices... (last finished: {device.device_parameters['address']})")
+        if not self.devices_being_brought_up:
+            self._onAllDevicesBroughtUp()
+
+    def _showBringUpReport(self) -> None:
+        """Shows a single message with all the devices, that could not be loaded."""
+
+        if not self.bring_up_failures:
+            return
+
+        report = "\n".join(self.bring_up_failures)
+        self.bring_up_failures = []
+        utils.printGeneral(f"Failed to load devices:\n{report}")
+        message_box = QMessageBox(QMessageBox.Warning, "Loading devices", "Some of the devices could not be loaded. The connection to the failed devices can be retried from their context menu. See the details for more information.", QMessageBox.Ok, self)
+        message_box.setDetailedText(report)
+        message_box.exec()
 
 
 class ConsoleWidget(QDockWidget):
-    """Widget in the bottom area of the main window that displays the console output."""
+    """
+    Widget in the bottom area of the main window that displays the console output.
+    The output is written to the console sink (see ConsoleSink) from any thread and it is shown in batches, by a timer in the GUI thread.
+    While the console is not visible, nothing is shown (nor formatted) - the output waits in the sink. The console keeps at most
+    CONSOLE_MAX_LINES lines, the whole output is in the log file (CONSOLE_LOG_FILE).
+    """
 
     def __init__(self) -> QDockWidget:
         super().__init__("Console")
@@ -484,14 +621,170 @@ class ConsoleWidget(QDockWidget):
 
         self.consoleTextField = QPlainTextEdit()
         self.consoleTextField.setReadOnly(True)
+        self.consoleTextField.setMaximumBlockCount(CONSOLE_MAX_LINES) # The oldest lines are dropped
 
         if STDOUT_TO_CONSOLE:
-            sys.stdout = ConsoleStream(self.consoleTextField)
+            sys.stdout = ConsoleStream(console_sink)
         if STDERR_TO_CONSOLE:
-            sys.stderr = ConsoleStream(self.consoleTextField)
+            sys.stderr = ConsoleStream(console_sink)
+        self.displayed = False # Visible on the screen (not hidden behind another tab)
+        self.visibilityChanged.connect(self._onVisibilityChanged)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start(CONSOLE_FLUSH_INTERVAL)
 
         self.setWidget(self.consoleTextField)
 
+    def flush(self) -> None:
+        """Shows the output written since the last flush, as a single append. Keeps the view at the bottom, unless the user has scrolled up."""
+
+        if not self.displayed:
+            return
+        messages = console_sink.take()
+        if not messages:
+            return
+
+        text = "".join(self._renderMessage(message) for message in messages)
+        scroll_bar = self.consoleTextField.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        cursor = QTextCursor(self.consoleTextField.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    def _renderMessage(self, message) -> str:
+        """Returns the text of the message - RPC replies (utils.LazyXml) are formatted now. Too large messages are truncated (they are whole in the log file)."""
+
+        if isinstance(message, utils.LazyXml):
+            message = str(message) if len(message) <= CONSOLE_MESSAGE_MAX_BYTES else message.rawText()
+        if len(message) > CONSOLE_MESSAGE_MAX_BYTES:
+            return(f"{message[:CONSOLE_MESSAGE_MAX_BYTES]}\n... (truncated {len(message) - CONSOLE_MESSAGE_MAX_BYTES} characters, the whole message is in the log file \"{CONSOLE_LOG_FILE}\")\n")
+        return(message)
+
+    def _onVisibilityChanged(self, visible) -> None:
+        """Shows the output written while the console was not visible (also called when the tab of the console is selected)."""
+
+        self.displayed = visible
+        self.flush()
+
+
+class RpcMetricsWidget(QDockWidget):
+    """
+    Widget in the bottom area of the main window (tab next to the console) that displays the metrics of the RPCs (see metrics.RpcMetrics),
+    aggregated per device, per operation, or per both. The table is refreshed periodically, but only while the widget is visible.
+    The metrics can be exported as JSON, or in the Prometheus text format.
+    """
+
+    COLUMNS = ["Device", "Operation", "RPCs", "Errors", "Avg RTT (ms)", "p95 RTT (ms)", "Max RTT (ms)", "Avg parse (ms)", "Request (B)", "Reply (B)"]
+    GROUPINGS = {"Device and operation": "device_operation", "Device": "device", "Operation": "operation"}
+
+    def __init__(self) -> QDockWidget:
+        super().__init__("RPC metrics")
+
+        self.setAllowedAreas(Qt.BottomDockWidgetArea)
+        self.setFeatures(QDockWidget.NoDockWidgetFeatures)
+
+        # Controls
+        self.grouping_combobox = QComboBox()
+        self.grouping_combobox.addItems(self.GROUPINGS.keys())
+        self.grouping_combobox.currentIndexChanged.connect(self.refresh)
+        export_json_button = QPushButton("Export JSON")
+        export_json_button.clicked.connect(lambda: self._export("JSON files (*.json)", "rpc_metrics.json", rpc_metrics.toJson))
+        export_prometheus_button = QPushButton("Export Prometheus")
+        export_prometheus_button.clicked.connect(lambda: self._export("Prometheus text files (*.prom *.txt)", "rpc_metrics.prom", rpc_metrics.toPrometheus))
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self._reset)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Group by:"))
+        controls_layout.addWidget(self.grouping_combobox)
+        controls_layout.addStretch()
+        controls_layout.addWidget(export_json_button)
+        controls_layout.addWidget(export_prometheus_button)
+        controls_layout.addWidget(reset_button)
+
+        # Table with the metrics
+        self.table_widget = QTableWidget()
+        self.table_widget.setColumnCount(len(self.COLUMNS))
+        self.table_widget.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table_widget.horizontalHeaderItem(self.COLUMNS.index("Avg parse (ms)")).setToolTip(
+            "Time spent by the application converting the replies.\n"
+            "Juniper replies are parsed by ncclient, before they are returned - their parsing is included in the RTT, not here.")
+        self.table_widget.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table_widget.horizontalHeader().setStretchLastSection(True)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls_layout)
+        layout.addWidget(self.table_widget)
+        container = QWidget()
+        container.setLayout(layout)
+        self.setWidget(container)
+
+        self.displayed = False # Visible on the screen (not hidden behind another tab)
+        self.visibilityChanged.connect(self._onVisibilityChanged)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(RPC_METRICS_REFRESH_INTERVAL)
+
+    def refresh(self) -> None:
+        """Fills the table with the current metrics (only when the widget is visible)."""
+
+        if not self.displayed:
+            return
+
+        grouping = self.GROUPINGS[self.grouping_combobox.currentText()]
+        statistics_items = sorted(rpc_metrics.aggregate(grouping).items())
+
+        self.table_widget.setSortingEnabled(False)
+        self.table_widget.setRowCount(len(statistics_items))
+        for row, (key, statistics) in enumerate(statistics_items):
+            device_id, operation = key if grouping == "device_operation" else ((key, "") if grouping == "device" else ("", key))
+            values = [
+                device_id,
+                operation,
+                statistics.count,
+                statistics.error_count,
+                round(statistics.round_trip.mean() * 1000, 1),
+                round(statistics.round_trip.quantile(0.95) * 1000, 1),
+                round(statistics.round_trip.max * 1000, 1),
+                round(statistics.parse.mean() * 1000, 1),
+                statistics.request_bytes,
+                statistics.reply_bytes
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value) # Numbers are sorted as numbers
+                if column == 3 and value:
+                    item.setToolTip("\n".join(f"{error_class}: {count}" for error_class, count in statistics.errors.items()))
+                self.table_widget.setItem(row, column, item)
+        self.table_widget.setSortingEnabled(True)
+
+    def _onVisibilityChanged(self, visible) -> None:
+        self.displayed = visible
+        self.refresh()
+
+    def _reset(self) -> None:
+        rpc_metrics.reset()
+        self.refresh()
+
+    def _export(self, file_filter, default_name, serialize) -> None:
+        """Exports the metrics to the file chosen by the user."""
+
+        path, _ = QFileDialog.getSaveFileName(self, "Export RPC metrics", default_name, file_filter)
+        if not path:
+            return
+        try:
+            with open(path, mode="w") as f:
+                f.write(serialize())
+            utils.printGeneral(f"RPC metrics have been exported to: {path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export the RPC metrics: {e}")
+            utils.printGeneral(traceback.format_exc())
+
 
 class BatchConfigurationWidget(QDockWidget):
     """
@@ -595,17 +888,84 @@ class BatchConfigurationWidget(QDockWidget):
         dialog.exec()
 
 
+class PendingChangesModel(QAbstractTableModel):
+    """
+    Table model of the pending changes - a view over the records of the pending change journal (see journal.PendingChangeJournal).
+    The rows reference the compact records only, the details of the change are decompressed and formatted when they are shown.
+    The status of the operation in progress (commit, discard, ...) is kept per device, not per row.
+    """
+
+    COLUMNS = ["ID", "Change"]
+
+    def __init__(self, parent=None) -> "PendingChangesModel":
+        super().__init__(parent)
+        self.records = [] # journal.PendingChangeRecord, in the order in which the changes were made
+        self.device_statuses = {} # device ID -> (background color, tooltip)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return(0 if parent.isValid() else len(self.records))
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return(0 if parent.isValid() else len(self.COLUMNS))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.records[index.row()]
+        if role == Qt.DisplayRole:
+            return(record.device_id if index.column() == 0 else record.operation)
+        status = self.device_statuses.get(record.device_id)
+        if role == Qt.BackgroundRole and status is not None:
+            return(QColor(status[0]))
+        if role == Qt.ToolTipRole:
+            return(status[1] if status is not None else f"{record.target}\nDouble click for details")
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return(self.COLUMNS[section])
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder) -> None:
+        self.layoutAboutToBeChanged.emit()
+        self.records.sort(key=lambda record: (record.device_id, record.sequence) if column == 0 else (record.operation, record.sequence), reverse=(order == Qt.DescendingOrder))
+        self.layoutChanged.emit()
+
+    def addRecord(self, record) -> None:
+        self.beginInsertRows(QModelIndex(), len(self.records), len(self.records))
+        self.records.append(record)
+        self.endInsertRows()
+
+    def removeDeviceRecords(self, device_id) -> None:
+        self.beginResetModel()
+        self.records = [record for record in self.records if record.device_id != device_id]
+        self.device_statuses.pop(device_id, None)
+        self.endResetModel()
+
+    def setDeviceStatus(self, device_id, color, tooltip) -> None:
+        self.device_statuses[device_id] = (color, tooltip)
+        if self.records:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.records) - 1, len(self.COLUMNS) - 1), [Qt.BackgroundRole, Qt.ToolTipRole])
+
+    def record(self, row) -> object:
+        return(self.records[row])
+
+
 class PendingChangesWidget(QDockWidget):
     """
     Widget in the right area of the main window that contains elements for displaying changes made to devices, which have not yet been committed.
     It includes a table to display pending changes, buttons for committing, confirming, and discarding changes, and a timer for confirmed commits.
     Methods:
-        addPendingChangeToTable(device_id, change_name, rpc_reply, filter):
-            Adds a pending change to the table with details such as device ID, change name, and additional data.
+        addPendingChangeToTable(record):
+            Adds a pending change (record of the pending change journal) to the table.
         clearPendingChangesFromTable(device_id):
             Removes all pending changes for a specific device from the table.
-        _showPendingChangeDetails(item):
+        _showPendingChangeDetails(index):
             Displays detailed information about a pending change when a table item is double-clicked.
+        addReplayableDevice(device_id, count), _replayPendingChanges():
+            Offer the replay of the pending changes left in the journal by an earlier run of the application (e.g. after a crash).
+        _applyPendingChanges():
+            Sends the staged changes of all the devices to the devices (a single edit-config per device), without committing them.
         _confirmedCommitPendingChanges():
             Initiates a confirmed commit with a timeout, updating the UI and starting a countdown timer.
         _confirmCommit():
@@ -616,17 +976,51 @@ class PendingChangesWidget(QDockWidget):
             Discards all pending changes on all devices and updates the UI.
         _cancelConfirmedCommit():
             Cancels a confirmed commit, reverting changes and resetting the UI.
+        _transactionalCommitPendingChanges():
+            Commits all pending changes as a single transaction (validate -> confirmed commit -> confirm or rollback on all devices).
+        _continueTransaction(operation, succeeded_devices, failures):
+            Moves the transaction to its next phase, once all the devices have finished the current one.
         _revertButtonsToDefaultState():
             Resets the buttons and UI elements to their default state after a commit or cancellation.
         _stopCountdown():
             Stops the countdown timer for a confirmed commit.
+        _fanOut(operation, devices):
+            Performs the operation (commit, discard, ...) on all the devices at the same time, using the worker pool.
+        _onDeviceOperationSucceeded(device, result), _onDeviceOperationFailed(device, error):
+            Handle the result of the operation on a single device, as soon as it arrives.
+        _onAllDeviceOperationsFinished(failures):
+            Finishes the operation, once all the devices have finished.
+        _refreshCommittedDevices(device_ids):
+            Retrieves the interfaces of the committed devices, once the commit of all the devices has finished.
+        _refreshFailed(key, error):
+            Returns the snapshot of the device to its interface journal, when the retrieval has failed.
     """
             
     def __init__(self) -> QDockWidget:
         super().__init__("Pending changes")
 
-        self.confirmed_commit_thread = None
-        self.stop_countdown_event = Event()
+        # Confirmed commit countdown (updates the "Confirm" button every second)
+        self.countdown_timer = QTimer(self)
+        self.countdown_timer.timeout.connect(self._countdownTick)
+        self.confirmed_commit_deadline = None
+        self.confirmed_commit_devices = []
+
+        # Fan-out of the operations (commit, discard, ...) to all the devices with pending changes
+        self.fan_out_executor = FanOutExecutor(parent=self)
+        self.fan_out_executor.taskSucceeded.connect(self._onDeviceOperationSucceeded)
+        self.fan_out_executor.taskFailed.connect(self._onDeviceOperationFailed)
+        self.fan_out_executor.allTasksFinished.connect(self._onAllDeviceOperationsFinished)
+        self.fan_out_operation = None
+        self.fan_out_succeeded_devices = []
+
+        # Retrieval of the interfaces after the commit, run separately once all the devices have been committed (see _refreshCommittedDevices)
+        self.refresh_executor = FanOutExecutor(parent=self)
+        self.refresh_executor.taskSucceeded.connect(lambda key, result: key[0].finishRefresh(result))
+        self.refresh_executor.taskFailed.connect(self._refreshFailed)
+
+        # Transactional commit (see _transactionalCommitPendingChanges)
+        self.transaction_devices = []
+        self.transaction_failures = {}
 
         title_label = QLabel("Pending changes")
         title_label.setAlignment(Qt.AlignCenter)
@@ -637,14 +1031,29 @@ class PendingChangesWidget(QDockWidget):
         self.setFixedWidth(250)
         self.setContentsMargins(0, 0, 0, 0)
 
-        # Table with pending changes
-        self.table_widget = QTableWidget()
-        self.table_widget.setColumnCount(2)
-        self.table_widget.setHorizontalHeaderLabels(["ID", "Change"])
-        self.table_widget.horizontalHeader().setStretchLastSection(True)
-        self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)  # First column
-        self.table_widget.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)  # Second column
-        self.table_widget.setSortingEnabled(True)
+        # Table with pending changes (view over the pending change journal)
+        self.table_model = PendingChangesModel(self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.table_model)
+        self.table_view.setEditTriggers(QTableView.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QTableView.SelectRows)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        self.table_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)  # First column
+        self.table_view.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)  # Second column
+        self.table_view.setSortingEnabled(True)
+
+        # Replay button (shown only when the journal has changes left by an earlier run of the application)
+        self.replayable_devices = {} # device ID -> number of the changes
+        self.replay_button = QPushButton()
+        self.replay_button.setToolTip("Stages again the changes, which were not committed or discarded before the application was closed (or crashed).")
+        self.replay_button.clicked.connect(self._replayPendingChanges)
+        self.replay_button.hide()
+
+        # Apply button
+        self.apply_button = QPushButton("Apply")
+        self.apply_button.setToolTip("Sends the staged changes to the devices (a single edit-config per device), without committing them. Done automatically before every commit.")
+        self.apply_button.clicked.connect(self._applyPendingChanges)
 
         # Commit button
         self.commit_button = QPushButton("Commit")
@@ -657,6 +1066,11 @@ class PendingChangesWidget(QDockWidget):
         self.confirmed_commit_timer_combobox = QComboBox()
         self.confirmed_commit_timer_combobox.addItems(["1 min.", "2 min.", "5 min.", "10 min."])
 
+        # Transactional commit button
+        self.transaction_commit_button = QPushButton("Commit all or nothing")
+        self.transaction_commit_button.setToolTip("Validates and commits the changes on all the devices. If any of the devices fails, the changes are rolled back on all of them.")
+        self.transaction_commit_button.clicked.connect(self._transactionalCommitPendingChanges)
+
         # Discard all changes button
         self.discard_button = QPushButton("Discard all")
         self.discard_button.clicked.connect(self._discardAllPendingChanges)
@@ -667,9 +1081,12 @@ class PendingChangesWidget(QDockWidget):
         self.confirmed_commit_buttons_layout.addWidget(self.confirmed_commit_button, stretch=1)
         self.confirmed_commit_buttons_layout.addStretch()
         self.confirmed_commit_buttons_layout.addWidget(self.confirmed_commit_timer_combobox)
-        self.layout.addWidget(self.table_widget)
+        self.layout.addWidget(self.table_view)
+        self.layout.addWidget(self.replay_button)
+        self.layout.addWidget(self.apply_button)
         self.layout.addLayout(self.confirmed_commit_buttons_layout)
         self.layout.addWidget(self.commit_button)
+        self.layout.addWidget(self.transaction_commit_button)
         self.layout.addWidget(self.discard_button)
         self.container = QWidget()
         self.container.setLayout(self.layout)
@@ -678,54 +1095,81 @@ class PendingChangesWidget(QDockWidget):
         # Signals
         signal_manager.pendingChangeAdded.connect(self.addPendingChangeToTable)
         signal_manager.deviceNoLongerHasPendingChanges.connect(self.clearPendingChangesFromTable)
-        self.table_widget.itemDoubleClicked.connect(self._showPendingChangeDetails)
+        signal_manager.pendingChangeJournalFound.connect(self.addReplayableDevice)
+        self.table_view.doubleClicked.connect(self._showPendingChangeDetails)
 
-    def addPendingChangeToTable(self, device_id, change_name, rpc_reply, filter) -> None:
+    def addPendingChangeToTable(self, record) -> None:
         """
-        Adds a pending change to the table widget with details about the device and change.
-        The change can be double-clicked to show additional details.
+        Adds a pending change to the table. The change can be double-clicked to show additional details.
         Args:
-            device_id (str): The identifier of the device associated with the change.
-            change_name (str): The name or description of the change.
-            rpc_reply (Any): The RPC reply object containing details of the change.
-            filter (Any): The filter object associated with the change.
+            record (journal.PendingChangeRecord): The record of the change in the pending change journal.
         """
 
-        row_position = self.table_widget.rowCount()
-        self.table_widget.insertRow(row_position)
-
-        device_item = QTableWidgetItem(device_id)
-        device_item.setFlags(device_item.flags() ^ Qt.ItemIsEditable)  # Non-editable cells
-        device_item.setToolTip("Double click for details")
-        self.table_widget.setItem(row_position, 0, device_item)
-
-        change_item = QTableWidgetItem(change_name)
-        change_item.setFlags(change_item.flags() ^ Qt.ItemIsEditable)  # Non-editable cells
-        change_item.setData(Qt.UserRole, (rpc_reply, filter)) # Store the RPC reply and filter in the item, so it can be accessed when the item is double-clicked
-        change_item.setToolTip("Double click for details")
-        self.table_widget.setItem(row_position, 1, change_item)
+        self.table_model.addRecord(record)
 
     def clearPendingChangesFromTable(self, device_id) -> None:
         """Clears all pending changes for a specific device from the table."""
-        for row in range(self.table_widget.rowCount() - 1, -1, -1): # Iterate backwards to avoid skipping rows
-            if self.table_widget.item(row, 0).text() == device_id:
-                self.table_widget.removeRow(row)
 
-    def _showPendingChangeDetails(self, item) -> None:
+        self.table_model.removeDeviceRecords(device_id)
+
+    def _showPendingChangeDetails(self, index) -> None:
         """
         Handles showing the details of a pending change when the user double-clicks on a pending change in the table.
         It creates a PendingChangeDetails dialog and displays the details of the pending change.
         """
-        device_id = self.table_widget.item(item.row(), 0).text()
-        change_name = self.table_widget.item(item.row(), 1).text()
 
-        rpc_reply, filter = self.table_widget.item(item.row(), 1).data(Qt.UserRole)
-
-        dialog = PendingChangeDetailsDialog(device_id, change_name, rpc_reply, filter)
+        dialog = PendingChangeDetailsDialog(self.table_model.record(index.row()))
         dialog.exec()
 
+    def addReplayableDevice(self, device_id, count) -> None:
+        """Shows the replay button, when a device with changes left in the pending change journal has been brought up."""
+
+        self.replayable_devices[device_id] = count
+        self.replay_button.setText(f"Replay unsaved changes ({sum(self.replayable_devices.values())})")
+        self.replay_button.show()
+
+    def _replayPendingChanges(self) -> None:
+        """
+        Asks (once for all the devices), whether the changes left in the pending change journal should be staged again, or discarded.
+        """
+
+        devices = [device for device in map(Device.getDeviceInstance, self.replayable_devices) if device is not None]
+        summary = "\n".join(f"{device.id} ({device.device_parameters['address']}): {self.replayable_devices[device.id]} changes" for device in devices)
+        answer = QMessageBox.question(
+            self,
+            "Replay unsaved changes",
+            f"These devices have changes, which were not committed or discarded before the application was closed:\n\n{summary}\n\n"
+            "Stage the changes again? Choose \"Discard\" to remove them from the journal.",
+            QMessageBox.Yes | QMessageBox.Discard | QMessageBox.Cancel)
+        if answer == QMessageBox.Cancel:
+            return
+
+        for device in devices:
+            if answer == QMessageBox.Yes:
+                device.replayPendingChanges()
+                device.updateCableLabelsText()
+            else:
+                pending_change_journal.discardLeftovers(device)
+        self.replayable_devices = {}
+        self.replay_button.hide()
+
+    def _applyPendingChanges(self) -> None:
+        """
+        Sends the staged changes (see EditconfigBatch) of all the devices to the configuration target datastore, without committing them.
+        Every device gets a single edit-config with all its staged changes. The staged changes are also sent automatically before every commit.
+        """
+
+        devices = [device for device in Device.getAllDevicesInstances() if len(device.edit_batch)]
+        if not devices:
+            QMessageBox.information(self, "No staged changes", "No staged changes to apply.")
+            return
+
+        self._fanOut("apply", devices)
+
     # ---------- COMMIT FUNCTIONS ----------
     # (And functions related - cancel, discard, countdown timer, etc.)
+    # The operations are performed on all the devices at the same time (see _fanOut). The results are streamed back to the table
+    # per device, as they arrive: the changes of the successful devices are removed from the table, the changes of the failed devices are highlighted.
     def _confirmedCommitPendingChanges(self) -> None:
         """
         (1/2) Handles the confirmed commit of pending changes on devices.
@@ -735,8 +1179,9 @@ class PendingChangesWidget(QDockWidget):
         
         The method performs the following steps:
         1. Retrieves the timeout value from the combobox and converts it to seconds.
-        2. Iterates over all device instances and commits changes (with the confirmed parameter set to True) on devices with pending changes.
-        3. Starts a countdown timer in a separate thread, that dynaminacally updates the commit button text to show the remaining time.
+        2. Commits changes (with the confirmed parameter set to True) on all devices with pending changes at the same time.
+        3. Once all the devices have finished, starts a countdown timer, that dynamically updates the commit button text to show the remaining time.
+           The countdown is measured from the moment the commits were sent out, so it never shows more time than the earliest committed device has left.
         4. Updates the UI elements and device states accordingly after the countdown.
         """
 
@@ -744,82 +1189,26 @@ class PendingChangesWidget(QDockWidget):
         timeout_minutes = self.confirmed_commit_timer_combobox.currentText()
         timeout_seconds = int(timeout_minutes.split()[0]) * 60
 
-        commited_devices = []
-        devices = Device.getAllDevicesInstances()
-        try:
-            for device in devices:
-                if device.has_pending_changes:
-                    device.commitChanges(confirmed=True, confirm_timeout=timeout_seconds)
-                    commited_devices.append(device.id)
-
-            def _countdown() -> None:
-                """
-                Simple countdown timer that updates the commit button text to show the remaining time. Launched in a separate thread to avoid blocking of the application.
-                """
-                
-                for i in range(timeout_seconds, 0, -1):
-                    if self.stop_countdown_event.is_set():
-                        return
-                    self.commit_button.setText(f"Confirm ({i} sec.)")
-                    QApplication.processEvents()
-                    time.sleep(1)
-
-                # After the countdown:
-                self._revertButtonsToDefaultState() # Revert the buttons to their default state
-                for device_id in commited_devices: # Reset the flags and labels for devices that had pending changes
-                    device = Device.getDeviceInstance(device_id)
-                    device.has_pending_changes = False
-                    signal_manager.deviceNoLongerHasPendingChanges.emit(device.id)
-                    device.updateCableLabelsText()
-
-            # When at least one device has pending changes - print and begin the confirmed commit procedure
-            if commited_devices:
-                utils.printGeneral(f"Performed confirmed commit on devices with ID: {', '.join(commited_devices)}\nTo preserve the changes, commit again within {timeout_seconds} seconds.")
-                # Disable buttons
-                self.confirmed_commit_button.setEnabled(False)
-                self.confirmed_commit_timer_combobox.setEnabled(False)
-                # Start countdown in a separate thread
-                self.stop_countdown_event.clear()
-                self.confirmed_commit_thread = Thread(target=_countdown)
-                self.confirmed_commit_thread.start()
-                # Change the "Commit" button to "Confirm" button
-                self.commit_button.setText(f"Confirm ({timeout_seconds} sec.)")
-                self.commit_button.clicked.disconnect()
-                self.commit_button.clicked.connect(self._confirmCommit)
-                # Change the "Discard all" button to "Cancel commit" button
-                self.discard_button.setText("Cancel commit")
-                self.discard_button.clicked.disconnect()
-                self.discard_button.clicked.connect(self._cancelConfirmedCommit)
-            else:
-                QMessageBox.information(self, "No pending changes", "No pending changes to commit.")
+        devices = [device for device in Device.getAllDevicesInstances() if device.has_pending_changes]
+        if not devices:
+            QMessageBox.information(self, "No pending changes", "No pending changes to commit.")
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Commit failed", f"Failed to commit changes on one or more devices: {e}")
-            utils.printGeneral(traceback.format_exc())
+        self.confirmed_commit_deadline = time.monotonic() + timeout_seconds
+        self._fanOut("confirmed_commit", devices, True, timeout_seconds)
 
     def _confirmCommit(self) -> None:
         """
         (2/2) Handles the CONFIRMATION of the confirmed commit of pending changes on devices.
         """
-                
-        commited_devices = []
-        devices = Device.getAllDevicesInstances()
-        try:
-            for device in devices:
-                if device.has_pending_changes:
-                    device.commitChanges()
-                    self.clearPendingChangesFromTable(device.id)
-                    commited_devices.append(device.id)
-                if device.has_updated_hostname: # Refresh the hostname label on canvas, if it was updated
-                    device.has_updated_hostname = False
-                    device.refreshHostnameLabel()
-
-                self._stopCountdown()
-                self._revertButtonsToDefaultState()
 
-        except Exception as e:
-            QMessageBox.critical(self, "Commit failed", f"Failed to commit changes on one or more devices: {e}")
-            utils.printGeneral(traceback.format_exc())
+        devices = [device for device in Device.getAllDevicesInstances() if device.has_pending_changes]
+        if not devices:
+            self._stopCountdown()
+            self._revertButtonsToDefaultState()
+            return
+        
+        self._fanOut("confirm", devices)
 
     def _commitPendingChanges(self) -> None:
         """
@@ -827,26 +1216,12 @@ class PendingChangesWidget(QDockWidget):
         This method is performing "commit" defined in NETCONF RFC6241.
         """
 
-        commited_devices = []
-        devices = Device.getAllDevicesInstances()
-        try:
-            for device in devices:
-                if device.has_pending_changes:
-                    device.commitChanges()
-                    self.clearPendingChangesFromTable(device.id)
-                    commited_devices.append(device.id)
-                if device.has_updated_hostname: # Refresh the hostname label on canvas, if it was updated
-                    device.has_updated_hostname = False
-                    device.refreshHostnameLabel()
-        
-            if commited_devices:
-                utils.printGeneral(f"Performed commit on devices with ID: {', '.join(commited_devices)}")
-            else:
-                QMessageBox.information(self, "No pending changes", "No pending changes to commit.")
+        devices = [device for device in Device.getAllDevicesInstances() if device.has_pending_changes]
+        if not devices:
+            QMessageBox.information(self, "No pending changes", "No pending changes to commit.")
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Commit failed", f"Failed to commit changes on one or more devices: {e}")
-            utils.printGeneral(traceback.format_exc())
+        self._fanOut("commit", devices)
 
     def _discardAllPendingChanges(self) -> None:
         """
@@ -856,40 +1231,271 @@ class PendingChangesWidget(QDockWidget):
         and clears the pending changes from the table for that device.
         """
 
-        devices = Device.getAllDevicesInstances()
-        discarded_devices = []
-        try:
-            for device in devices:
-                if device.has_pending_changes:
-                    device.discardChanges()
-                    self.clearPendingChangesFromTable(device.id)
-                    discarded_devices.append(device.id)
-
-            if discarded_devices:
-                utils.printGeneral(f"Discarded changes on devices with ID: {', '.join(discarded_devices)}")
-            else:
-                QMessageBox.information(self, "No pending changes", "No pending changes to discard.")
+        devices = [device for device in Device.getAllDevicesInstances() if device.has_pending_changes]
+        if not devices:
+            QMessageBox.information(self, "No pending changes", "No pending changes to discard.")
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Discard failed", f"Failed to discard changes on one or more devices: {e}")
-            utils.printGeneral(traceback.format_exc())
+        self._fanOut("discard", devices)
 
     def _cancelConfirmedCommit(self) -> None:
         """Cancels the confirmed commit of pending changes on devices."""
 
-        devices = Device.getAllDevicesInstances()
-        try:
-            for device in devices:
-                if device.has_pending_changes:
-                    device.cancelCommit()
-                    self.clearPendingChangesFromTable(device.id)
+        devices = [device for device in Device.getAllDevicesInstances() if device.has_pending_changes]
+        if not devices:
+            self._stopCountdown()
+            self._revertButtonsToDefaultState()
+            return
+
+        self._fanOut("cancel", devices)
+
+    def _transactionalCommitPendingChanges(self) -> None:
+        """
+        Commits the pending changes on all the devices as a single transaction - either all the devices are committed, or none of them.
+
+        The transaction is built on the candidate datastore and the confirmed commit (NETCONF RFC6241):
+        1. Sends <validate> to all the devices at the same time. If any device fails, the transaction is aborted before anything is committed.
+        2. Sends a confirmed commit to all the devices at the same time.
+        3. If all the devices have been committed, confirms the commit on all of them. Otherwise, the commit is cancelled on the devices that have
+           already been committed (<cancel-commit> on Cisco, <rollback> + <commit> on Juniper).
+        The confirmed commit has the TRANSACTION_CONFIRM_TIMEOUT, so the devices revert the changes themselves, if the transaction is never finished.
+        """
+
+        devices = [device for device in Device.getAllDevicesInstances() if device.has_pending_changes]
+        if not devices:
+            QMessageBox.information(self, "No pending changes", "No pending changes to commit.")
+            return
+
+        self.transaction_devices = devices
+        self.transaction_failures = {}
+        self._fanOut("transaction_validate", devices)
 
+    def _fanOut(self, operation, devices, *args) -> None:
+        """
+        Performs the operation on all the devices at the same time, using the worker pool (bounded by NETCONF_WORKER_POOL_SIZE).
+        Args:
+            operation (str): "apply", "commit", "confirmed_commit", "confirm", "discard", "cancel" or one of the phases of the transactional commit
+                ("transaction_validate", "transaction_commit", "transaction_confirm", "transaction_rollback").
+            devices (list): The devices to perform the operation on.
+            *args: Arguments passed to the NETCONF part of the operation (e.g. Device.performCommit).
+        """
+
+        self.fan_out_operation = operation
+        self.fan_out_succeeded_devices = []
+        self._setButtonsEnabled(False)
+
+        for device in devices:
+            if operation in ("commit", "confirmed_commit", "confirm", "transaction_commit", "transaction_confirm"):
+                function = device.performCommit
+            elif operation == "apply":
+                function = device.performApply
+            elif operation == "discard":
+                function = device.performDiscard
+            elif operation in ("cancel", "transaction_rollback"):
+                function = device.performCancelCommit
+            elif operation == "transaction_validate":
+                function = device.performValidate
+
+            self._setDeviceRowsStatus(device.id, "lightgray", "In progress...")
+            self.fan_out_executor.submit(device, function, *args)
+
+    def _onDeviceOperationSucceeded(self, device, result) -> None:
+        """Applies the result of the operation to the device, as soon as it arrives (GUI thread)."""
+
+        if self.fan_out_operation in ("commit", "confirm", "transaction_confirm"):
+            device.finishCommit(result)
+        elif self.fan_out_operation == "confirmed_commit":
+            device.finishCommit(result, confirmed=True)
+            self._setDeviceRowsStatus(device.id, "lightgreen", "Committed, waiting for the confirmation.")
+        elif self.fan_out_operation == "apply":
+            self._setDeviceRowsStatus(device.id, "lightyellow", "Sent to the device, waiting for the commit.")
+        elif self.fan_out_operation == "discard":
+            device.finishDiscard(result)
+        elif self.fan_out_operation in ("cancel", "transaction_rollback"):
+            device.finishCancelCommit(result)
+        elif self.fan_out_operation == "transaction_validate":
+            self._setDeviceRowsStatus(device.id, "lightblue", "Validated, waiting for the rest of the devices.")
+        elif self.fan_out_operation == "transaction_commit":
+            device.finishCommit(result, confirmed=True)
+            self._setDeviceRowsStatus(device.id, "lightgreen", "Committed, waiting for the rest of the devices.")
+
+        self.fan_out_succeeded_devices.append(device.id)
+
+    def _onDeviceOperationFailed(self, device, error) -> None:
+        """Highlights the changes of the failed device in the table (GUI thread)."""
+
+        utils.printGeneral(f"Operation \"{self.fan_out_operation}\" failed on device with ID: {device.id}: {error}")
+        self._setDeviceRowsStatus(device.id, "salmon", f"Failed: {error}")
+
+    def _onAllDeviceOperationsFinished(self, failures) -> None:
+        """Finishes the operation, once all the devices have finished (GUI thread)."""
+
+        operation = self.fan_out_operation
+        succeeded_devices = self.fan_out_succeeded_devices
+        self.fan_out_operation = None
+        self._setButtonsEnabled(True)
+
+        if operation.startswith("transaction_"):
+            self._continueTransaction(operation, succeeded_devices, failures)
+            return
+
+        if operation == "commit":
+            if succeeded_devices:
+                utils.printGeneral(f"Performed commit on devices with ID: {', '.join(succeeded_devices)}")
+                self._refreshCommittedDevices(succeeded_devices)
+        elif operation == "confirmed_commit":
+            if succeeded_devices: # When at least one device has been committed - begin the confirmed commit procedure
+                self.confirmed_commit_devices = succeeded_devices
+                utils.printGeneral(f"Performed confirmed commit on devices with ID: {', '.join(succeeded_devices)}\nTo preserve the changes, commit again within {int(self.confirmed_commit_deadline - time.monotonic())} seconds.")
+                self._startCountdown()
+        elif operation in ("confirm", "cancel"):
             self._stopCountdown()
             self._revertButtonsToDefaultState()
+            if operation == "confirm":
+                self._refreshCommittedDevices(succeeded_devices)
+        elif operation == "apply":
+            if succeeded_devices:
+                utils.printGeneral(f"Applied staged changes on devices with ID: {', '.join(succeeded_devices)}")
+        elif operation == "discard":
+            if succeeded_devices:
+                utils.printGeneral(f"Discarded changes on devices with ID: {', '.join(succeeded_devices)}")
+
+        if failures:
+            failed_devices = "\n".join(f"{device.id}: {error}" for device, error in failures.items())
+            QMessageBox.critical(self, "Operation failed", f"The operation failed on one or more devices:\n{failed_devices}")
+
+    def _continueTransaction(self, operation, succeeded_devices, failures) -> None:
+        """
+        Moves the transactional commit to its next phase, once all the devices have finished the current one (GUI thread).
+        Args:
+            operation (str): The finished phase ("transaction_validate", "transaction_commit", "transaction_confirm" or "transaction_rollback").
+            succeeded_devices (list): IDs of the devices, on which the phase succeeded.
+            failures (dict): {device: error message} of the devices, on which the phase failed.
+        """
 
-        except Exception as e:
-            QMessageBox.critical(self, "Cancel failed", f"Failed to cancel commit on one or more devices: {e}")
-            utils.printGeneral(traceback.format_exc())
+        self.transaction_failures.update(failures)
+
+        if operation == "transaction_validate":
+            if failures:
+                utils.printGeneral("Transaction aborted: the validation failed on one or more devices. Nothing has been committed.")
+                self._finishTransaction("The validation failed, nothing has been committed")
+                return
+            self._fanOut("transaction_commit", self.transaction_devices, True, TRANSACTION_CONFIRM_TIMEOUT)
+
+        elif operation == "transaction_commit":
+            committed_devices = [Device.getDeviceInstance(device_id) for device_id in succeeded_devices]
+            committed_devices = [device for device in committed_devices if device is not None] # The device could have been removed meanwhile
+            if failures:
+                if committed_devices:
+                    utils.printGeneral(f"Transaction failed: the commit failed on one or more devices. Rolling back devices with ID: {', '.join(succeeded_devices)}")
+                    self._fanOut("transaction_rollback", committed_devices)
+                else:
+                    self._finishTransaction("The commit failed, nothing has been committed")
+                return
+            self._fanOut("transaction_confirm", committed_devices)
+
+        elif operation == "transaction_confirm":
+            if failures: # The unconfirmed devices revert the changes themselves after the TRANSACTION_CONFIRM_TIMEOUT
+                self._finishTransaction(f"The confirmation failed, the devices below revert the changes within {TRANSACTION_CONFIRM_TIMEOUT} seconds")
+                return
+            utils.printGeneral(f"Transaction committed on devices with ID: {', '.join(succeeded_devices)}")
+            self._refreshCommittedDevices(succeeded_devices)
+            self._finishTransaction()
+
+        elif operation == "transaction_rollback":
+            if succeeded_devices:
+                utils.printGeneral(f"Transaction rolled back on devices with ID: {', '.join(succeeded_devices)}")
+            self._finishTransaction("The commit failed on one or more devices, the transaction has been rolled back")
+
+    def _refreshCommittedDevices(self, device_ids) -> None:
+        """
+        Retrieves the interfaces (and the updated hostname) of the committed devices, at the same time (see Device.performRefresh).
+        Runs as a separate phase after the commit of all the devices has finished, so the commit itself is never delayed by the retrieval.
+        The snapshot of every device is taken here (GUI thread), the changes made during the retrieval are not overwritten (see Device.finishRefresh).
+        """
+
+        for device_id in device_ids:
+            device = Device.getDeviceInstance(device_id)
+            if device is not None: # The device could have been removed meanwhile
+                snapshot = device.beginRefresh()
+                self.refresh_executor.submit((device, snapshot), device.performRefresh, snapshot)
+
+    def _refreshFailed(self, key, error) -> None:
+        device, snapshot = key
+        utils.printGeneral(f"Failed to retrieve the interfaces of device with ID: {device.id} after the commit: {error}")
+        device.abortRefresh(snapshot)
+
+    def _finishTransaction(self, error_message=None) -> None:
+        """Ends the transactional commit. When the error message is specified, reports all the devices that have failed during the transaction."""
+
+        failures = self.transaction_failures
+        self.transaction_devices = []
+        self.transaction_failures = {}
+
+        if error_message is not None:
+            failed_devices = "\n".join(f"{device.id}: {error}" for device, error in failures.items())
+            QMessageBox.critical(self, "Transaction failed", f"{error_message}:\n{failed_devices}")
+
+    def _setButtonsEnabled(self, enabled) -> None:
+        """
+        Enables or disables all the buttons (used while an operation is in progress).
+        During the countdown of the confirmed commit, the buttons disabled by _startCountdown stay disabled.
+        """
+
+        countdown = self.countdown_timer.isActive()
+        self.apply_button.setEnabled(enabled)
+        self.commit_button.setEnabled(enabled)
+        self.transaction_commit_button.setEnabled(enabled and not countdown)
+        self.confirmed_commit_button.setEnabled(enabled and not countdown)
+        self.confirmed_commit_timer_combobox.setEnabled(enabled and not countdown)
+        self.discard_button.setEnabled(enabled)
+
+    def _setDeviceRowsStatus(self, device_id, color, tooltip) -> None:
+        """Highlights all the pending changes of the device in the table, with the specified background color and tooltip."""
+
+        self.table_model.setDeviceStatus(device_id, color, tooltip)
+
+    def _startCountdown(self) -> None:
+        """
+        Starts the countdown of the confirmed commit and changes the buttons: "Commit" -> "Confirm", "Discard all" -> "Cancel commit".
+        """
+
+        # Disable buttons
+        self.transaction_commit_button.setEnabled(False)
+        self.confirmed_commit_button.setEnabled(False)
+        self.confirmed_commit_timer_combobox.setEnabled(False)
+        # Change the "Commit" button to "Confirm" button
+        self.commit_button.clicked.disconnect()
+        self.commit_button.clicked.connect(self._confirmCommit)
+        # Change the "Discard all" button to "Cancel commit" button
+        self.discard_button.setText("Cancel commit")
+        self.discard_button.clicked.disconnect()
+        self.discard_button.clicked.connect(self._cancelConfirmedCommit)
+        # Start countdown
+        self._countdownTick()
+        self.countdown_timer.start(1000)
+
+    def _countdownTick(self) -> None:
+        """
+        Updates the commit button text to show the remaining time of the confirmed commit. Called every second by the countdown timer.
+        """
+
+        remaining_seconds = int(self.confirmed_commit_deadline - time.monotonic())
+        if remaining_seconds > 0:
+            self.commit_button.setText(f"Confirm ({remaining_seconds} sec.)")
+            return
+
+        # After the countdown:
+        self._stopCountdown()
+        if self.fan_out_executor.isRunning(): # The confirmation (or cancellation) is in progress, it will revert the buttons itself
+            return
+        self._revertButtonsToDefaultState() # Revert the buttons to their default state
+        for device_id in self.confirmed_commit_devices: # Reset the flags and labels for devices that had pending changes
+            device = Device.getDeviceInstance(device_id)
+            if device is None: # The device was removed meanwhile
+                continue
+            utils.clearPendingChanges(device)
+            device.updateCableLabelsText()
 
     def _revertButtonsToDefaultState(self) -> None:
         """
@@ -906,6 +1512,8 @@ class PendingChangesWidget(QDockWidget):
         self.commit_button.setText("Commit")
         self.commit_button.clicked.disconnect()
         self.commit_button.clicked.connect(self._commitPendingChanges)
+        # "Commit all or nothing" button
+        self.transaction_commit_button.setEnabled(True)
         # "Confirmed commit" button
         self.confirmed_commit_button.setEnabled(True)
         self.confirmed_commit_timer_combobox.setEnabled(True)
@@ -917,19 +1525,22 @@ class PendingChangesWidget(QDockWidget):
     def _stopCountdown(self) -> None:
         """Stops the countdown timer."""
 
-        self.stop_countdown_event.set()
-        
-        if self.confirmed_commit_thread and self.confirmed_commit_thread.is_alive():
-            self.confirmed_commit_thread.join()
+        self.countdown_timer.stop()
 
 
 class PendingChangeDetailsDialog(QDialog):
     """
     QDialog that displays the details of a pending change when the user double-clicks on a pending change in the table.
-    It shows the RPC filter that was used to make the change and the RPC reply received after the change was made.
+    It shows the RPC filter that was used to make the change and the status of the RPC reply received after the change was made.
     """
 
-    def __init__(self, device_id, change_name, rpc_reply, filter) -> QDialog:
+    REPLY_STATUS_TEXT = {
+        "staged": "Staged - the change will be sent to the device together with the other staged changes (Apply, or before the commit).",
+        "ok": "OK - the change has been sent to the device.",
+        "error": "Error - the change could not be sent to the device (see the console).",
+    }
+
+    def __init__(self, record) -> QDialog:
         super().__init__()
 
         self.ui = Ui_PendingChangeDetailsDialog()
@@ -937,30 +1548,92 @@ class PendingChangeDetailsDialog(QDialog):
 
         gnc_icon = QPixmap(os.path.join(ROOT_DIR, "graphics/icons/gnc.png"))
         self.setWindowIcon(QIcon(gnc_icon))
-        self.setWindowTitle(f"{device_id} - {change_name}")
+        self.setWindowTitle(f"{record.device_id} - {record.operation}")
 
-        self.device_id = device_id
-        self.change = change_name
-        self.rpc_reply = rpc_reply
-        self.filter = filter
+        self.record = record
+
+        self.ui.header.setText(f"{record.device_id} - {record.operation}")
+        self.ui.filter_text_browser.setPlainText(str(utils.LazyXml(record.filterXml()))) # Decompressed and formatted only now
+        self.ui.rpc_reply_text_browser.setPlainText(self.REPLY_STATUS_TEXT.get(record.reply_status, record.reply_status) + f"\n\nTarget: {record.target}")
+
+
+class ConsoleSink:
+    """
+    Thread-safe buffer between the redirected stdout/stderr (see ConsoleStream) and the console widget, which takes the output
+    in batches (see ConsoleWidget.flush). The output is also written to a rotating log file (CONSOLE_LOG_FILE), once it is taken
+    by the console. The buffer is bounded (CONSOLE_BUFFER_MAX_BYTES) - when the console does not take the output (e.g. it is not visible),
+    the oldest output is paged out to the log file only.
+    Messages are strings, or RPC replies (utils.LazyXml), which are written to the log file unformatted.
+    """
+
+    def __init__(self, max_bytes=CONSOLE_BUFFER_MAX_BYTES) -> "ConsoleSink":
+        self.max_bytes = max_bytes
+        self._messages = deque()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._logger = None # Created on the first write to the log file
+
+    def put(self, message) -> None:
+        """Adds the message to the buffer. Called from any thread."""
+
+        with self._lock:
+            self._messages.append(message)
+            self._bytes += len(message)
+            paged_out = []
+            while self._bytes > self.max_bytes and len(self._messages) > 1:
+                oldest = self._messages.popleft()
+                self._bytes -= len(oldest)
+                paged_out.append(oldest)
+            if paged_out:
+                self._log(paged_out) # Under the lock, so the log file keeps the order of the output
+
+    def take(self) -> list:
+        """Returns all the messages in the buffer (and writes them to the log file). Called by the console, in the GUI thread."""
+
+        with self._lock:
+            messages = list(self._messages)
+            self._messages.clear()
+            self._bytes = 0
+            if messages:
+                self._log(messages)
+        return(messages)
+
+    def _log(self, messages) -> None:
+        try:
+            if self._logger is None:
+                handler = RotatingFileHandler(CONSOLE_LOG_FILE, maxBytes=CONSOLE_LOG_MAX_BYTES, backupCount=CONSOLE_LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+                handler.terminator = "" # The output already contains the line breaks
+                self._logger = logging.getLogger("gnc.console")
+                self._logger.propagate = False
+                self._logger.setLevel(logging.INFO)
+                self._logger.addHandler(handler)
+            self._logger.info("".join(message.rawText() if isinstance(message, utils.LazyXml) else message for message in messages))
+        except OSError: # The console works without the log file as well
+            pass
+
+console_sink = ConsoleSink()
 
-        self.ui.header.setText(f"{device_id} - {change_name}")
-        self.ui.filter_text_browser.setPlainText(self.filter)
-        self.ui.rpc_reply_text_browser.setPlainText(self.rpc_reply)
-        
 
 class ConsoleStream(StringIO):
     """
     Class that redirects stdout and/or stderr to an integrated console widget.
+    The text is put to the console sink (see ConsoleSink), so it is safe to print from the worker threads.
     """
 
-    def __init__(self, console_widget):
+    def __init__(self, sink) -> "ConsoleStream":
         super().__init__()
-        self.console_widget = console_widget
+        self.sink = sink
 
     def write(self, text):
-        self.console_widget.appendPlainText(text)
-        self.console_widget.ensureCursorVisible()
+        self.sink.put(text)
+        return(len(text))
+
+    def writeRpc(self, header, rpc_reply):
+        """Writes the RPC reply (utils.LazyXml), which is formatted by the console only when it is displayed (see utils.printRpc)."""
+
+        self.sink.put(f"{header}\n")
+        self.sink.put(rpc_reply)
+        self.sink.put("\n")
 
     def flush(self):
         pass
@@ -0,0 +1,271 @@
+# ---------- IMPORTS: ----------
+# Standard library
+import json
+import time
+import weakref
+import threading
+from ncclient.xml_ import NCElement
+
+# Custom modules
+from definitions import RPC_LATENCY_BUCKETS
+
+# ---------- HISTOGRAM: ----------
+class Histogram:
+    """
+    Histogram with fixed bucket upper bounds (cumulative buckets, the same as the Prometheus histograms).
+    Attributes:
+        bounds (tuple): Upper bounds of the buckets (the last, +Inf bucket is implicit).
+        counts (list): Number of observations in every bucket (not cumulative), the last item is the +Inf bucket.
+        count (int): Number of all the observations.
+        sum (float): Sum of all the observations.
+        max (float): The largest observation.
+    """
+
+    def __init__(self, bounds=RPC_LATENCY_BUCKETS) -> "Histogram":
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value) -> None:
+        index = 0
+        while index < len(self.bounds) and value > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other) -> None:
+        """Adds the observations of another histogram (with the same bounds) to this one."""
+
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def mean(self) -> float:
+        return(self.sum / self.count if self.count else 0.0)
+
+    def quantile(self, q) -> float:
+        """Estimates the quantile (0-1) by linear interpolation within the bucket (as histogram_quantile() in Prometheus)."""
+
+        if not self.count:
+            return(0.0)
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.bounds): # +Inf bucket - the largest observation is the best estimate
+                    return(self.max)
+                lower = self.bounds[index - 1] if index else 0.0
+                return(min(lower + (self.bounds[index] - lower) * (rank - cumulative) / count, self.max))
+            cumulative += count
+        return(self.max)
+
+    def toDict(self) -> dict:
+        return({
+            "buckets": {str(bound): count for bound, count in zip(self.bounds + ("+Inf",), self._cumulativeCounts())},
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max
+        })
+
+    def _cumulativeCounts(self) -> list:
+        cumulative, counts = 0, []
+        for count in self.counts:
+            cumulative += count
+            counts.append(cumulative)
+        return(counts)
+
+
+# ---------- RPC METRICS: ----------
+class RpcStatistics:
+    """
+    Aggregated metrics of the RPCs of one device and operation (or of a group of them, see RpcMetrics.aggregate).
+    Attributes:
+        round_trip (Histogram): Time (in seconds) from sending the request, until the reply was received and parsed by ncclient.
+        parse (Histogram): Time (in seconds) spent by the application converting the replies (see utils.convertToEtree). Juniper replies
+            are already parsed by ncclient (within the round trip), so they are not included.
+        request_bytes, reply_bytes (int): Total size of the serialized requests and replies.
+        errors (dict): Error class -> number of the failed RPCs.
+    """
+
+    def __init__(self) -> "RpcStatistics":
+        self.round_trip = Histogram()
+        self.parse = Histogram()
+        self.request_bytes = 0
+        self.reply_bytes = 0
+        self.errors = {}
+
+    @property
+    def count(self) -> int:
+        return(self.round_trip.count)
+
+    @property
+    def error_count(self) -> int:
+        return(sum(self.errors.values()))
+
+    def merge(self, other) -> None:
+        self.round_trip.merge(other.round_trip)
+        self.parse.merge(other.parse)
+        self.request_bytes += other.request_bytes
+        self.reply_bytes += other.reply_bytes
+        for error_class, count in other.errors.items():
+            self.errors[error_class] = self.errors.get(error_class, 0) + count
+
+    def toDict(self) -> dict:
+        return({
+            "count": self.count,
+            "errors": dict(self.errors),
+            "request_bytes": self.request_bytes,
+            "reply_bytes": self.reply_bytes,
+            "round_trip_seconds": self.round_trip.toDict(),
+            "parse_seconds": self.parse.toDict()
+        })
+
+
+class RpcMetrics:
+    """
+    Collects the metrics of all the RPCs sent over the NETCONF sessions (see netconf.NetconfSession): operation, device ID,
+    request and reply size, round-trip time, parse time and error class. The metrics are aggregated per device and operation,
+    so the memory used does not grow with the number of the RPCs.
+    The RPCs are sent from the worker threads as well, so the metrics are guarded by a lock.
+    """
+
+    def __init__(self) -> "RpcMetrics":
+        self.statistics = {} # (device ID, operation) -> RpcStatistics
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local() # The last RPC of the thread, to which the parse time of its reply is attributed
+
+    def record(self, device_id, operation, request_bytes, rpc_reply, round_trip, error=None) -> None:
+        """
+        Records one RPC.
+        Args:
+            device_id (str): The device, to which the RPC was sent.
+            operation (str): Name of the operation (e.g. "get:interfaces", "edit_config", "dispatch:get-route-information").
+            request_bytes (int): Size of the serialized request.
+            rpc_reply: The reply returned by ncclient (None, if the RPC failed).
+            round_trip (float): Time (in seconds) of the RPC.
+            error (Exception, optional): The exception raised by the RPC.
+        """
+
+        reply_bytes = replySize(rpc_reply)
+        key = (device_id, operation)
+        with self._lock:
+            statistics = self.statistics.get(key)
+            if statistics is None:
+                statistics = self.statistics[key] = RpcStatistics()
+            statistics.round_trip.observe(round_trip)
+            statistics.request_bytes += request_bytes
+            statistics.reply_bytes += reply_bytes
+            if error is not None:
+                error_class = errorClass(error)
+                statistics.errors[error_class] = statistics.errors.get(error_class, 0) + 1
+
+        try:
+            self._local.last_rpc = (weakref.ref(rpc_reply), key) if rpc_reply is not None else None
+        except TypeError: # The reply cannot be referenced weakly (e.g. a string)
+            self._local.last_rpc = None
+
+    def recordParseTime(self, rpc_reply, seconds) -> None:
+        """Attributes the time spent converting the reply to the last RPC of the thread, if the reply belongs to it."""
+
+        last_rpc = getattr(self._local, "last_rpc", None)
+        if last_rpc is None or last_rpc[0]() is not rpc_reply:
+            return
+        with self._lock:
+            statistics = self.statistics.get(last_rpc[1])
+            if statistics is not None:
+                statistics.parse.observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.statistics = {}
+            self.started = time.time()
+
+    def aggregate(self, by="device_operation") -> dict:
+        """
+        Returns copies of the statistics, aggregated by "device", "operation", or "device_operation" (no aggregation).
+        Returns:
+            dict: Key (device ID, operation, or both as a tuple) -> RpcStatistics.
+        """
+
+        with self._lock:
+            items = list(self.statistics.items())
+            aggregated = {}
+            for (device_id, operation), statistics in items:
+                key = {"device": device_id, "operation": operation}.get(by, (device_id, operation))
+                if key not in aggregated:
+                    aggregated[key] = RpcStatistics()
+                aggregated[key].merge(statistics)
+        return(aggregated)
+
+    def toJson(self) -> str:
+        """Exports the metrics (per device and operation) as JSON."""
+
+        return(json.dumps({
+            "since": self.started,
+            "rpcs": [
+                {"device": device_id, "operation": operation, **statistics.toDict()}
+                for (device_id, operation), statistics in sorted(self.aggregate().items())
+            ]
+        }, indent=4))
+
+    def toPrometheus(self) -> str:
+        """Exports the metrics in the Prometheus text exposition format."""
+
+        lines = []
+        statistics_items = sorted(self.aggregate().items())
+        for name, attribute, help_text in (
+            ("gnc_rpc_round_trip_seconds", "round_trip", "Round-trip time of the NETCONF RPCs."),
+            ("gnc_rpc_parse_seconds", "parse", "Time spent converting the NETCONF replies.")):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (device_id, operation), statistics in statistics_items:
+                histogram = getattr(statistics, attribute)
+                labels = _prometheusLabels(device=device_id, operation=operation)
+                for bound, count in zip(histogram.bounds + ("+Inf",), histogram._cumulativeCounts()):
+                    lines.append(f"{name}_bucket{{{labels},le=\"{bound}\"}} {count}")
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        for name, attribute, help_text in (
+            ("gnc_rpc_request_bytes_total", "request_bytes", "Size of the serialized NETCONF requests."),
+            ("gnc_rpc_reply_bytes_total", "reply_bytes", "Size of the serialized NETCONF replies.")):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (device_id, operation), statistics in statistics_items:
+                lines.append(f"{name}{{{_prometheusLabels(device=device_id, operation=operation)}}} {getattr(statistics, attribute)}")
+
+        lines += ["# HELP gnc_rpc_errors_total Failed NETCONF RPCs.", "# TYPE gnc_rpc_errors_total counter"]
+        for (device_id, operation), statistics in statistics_items:
+            for error_class, count in sorted(statistics.errors.items()):
+                lines.append(f"gnc_rpc_errors_total{{{_prometheusLabels(device=device_id, operation=operation, error=error_class)}}} {count}")
+        return("\n".join(lines) + "\n")
+
+rpc_metrics = RpcMetrics()
+
+# ---------- HELPER FUNCTIONS: ----------
+def replySize(rpc_reply) -> int:
+    """
+    Returns the size of the serialized reply, without serializing it again.
+    Cisco replies (RPCReply) keep the raw XML, Juniper replies (NCElement) keep the RPCReply they were parsed from.
+    """
+
+    if rpc_reply is None:
+        return(0)
+    if isinstance(rpc_reply, NCElement):
+        rpc_reply = rpc_reply._NCElement__result # Issue: https://github.com/ncclient/ncclient/issues/593
+    raw = getattr(rpc_reply, "xml", None)
+    return(len(raw) if isinstance(raw, (str, bytes)) else 0)
+
+def errorClass(error) -> str:
+    """Returns the class of the error - the exception name, together with the error tag of the RPC errors (e.g. "RPCError(lock-denied)")."""
+
+    tag = getattr(error, "tag", None)
+    return(f"{type(error).__name__}({tag})" if tag else type(error).__name__)
+
+def _prometheusLabels(**labels) -> str:
+    escaped = {name: str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for name, value in labels.items()}
+    return(",".join(f"{name}=\"{value}\"" for name, value in escaped.items()))
@@ -1,6 +1,7 @@
 # ---------- IMPORTS: ----------
 # Standard library
 import os
+import copy
 import ipaddress
 from lxml import etree as ET
 from ncclient import operations
@@ -8,8 +9,9 @@ from natsort import natsorted
 
 # Custom modules
 import utils
-from yang.filters import GetFilter, EditconfigFilter
-from definitions import ROOT_DIR, INTERFACES_YANG_DIR, CONFIGURATION_TARGET_DATASTORE
+import modules.netconf as netconf
+from yang.filters import GetFilter, EditconfigFilter, loadTemplate
+from definitions import ROOT_DIR, INTERFACES_YANG_DIR
 
 # Qt
 from PySide6.QtWidgets import (
@@ -37,7 +39,7 @@ from ui.ui_editinterfacedialog import Ui_edit_interface_dialog
 
 
 # ---------- OPERATIONS: ----------
-def getInterfacesWithNetconf(device) -> tuple:
+def getInterfacesWithNetconf(device, interface_ids=None) -> tuple:
     """
     Retrieve interface information from a network device using NETCONF.
     This function fetches interface details, including administrative and operational
@@ -47,6 +49,8 @@ def getInterfacesWithNetconf(device) -> tuple:
         device (object): A device object that contains connection details and device-specific
                          parameters. The object must have a `device_parameters` dictionary
                          with a 'device_params' key and a `mngr` attribute for NETCONF operations.
+        interface_ids (list, optional): Names of the interfaces to be retrieved. All of them are
+                         retrieved in a single RPC. When not specified, all the interfaces are retrieved.
     Returns:
         tuple: A tuple containing:
             - interfaces (dict): A dictionary where each key is an interface name, and the value
@@ -75,10 +79,13 @@ def getInterfacesWithNetconf(device) -> tuple:
     device_type = device.device_parameters['device_params']
 
     # FILTER
-    filter = OpenconfigInterfaces_Get_GetAllInterfaces_Filter()
+    if interface_ids is None:
+        filter = OpenconfigInterfaces_Get_GetAllInterfaces_Filter()
+    else:
+        filter = OpenconfigInterfaces_Get_GetInterfaces_Filter(interface_ids)
 
     # RPC
-    rpc_reply = device.mngr.get(str(filter))
+    rpc_reply = device.mngr.get(filter.__ele__())
     rpc_reply_etree = utils.convertToEtree(rpc_reply, device_type)
 
     interfaces = {}
@@ -214,7 +221,7 @@ def deleteIpWithNetconf(device, interface_element, subinterface_index, old_ip) -
         filter = OpenconfigInterfaces_Editconfig_EditIpaddress_Filter(interface_element, subinterface_index, old_ip, delete_ip=True)
 
         # RPC
-        rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+        rpc_reply = netconf.editNetconfConfig(device, filter)
         return(rpc_reply, filter)
     except operations.RPCError as e:
         utils.printGeneral(f"Failed to delete IP on device {device.id}: {e}")
@@ -240,7 +247,7 @@ def setIpWithNetconf(device, interface_element, subinterface_index, new_ip) -> t
         # FILTER
         filter = OpenconfigInterfaces_Editconfig_EditIpaddress_Filter(interface_element, subinterface_index, new_ip)
         # RPC
-        rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+        rpc_reply = netconf.editNetconfConfig(device, filter)
         return(rpc_reply, filter)
     except operations.RPCError as e:
         utils.printGeneral(f"Failed to set IP on device {device.id}: {e}")
@@ -270,7 +277,7 @@ def addInterfaceWithNetconf(device, interface_id, interface_type) -> tuple:
         filter = OpenconfigInterfaces_Editconfig_AddInterface_Filter(interface_id, interface_type)
         
         # RPC
-        rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+        rpc_reply = netconf.editNetconfConfig(device, filter)
         return(rpc_reply, filter)
     except operations.RPCError as e:
         utils.printGeneral(f"Failed to add interface on device {device.id}: {e}")
@@ -295,7 +302,7 @@ def editDescriptionWithNetconf(device, interface_element, description) -> tuple:
         # FILTER
         filter = OpenconfigInterfaces_Editconfig_EditDescription_Filter(interface_element, description)
         # RPC
-        rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+        rpc_reply = netconf.editNetconfConfig(device, filter)
         return(rpc_reply, filter)
     except operations.RPCError as e:
         utils.printGeneral(f"Failed to to edit interface description on device {device.id}: {e}")
@@ -308,7 +315,22 @@ def editDescriptionWithNetconf(device, interface_element, description) -> tuple:
 # ---------- FILTERS: ----------
 class OpenconfigInterfaces_Get_GetAllInterfaces_Filter(GetFilter):
     def __init__(self) -> None:
-        self.filter_xml = ET.parse(INTERFACES_YANG_DIR + "openconfig-interfaces_get_get-all-interfaces.xml")
+        self.filter_xml = loadTemplate(INTERFACES_YANG_DIR + "openconfig-interfaces_get_get-all-interfaces.xml")
+
+
+class OpenconfigInterfaces_Get_GetInterfaces_Filter(GetFilter):
+    def __init__(self, interface_ids) -> None:
+        self.filter_xml = loadTemplate(INTERFACES_YANG_DIR + "openconfig-interfaces_get_get-interface.xml")
+        self.namespaces = {'ns': 'http://openconfig.net/yang/interfaces'}
+
+        # The template contains a single <interface> entry - it is copied for each of the requested interfaces
+        interfaces_element = self.filter_xml.find(".//ns:interfaces", self.namespaces)
+        interface_template = interfaces_element.find("ns:interface", self.namespaces)
+        interfaces_element.remove(interface_template)
+        for interface_id in interface_ids:
+            interface_element = copy.deepcopy(interface_template)
+            interface_element.find("ns:name", self.namespaces).text = interface_id
+            interfaces_element.append(interface_element)
 
 
 class OpenconfigInterfaces_Editconfig_EditIpaddress_Filter(EditconfigFilter):
@@ -319,7 +341,7 @@ class OpenconfigInterfaces_Editconfig_EditIpaddress_Filter(EditconfigFilter):
         self.delete_ip = delete_ip
 
         # Load the XML filter template
-        self.filter_xml = ET.parse(INTERFACES_YANG_DIR + "openconfig-interfaces_editconfig_edit_ipaddress.xml")
+        self.filter_xml = loadTemplate(INTERFACES_YANG_DIR + "openconfig-interfaces_editconfig_edit_ipaddress.xml")
         self.namespaces = {'ns': 'http://openconfig.net/yang/interfaces',
                            'oc-ip': 'http://openconfig.net/yang/interfaces/ip',
                            'iana-iftype': 'urn:ietf:params:xml:ns:yang:iana-if-type'}
@@ -387,7 +409,7 @@ class OpenconfigInterfaces_Editconfig_AddInterface_Filter(EditconfigFilter):
         self.interface_type = interface_type
 
         # Load the XML filter template
-        self.filter_xml = ET.parse(INTERFACES_YANG_DIR + "openconfig-interfaces_editconfig_add_interface.xml")
+        self.filter_xml = loadTemplate(INTERFACES_YANG_DIR + "openconfig-interfaces_editconfig_add_interface.xml")
         self.namespaces = {'ns': 'http://openconfig.net/yang/interfaces',
                             'iana-iftype': 'urn:ietf:params:xml:ns:yang:iana-if-type'}
 
@@ -406,7 +428,7 @@ class OpenconfigInterfaces_Editconfig_AddInterface_Filter(EditconfigFilter):
 
 class OpenconfigInterfaces_Editconfig_EditDescription_Filter(EditconfigFilter):
     def __init__(self, interface_element, description) -> None:
-        self.filter_xml = ET.parse(INTERFACES_YANG_DIR + "openconfig-interfaces_editconfig_edit_description.xml")
+        self.filter_xml = loadTemplate(INTERFACES_YANG_DIR + "openconfig-interfaces_editconfig_edit_description.xml")
         self.namespaces = {'ns': 'http://openconfig.net/yang/interfaces'}
 
         self.filter_xml.find(".//ns:name", self.namespaces).text = interface_element
@@ -560,13 +582,14 @@ class DeviceInterfacesDialog(QDialog):
         """
         Refreshes the device.interfaces list by retrieving new list from the device. Usefull for refreshing the dialog when waiting for the interface to come up.
         Cannot be launched when the device has pending changes, because the changes would be lost.
+        The snapshot cache is bypassed (force refresh), the operational state of the interfaces might have changed.
         """
 
         if self.device.has_pending_changes:
             QMessageBox.warning(self, "Warning", "The device has some pending changes. Please commit or discard them first.")
             return
         else:
-            self.device.interfaces = self.device.getInterfaces()
+            self.device.interfaces = self.device.getInterfaces(force=True)
             self.refreshDialog()
             self.device.updateCableLabelsText()
 
@@ -1,14 +1,30 @@
 # ---------- IMPORTS: ----------
 # Standard Library
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from ncclient import manager, transport, operations
 from ncclient.operations import RaiseMode
 from lxml import etree as ET
 
 # Custom modules
 import utils
-from yang.filters import DispatchFilter
-from definitions import ROOT_DIR, SYSTEM_YANG_DIR
+from metrics import rpc_metrics
+from journal import pending_change_journal
+from yang.filters import DispatchFilter, loadTemplate
+from definitions import (
+    ROOT_DIR, 
+    SYSTEM_YANG_DIR,
+    CONFIGURATION_TARGET_DATASTORE,
+    EDIT_CONFIG_BATCHING,
+    RPC_METRICS_ENABLED,
+    NETCONF_WORKER_POOL_SIZE,
+    NETCONF_KEEPALIVE_INTERVAL,
+    NETCONF_RECONNECT_BACKOFF_INITIAL,
+    NETCONF_RECONNECT_BACKOFF_MAX,
+    NETCONF_RECONNECT_ATTEMPTS,
+    NETCONF_BACKGROUND_RECONNECT_ATTEMPTS)
 
 # Qt
 from PySide6.QtWidgets import (
@@ -21,15 +37,15 @@ from PySide6.QtWidgets import (
     QTableWidget,
     QTableWidgetItem,
     QHeaderView,
-    QStyle,
-    QMessageBox)
+    QStyle)
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QGuiApplication, QIcon, QPixmap
 
 # ---------- OPERATIONS: ----------
-def establishNetconfConnection(device_parameters) -> manager:
+def establishNetconfConnection(device_parameters, device_id=None) -> "NetconfSession":
     """
-    Establishes a NETCONF connection to a network device.
+    Establishes a NETCONF connection to a network device. The connection is owned by the session pool (see NetconfSessionPool),
+    which keeps it alive and re-establishes it when it drops.
     Args:
         device_parameters (dict): A dictionary containing:
             - address (str): The IP address or hostname of the device.
@@ -37,37 +53,31 @@ def establishNetconfConnection(device_parameters) -> manager:
             - password (str): The password for authentication.
             - port (int): The port number for the NETCONF connection.
             - device_params (str): The device-specific parameters for the NETCONF connection.
+        device_id (str, optional): ID of the device, under which the RPCs are recorded in the RPC metrics ("address:port", when not specified).
     Returns:
-        ncclient.manager: An instance of the ncclient manager class representing the NETCONF connection.
+        NetconfSession: Proxy of the ncclient manager class representing the NETCONF connection. Supports the same operations as the manager.
+    Raises:
+        ConnectionError: If the connection cannot be established. Reporting the error to the user is left to the caller,
+            since this function is also called from the worker threads (see workers.FanOutExecutor).
     """
     
     try:
-        mngr = manager.connect(
-            host=str(device_parameters["address"]),
-            username=str(device_parameters["username"]),
-            password=str(device_parameters["password"]),
-            port=str(device_parameters["port"]),
-            device_params={"name": device_parameters["device_params"]},
-            hostkey_verify=False
-        )
-        mngr.raise_mode = RaiseMode.ERRORS # Raise exceptions only on errors, not on warnings (https://github.com/ncclient/ncclient/issues/545)
+        mngr = session_pool.getSession(device_parameters)
+        if device_id is not None:
+            mngr.device_id = device_id
         utils.printGeneral(f"Successfully established NETCONF connection to: {device_parameters['address']} on port {device_parameters['port']}")
         return mngr
     except transport.SSHError as e:
-        QMessageBox.critical(None, "Connection Error", f"Unable to connect: {e}")
         raise ConnectionError(f"Unable to connect: {e}")
     except transport.AuthenticationError as e:
-        QMessageBox.critical(None, "Authentication Error", f"Authentication error: {e}")
         raise ConnectionError(f"Authentication error: {e}")
     except operations.TimeoutExpiredError as e:
-        QMessageBox.critical(None, "Timeout Error", f"Timeout during connecting expired: {e}")
         raise ConnectionError(f"Timeout during connecting expired: {e}")
     except Exception as e:
-        QMessageBox.critical(None, "General Error", f"General error: {e}")
         raise ConnectionError(f"General error: {e}")
  
 def demolishNetconfConnection(device) -> ET.Element:
-    """ Tears down the spcified ncclient connection, by deleting the mng object. """
+    """ Tears down the spcified ncclient connection and removes it from the session pool. """
     try:
         rpc_reply = device.mngr.close_session()
         return(rpc_reply)
@@ -78,64 +88,482 @@ def demolishNetconfConnection(device) -> ET.Element:
         utils.printGeneral(f"Failed to close NETCONF connection: {e}")
         return None
 
-def commitNetconfChanges(device, confirmed: bool=False, confirm_timeout=None) -> ET.Element:
-    """ Performs the "commit" operation using the specified ncclient connection. """
+# Shown in place of the RPC reply of a staged change (the change has not been sent to the device yet)
+STAGED_EDIT_REPLY = "<staged>The change will be sent to the device together with the other staged changes (Apply, or before the commit).</staged>"
+
+def editNetconfConfig(device, filter):
+    """
+    Performs the "edit-config" operation with the filter (EditconfigFilter) on the configuration target datastore.
+    When EDIT_CONFIG_BATCHING is enabled, the filter is only staged in the edit batch of the device (see EditconfigBatch)
+    and all the staged changes are sent later on, in a single RPC (see applyNetconfChanges).
+    Returns:
+        The RPC reply, or STAGED_EDIT_REPLY if the change has been staged.
+    """
+
+    if EDIT_CONFIG_BATCHING:
+        device.edit_batch.add(filter)
+        return(STAGED_EDIT_REPLY)
+    try:
+        return(device.mngr.edit_config(filter.__ele__(), target=CONFIGURATION_TARGET_DATASTORE))
+    except CandidateDiscardedError:
+        restageDiscardedChanges(device)
+        raise
+
+def applyNetconfChanges(device) -> list:
+    """
+    Sends the staged changes of the device (its edit batch) to the configuration target datastore - one "edit-config" operation per batch,
+    usually a single one. Raises an exception on failure, the changes, which have not been sent, are then kept staged.
+    Returns:
+        list: The RPC replies (empty, if there were no staged changes).
+    """
+
+    batches = device.edit_batch.take()
+    rpc_replies = []
     try:
-        rpc_reply = device.mngr.commit(confirmed, timeout=str(confirm_timeout))
+        while batches:
+            rpc_replies.append(device.mngr.edit_config(batches[0][0], target=CONFIGURATION_TARGET_DATASTORE))
+            batches.pop(0)
+        return(rpc_replies)
+    except operations.RPCError as e:
+        utils.printGeneral(f"Failed to apply staged changes: {e}")
+        device.edit_batch.restore(batches)
+        raise
+    except CandidateDiscardedError as e:
+        utils.printGeneral(f"Failed to apply staged changes: {e}")
+        restageDiscardedChanges(device) # The batches sent over the old session have been discarded as well
+        raise
+    except Exception as e:
+        utils.printGeneral(f"Failed to apply staged changes: {e}")
+        device.edit_batch.restore(batches)
+        raise
+
+def validateNetconfChanges(device) -> ET.Element:
+    """ Performs the "validate" operation on the configuration target datastore, using the specified ncclient connection. Raises an exception on failure. """
+    try:
+        rpc_reply = device.mngr.validate(source=CONFIGURATION_TARGET_DATASTORE)
+        return(rpc_reply)
+    except operations.RPCError as e:
+        utils.printGeneral(f"Failed to validate changes: {e}")
+        raise
+    except CandidateDiscardedError as e:
+        utils.printGeneral(f"Failed to validate changes: {e}")
+        restageDiscardedChanges(device)
+        raise
+    except Exception as e:
+        utils.printGeneral(f"Failed to validate changes: {e}")
+        raise
+
+def commitNetconfChanges(device, confirmed: bool=False, confirm_timeout=None, persist=None, persist_id=None) -> ET.Element:
+    """
+    Performs the "commit" operation using the specified ncclient connection. Raises an exception on failure.
+    The persist token makes the confirmed commit survive the end of the session, it is then confirmed (or cancelled) from any session
+    with the same persist_id (RFC 6241, section 8.4.5.1). Both need the :confirmed-commit:1.1 capability.
+    """
+    try:
+        persist_parameters = {"persist": persist} if persist is not None else {"persist_id": persist_id} if persist_id is not None else {} # The Junos commit has neither of them
+        rpc_reply = device.mngr.commit(confirmed, timeout=str(confirm_timeout), **persist_parameters)
         return(rpc_reply)
     except operations.RPCError as e:
         utils.printGeneral(f"Failed to commit changes: {e}")
-        return (rpc_reply)
+        raise
+    except CandidateDiscardedError as e:
+        utils.printGeneral(f"Failed to commit changes: {e}")
+        restageDiscardedChanges(device)
+        raise
     except Exception as e:
         utils.printGeneral(f"Failed to commit changes: {e}")
-        return None
+        raise
 
 def discardNetconfChanges(device) -> ET.Element:
-    """ Performs the "discard-changes" operation using the specified ncclient connection. """
+    """ Performs the "discard-changes" operation using the specified ncclient connection. Raises an exception on failure. """
     try:
         rpc_reply = device.mngr.discard_changes()
         return(rpc_reply)
     except operations.RPCError as e:
         utils.printGeneral(f"Failed to discard changes: {e}")
-        return (rpc_reply)
+        raise
+    except CandidateDiscardedError as e:
+        utils.printGeneral(f"Failed to discard changes: {e}")
+        restageDiscardedChanges(device)
+        raise
     except Exception as e:
         utils.printGeneral(f"Failed to discard changes: {e}")
-        return None
+        raise
     
-def cancelNetconfCommit(device) -> ET.Element:
-    """ Performs the "cancel-commit" operation using the specified ncclient connection. """
+def cancelNetconfCommit(device, persist_id=None) -> ET.Element:
+    """ Performs the "cancel-commit" operation using the specified ncclient connection (of the persistent confirmed commit, if persist_id is set). Raises an exception on failure. """
     try:
-        rpc_reply = device.mngr.cancel_commit()
+        rpc_reply = device.mngr.cancel_commit(persist_id=persist_id)
         return(rpc_reply)
     except operations.RPCError as e:
         utils.printGeneral(f"Failed to cancel commit: {e}")
-        return (rpc_reply)
+        raise
+    except CandidateDiscardedError as e:
+        utils.printGeneral(f"Failed to cancel commit: {e}")
+        restageDiscardedChanges(device)
+        raise
     except Exception as e:
         utils.printGeneral(f"Failed to cancel commit: {e}")
-        return None
+        raise
 
 def rollbackNetconfChanges(device) -> ET.Element:
-    """ Performs the "rollback" operation using the specified ncclient connection. """
+    """ Performs the "rollback" operation using the specified ncclient connection. Raises an exception on failure. """
     try:
         rpc_payload = JunosRpc_Dispatch_RollbackZero_Filter()
         rpc_reply = device.mngr.dispatch(rpc_payload.__ele__())
         return(rpc_reply)
     except operations.RPCError as e:
         utils.printGeneral(f"Failed to rollback changes: {e}")
-        return (rpc_reply)
+        raise
+    except CandidateDiscardedError as e:
+        utils.printGeneral(f"Failed to rollback changes: {e}")
+        restageDiscardedChanges(device)
+        raise
     except Exception as e:
         utils.printGeneral(f"Failed to rollback changes: {e}")
-        return None
+        raise
+
+def restageDiscardedChanges(device) -> None:
+    """
+    Stages again all the pending changes of the device from the pending change journal, after the device has discarded its candidate datastore
+    (see CandidateDiscardedError). The changes are then sent again with the next apply, validation or commit.
+    """
+
+    records = [record for record in pending_change_journal.records(device) if record.filter]
+    device.edit_batch.clear()
+    for record in records:
+        device.edit_batch.add(record)
+    device.mngr.acknowledgeDiscardedCandidate()
+    utils.printGeneral(f"The {len(records)} pending changes of device {device.id} have been staged again, repeat the operation to send them to the device.")
 
 def getNetconfCapabilities(device) -> list:
     """ Retrieves the capabilities of the specified ncclient connection. """
     capabilities = device.mngr.server_capabilities
     return(capabilities)
 
+def _connectManager(device_parameters) -> manager.Manager:
+    """ Opens a new ncclient connection to the device. Used by the session pool, when establishing and re-establishing the sessions. """
+
+    mngr = manager.connect(
+        host=str(device_parameters["address"]),
+        username=str(device_parameters["username"]),
+        password=str(device_parameters["password"]),
+        port=str(device_parameters["port"]),
+        device_params={"name": device_parameters["device_params"]},
+        hostkey_verify=False
+    )
+    mngr.raise_mode = RaiseMode.ERRORS # Raise exceptions only on errors, not on warnings (https://github.com/ncclient/ncclient/issues/545)
+    if RPC_METRICS_ENABLED:
+        _meterRequests(mngr)
+    return(mngr)
+
+# ---------- RPC METRICS: ----------
+# Size of the requests sent by the current thread, since the start of the operation (see NetconfSession._callOperation)
+_sent_bytes = threading.local()
+
+def _meterRequests(mngr) -> None:
+    """ Counts the size of the requests sent over the ncclient session. ncclient sends the request from the thread calling the operation. """
+
+    session = mngr._session
+    send = session.send
+
+    def meteredSend(message):
+        _sent_bytes.count = getattr(_sent_bytes, "count", 0) + len(message)
+        return(send(message))
+
+    session.send = meteredSend
+
+# The ncclient operations, that can be called with execute() (e.g. routing._RawReplyGet), labeled the same as the manager methods
+EXECUTED_OPERATION_NAMES = ((operations.Get, "get"), (operations.GetConfig, "get_config"), (operations.Dispatch, "dispatch"))
+
+def _operationLabel(name, args, kwargs) -> str:
+    """
+    Returns the name of the operation recorded in the RPC metrics. The retrievals are labeled with the top-level element
+    of the filter (or of the dispatched RPC), e.g. "get:interfaces" or "dispatch:get-route-information", so the slow filters can be told apart.
+    The operations called with execute() are labeled by their RPC class, the same as when called directly.
+    """
+
+    if name == "execute" and args and isinstance(args[0], type):
+        rpc_class, args = args[0], args[1:]
+        name = next((operation_name for operation_class, operation_name in EXECUTED_OPERATION_NAMES if issubclass(rpc_class, operation_class)), None)
+        if name is None:
+            return(f"execute:{rpc_class.__name__}")
+    if name not in ("get", "get_config", "dispatch"):
+        return(name)
+    payload = kwargs.get("filter", kwargs.get("rpc_command", args[0] if args else None))
+    if not isinstance(payload, ET._Element):
+        return(name)
+    if ET.QName(payload).localname == "filter":
+        payload = next(payload.iterchildren(ET.Element), None)
+        if payload is None:
+            return(name)
+    return(f"{name}:{ET.QName(payload).localname}")
+
+# ---------- SESSION POOL: ----------
+# Exceptions, which mean that the transport of the session is dead (as opposed to the RPC errors returned by a live device)
+DEAD_TRANSPORT_EXCEPTIONS = (transport.TransportError, OSError, EOFError)
+
+# Operations, which are never retried after the session has been re-established - they might have been performed over the dead session already,
+# and they depend on the candidate datastore, which the device might have discarded meanwhile
+NOT_RETRIED_OPERATIONS = ("edit_config", "commit", "validate", "discard_changes", "cancel_commit", "dispatch")
+
+class CandidateDiscardedError(ConnectionError):
+    """
+    Raised by the operations in NOT_RETRIED_OPERATIONS, after the session has been re-established by killing the old session (see NetconfSession._relock).
+    The device has discarded the changes in the candidate datastore and reverted the unconfirmed commit, so the pending changes have to be staged
+    again (see restageDiscardedChanges) before they are committed.
+    """
+
+# Empty subtree filter selects no data (RFC 6241, section 6.4.2), so the keepalive <get> is as cheap as possible
+KEEPALIVE_FILTER = "<filter type=\"subtree\"></filter>"
+
+class NetconfSession:
+    """
+    Proxy of the ncclient manager of one device, owned by the NetconfSessionPool. All the operations (get, edit_config, commit, ...)
+    and attributes (server_capabilities, ...) are forwarded to the current ncclient manager.
+    When the transport of the manager is found dead - either by the keepalive, or when an operation is called - the session is
+    re-established with exponential backoff, the datastore locked before is locked again, and the called operation is retried once
+    (except for the operations in NOT_RETRIED_OPERATIONS).
+    Attributes:
+        device_parameters (dict): The parameters of the device (address, port, username, ...).
+        manager (ncclient.manager.Manager): The current ncclient manager.
+        locked_target (str): The datastore locked over this session, re-locked after the session is re-established.
+        closed (bool): True, after the session was closed with close_session().
+        candidate_discarded (bool): True, after the old session was killed to lock the datastore again, until the pending changes are staged again.
+        device_id (str): ID of the device, under which the RPCs are recorded in the RPC metrics (see metrics.RpcMetrics).
+    """
+
+    def __init__(self, device_parameters, pool) -> "NetconfSession":
+        self.device_parameters = device_parameters
+        self.pool = pool
+        self.device_id = f"{device_parameters['address']}:{device_parameters['port']}"
+        self.locked_target = None
+        self.closed = False
+        self.candidate_discarded = False
+        self.closed_event = threading.Event() # Interrupts the backoff, when the session is closed
+        self.reconnect_lock = threading.Lock() # Held only during a single attempt, never during the backoff
+        self.reconnecting_in_background = threading.Event()
+        self.manager = _connectManager(device_parameters)
+
+    def __getattr__(self, name):
+        """ Forwards the attributes and operations, that are not defined by the proxy, to the current ncclient manager. """
+
+        attribute = getattr(self.manager, name)
+        if not callable(attribute):
+            return(attribute)
+        return(lambda *args, **kwargs: self._callOperation(name, *args, **kwargs))
+
+    def lock(self, target="candidate"):
+        """ Locks the datastore and remembers it, so it can be locked again after the session is re-established. """
+
+        rpc_reply = self._callOperation("lock", target=target)
+        self.locked_target = target
+        return(rpc_reply)
+
+    def close_session(self):
+        """ Closes the session and removes it from the pool. The session is not re-established anymore. """
+
+        self.closed = True
+        self.closed_event.set()
+        self.pool.removeSession(self)
+        return(self.manager.close_session())
+
+    def keepalive(self) -> None:
+        """ Sends the keepalive RPC. When the session is found dead, it is re-established in the background. Called by the pool. """
+
+        manager = self.manager
+        if self.closed or self.reconnecting_in_background.is_set():
+            return
+        try:
+            if not manager.connected:
+                raise transport.TransportError("Not connected to NETCONF server")
+            manager.get(filter=KEEPALIVE_FILTER)
+        except operations.RPCError: # The device has answered, so the session is alive
+            return
+        except Exception as e:
+            utils.printGeneral(f"Keepalive on the NETCONF session to: {self.device_parameters['address']} failed ({e}). Re-establishing the session...")
+            self.reconnecting_in_background.set()
+            threading.Thread(target=self._reconnectInBackground, args=(manager,), daemon=True).start()
+
+    def reconnect(self, dead_manager, max_attempts=NETCONF_RECONNECT_ATTEMPTS) -> None:
+        """
+        Re-establishes the session, with exponential backoff between the attempts. Then locks the datastore, that was locked before.
+        The reconnect lock is held only during an attempt (not during the backoff), so the other callers are never blocked for long.
+        Args:
+            dead_manager (ncclient.manager.Manager): The manager found dead. Nothing is done, if the session was already re-established meanwhile.
+            max_attempts (int): The number of attempts, before giving up.
+        Raises:
+            ConnectionError: If the session could not be re-established within max_attempts, or the session was closed meanwhile.
+        """
+
+        delay = NETCONF_RECONNECT_BACKOFF_INITIAL
+        for attempt in range(1, max_attempts + 1):
+            if self.closed:
+                break
+            with self.reconnect_lock:
+                if self.manager is not dead_manager and self.manager.connected:
+                    return
+                try:
+                    new_manager = _connectManager(self.device_parameters)
+                    if self.locked_target is not None:
+                        self._relock(new_manager, dead_manager.session_id)
+                    self.manager = new_manager
+                    utils.printGeneral(f"NETCONF session to: {self.device_parameters['address']} has been re-established (attempt {attempt}).")
+                    return
+                except Exception as e:
+                    error = e
+                    utils.printGeneral(f"Attempt {attempt} to re-establish the NETCONF session to: {self.device_parameters['address']} failed: {e}")
+            if attempt < max_attempts:
+                self.closed_event.wait(delay)
+                delay = min(delay * 2, NETCONF_RECONNECT_BACKOFF_MAX)
+
+        if self.closed:
+            raise ConnectionError(f"NETCONF session to: {self.device_parameters['address']} has been closed.")
+        raise ConnectionError(f"Unable to re-establish the NETCONF session to: {self.device_parameters['address']}: {error}")
+
+    def _relock(self, new_manager, old_session_id) -> None:
+        """
+        Locks the datastore over the re-established session. If the device still holds the lock for the old (dead) session,
+        the old session is killed first, which releases its lock (RFC 6241, section 7.9).
+        """
+
+        try:
+            try:
+                new_manager.lock(target=self.locked_target)
+            except operations.RPCError:
+                if old_session_id is None:
+                    raise
+                new_manager.kill_session(old_session_id)
+                new_manager.lock(target=self.locked_target)
+                self.candidate_discarded = True
+                utils.printGeneral(f"The old NETCONF session (ID: {old_session_id}) to: {self.device_parameters['address']} was killed to release the lock. The uncommitted changes have been discarded by the device.")
+        except Exception:
+            new_manager.close_session()
+            raise
+
+    def acknowledgeDiscardedCandidate(self) -> None:
+        """ Allows the operations in NOT_RETRIED_OPERATIONS again, once the pending changes have been staged again (see restageDiscardedChanges). """
+
+        self.candidate_discarded = False
+
+    def _reconnectInBackground(self, dead_manager) -> None:
+        """
+        Re-establishes the session from the keepalive (runs in a separate thread). Gives up after NETCONF_BACKGROUND_RECONNECT_ATTEMPTS,
+        the next keepalive then starts it again.
+        """
+
+        try:
+            self.reconnect(dead_manager, max_attempts=NETCONF_BACKGROUND_RECONNECT_ATTEMPTS)
+        except Exception as e:
+            utils.printGeneral(f"Failed to re-establish the NETCONF session to: {self.device_parameters['address']}: {e}")
+        finally:
+            self.reconnecting_in_background.clear()
+
+    def _callOperation(self, name, *args, **kwargs):
+        """ Calls the operation (see _performOperation) and records it in the RPC metrics. """
+
+        if not RPC_METRICS_ENABLED:
+            return(self._performOperation(name, *args, **kwargs))
+
+        _sent_bytes.count = 0
+        rpc_reply, error = None, None
+        start = time.perf_counter()
+        try:
+            rpc_reply = self._performOperation(name, *args, **kwargs)
+            return(rpc_reply)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            rpc_metrics.record(self.device_id, _operationLabel(name, args, kwargs), _sent_bytes.count, rpc_reply, time.perf_counter() - start, error)
+
+    def _performOperation(self, name, *args, **kwargs):
+        """
+        Calls the operation on the current manager. If the transport is dead, the session is re-established and the operation retried once.
+        The operations in NOT_RETRIED_OPERATIONS are not retried - ConnectionError is raised, or CandidateDiscardedError, if the old session
+        had to be killed (the operations then keep failing, until the pending changes are staged again).
+        If the session is already being re-established in the background (see keepalive), the operation fails right away, instead of waiting for it.
+        """
+
+        if self.candidate_discarded and name in NOT_RETRIED_OPERATIONS:
+            raise CandidateDiscardedError(f"The NETCONF session to: {self.device_parameters['address']} has been re-established by killing the old session. The device has discarded the uncommitted changes.")
+
+        manager = self.manager
+        try:
+            if not manager.connected:
+                raise transport.TransportError("Not connected to NETCONF server")
+            return(getattr(manager, name)(*args, **kwargs))
+        except DEAD_TRANSPORT_EXCEPTIONS as e:
+            if self.closed or manager.connected:
+                raise
+            if self.reconnecting_in_background.is_set():
+                raise ConnectionError(f"NETCONF session to: {self.device_parameters['address']} is dead and is being re-established in the background. Try again later.") from e
+            utils.printGeneral(f"NETCONF session to: {self.device_parameters['address']} is dead ({e}). Re-establishing the session...")
+            self.reconnect(manager)
+            if self.candidate_discarded and name in NOT_RETRIED_OPERATIONS:
+                raise CandidateDiscardedError(f"The NETCONF session to: {self.device_parameters['address']} has been re-established by killing the old session. The device has discarded the uncommitted changes.") from e
+            if name in NOT_RETRIED_OPERATIONS:
+                raise ConnectionError(f"The NETCONF session to: {self.device_parameters['address']} has been re-established, but the <{name}> operation was not retried - it might have been performed over the dead session already. Check the device and repeat the operation.") from e
+            return(getattr(self.manager, name)(*args, **kwargs))
+
+
+class NetconfSessionPool:
+    """
+    Owns the NETCONF sessions of all the devices, keyed by (address, port, username).
+    Periodically sends keepalives over all the sessions (in a background thread), so the dead sessions are detected
+    and re-established, before they are needed for an operation.
+    """
+
+    def __init__(self) -> "NetconfSessionPool":
+        self.sessions = {}
+        self.sessions_lock = threading.Lock()
+        self.keepalive_thread = None
+
+    @staticmethod
+    def _getKey(device_parameters) -> tuple:
+        return(str(device_parameters["address"]), str(device_parameters["port"]), str(device_parameters["username"]))
+
+    def getSession(self, device_parameters) -> NetconfSession:
+        """ Returns the open session for the device, or establishes a new one. """
+
+        key = self._getKey(device_parameters)
+        with self.sessions_lock:
+            session = self.sessions.get(key)
+        if session is not None and not session.closed:
+            return(session)
+
+        session = NetconfSession(device_parameters, self) # Connecting is done outside of the lock, so multiple sessions can be established at the same time
+        with self.sessions_lock:
+            self.sessions[key] = session
+            if self.keepalive_thread is None:
+                self.keepalive_thread = threading.Thread(target=self._keepaliveLoop, name="netconf-keepalive", daemon=True)
+                self.keepalive_thread.start()
+        return(session)
+
+    def removeSession(self, session) -> None:
+        """ Removes the session from the pool (called when the session is closed). """
+
+        key = self._getKey(session.device_parameters)
+        with self.sessions_lock:
+            if self.sessions.get(key) is session:
+                del self.sessions[key]
+
+    def _keepaliveLoop(self) -> None:
+        """ Sends the keepalives over all the sessions in the pool, every NETCONF_KEEPALIVE_INTERVAL seconds. """
+
+        with ThreadPoolExecutor(max_workers=NETCONF_WORKER_POOL_SIZE, thread_name_prefix="netconf-keepalive") as executor:
+            while True:
+                time.sleep(NETCONF_KEEPALIVE_INTERVAL)
+                with self.sessions_lock:
+                    sessions = list(self.sessions.values())
+                list(executor.map(lambda session: session.keepalive(), sessions))
+
+session_pool = NetconfSessionPool()
+
 # ---------- FILTERS: ----------
 class JunosRpc_Dispatch_RollbackZero_Filter(DispatchFilter):
     def __init__(self) -> None:
-        self.filter_xml = ET.parse(SYSTEM_YANG_DIR + "junos-rpc_dispatch_rollback_pending_changes.xml")
+        self.filter_xml = loadTemplate(SYSTEM_YANG_DIR + "junos-rpc_dispatch_rollback_pending_changes.xml")
 
 
 # ---------- QT: ----------
@@ -5,8 +5,9 @@ import ipaddress
 from lxml import etree as ET
 
 # Custom modules
-from yang.filters import EditconfigFilter
-from definitions import ROOT_DIR, CONFIGURATION_TARGET_DATASTORE, ROUTING_YANG_DIR
+import modules.netconf as netconf
+from yang.filters import EditconfigFilter, loadTemplate
+from definitions import ROOT_DIR, ROUTING_YANG_DIR
 
 # Qt
 from PySide6.QtWidgets import (
@@ -45,7 +46,7 @@ def configureOSPFWithNetconf(ospf_device, area, hello_interval, dead_interval, r
         filter = OpenconfigNetworkInstance_Editconfig_ConfigureOspf_Filter(area, hello_interval, dead_interval, reference_bandwidth, ospf_device.router_id, ospf_device.passive_interfaces, ospf_device.ospf_networks)
             
         # RPC                
-        rpc_reply = ospf_device.original_device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE) # the mngr is not in the cloned device, but rather in the original device
+        rpc_reply = netconf.editNetconfConfig(ospf_device.original_device, filter) # the mngr (and the edit batch) is not in the cloned device, but rather in the original device
         return(rpc_reply, filter)
     
     elif ospf_device.device_parameters["device_params"] == "iosxe":
@@ -53,7 +54,7 @@ def configureOSPFWithNetconf(ospf_device, area, hello_interval, dead_interval, r
         filter = CiscoIOSXEOspf_Editconfig_ConfigureOspf_Filter(area, hello_interval, dead_interval, reference_bandwidth, ospf_device.router_id, ospf_device.passive_interfaces, ospf_device.ospf_networks)
         
         # RPC                
-        rpc_reply = ospf_device.original_device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE) # the mngr is not in the cloned device, but rather in the original device
+        rpc_reply = netconf.editNetconfConfig(ospf_device.original_device, filter) # the mngr (and the edit batch) is not in the cloned device, but rather in the original device
         return(rpc_reply, filter)
 
 
@@ -71,7 +72,7 @@ class OpenconfigNetworkInstance_Editconfig_ConfigureOspf_Filter(EditconfigFilter
         self.interfaces = list(ospf_networks.keys())
 
         # Load the XML filter template
-        self.filter_xml = ET.parse(ROUTING_YANG_DIR + "openconfig-network-instance_edit-config_configure-ospf.xml")
+        self.filter_xml = loadTemplate(ROUTING_YANG_DIR + "openconfig-network-instance_edit-config_configure-ospf.xml")
         self.namespaces = {'ns': 'http://openconfig.net/yang/network-instance'}
 
         # Set the router-id
@@ -146,7 +147,7 @@ class CiscoIOSXEOspf_Editconfig_ConfigureOspf_Filter(EditconfigFilter):
         self.ospf_interfaces = list(ospf_networks.keys())
 
         # Load the XML filter template
-        self.filter_xml = ET.parse(ROUTING_YANG_DIR + "cisco-IOS-XE-ospf_edit-config_configure-ospf.xml")
+        self.filter_xml = loadTemplate(ROUTING_YANG_DIR + "cisco-IOS-XE-ospf_edit-config_configure-ospf.xml")
         self.namespaces = {'native': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native',
                            'ospf': 'http://cisco.com/ns/yang/Cisco-IOS-XE-ospf'}
         
@@ -0,0 +1,718 @@
+# ---------- IMPORTS: ----------
+# Standard library
+import os
+import re
+import sys
+import time
+import socket
+from array import array
+from lxml import etree as ET
+from ncclient.operations.rpc import RPCReply
+from ncclient.operations.retrieve import Get, Dispatch
+
+# Custom modules
+from yang.filters import GetFilter, DispatchFilter, loadTemplate
+from definitions import ROOT_DIR, ROUTING_YANG_DIR
+
+# Qt
+from PySide6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QLineEdit,
+    QComboBox,
+    QDialogButtonBox,
+    QTableView,
+    QHeaderView,
+    QAbstractItemView)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QIcon, QPixmap
+
+
+# ---------- OPERATIONS: ----------
+def getRoutingTableWithNetconf(device) -> "RouteStore":
+    """
+    Retrieves the routing table from the device and extracts the routes into a RouteStore.
+    The reply is never turned into a DOM: ncclient is asked not to parse it (see _RawReplyRPC), and the routes are streamed
+    from the raw reply with iterparse, clearing every processed route. The raw reply is encoded for iterparse in small chunks (see _RawReplyReader),
+    not copied as a whole. The peak memory is therefore given by the raw reply and the extracted routes, not by the DOM of the reply
+    (which is several times larger than the reply itself).
+    Args:
+        device (Device): The device, from which the routing table is retrieved.
+    Returns:
+        RouteStore: The routes of the device.
+    """
+
+    device_type = device.device_parameters["device_params"]
+
+    if device_type == "iosxe":
+        # FILTER
+        filter = IetfRouting_Get_GetRoutingState_Filter()
+        # RPC
+        rpc_reply = device.mngr.execute(_RawReplyGet, filter=filter.__ele__())
+        extractRoutes = extractIetfRoutes
+    elif device_type == "junos":
+        # FILTER
+        rpc_payload = JunosRpcRoute_Dispatch_GetRoutingInformation_Filter()
+        # RPC
+        rpc_reply = device.mngr.execute(_RawReplyDispatch, rpc_payload.__ele__())
+        extractRoutes = extractJunosRoutes
+
+    routes = RouteStore()
+    routes.extend(extractRoutes(_RawReplyReader(rpc_reply.xml)))
+    return(routes)
+
+def extractJunosRoutes(source):
+    """
+    Streams the routes from the Junos <get-route-information> reply.
+    Args:
+        source (file-like object or str): The reply (bytes) or the path to it.
+    Yields:
+        tuple: (table, prefix, next_hop, interface, protocol, preference, active) for every route entry (<rt-entry>).
+    """
+
+    table = None
+    for _, element in ET.iterparse(source, events=("end",), tag=("{*}table-name", "{*}rt")):
+        if element.tag.endswith("table-name"):
+            table = element.text
+            continue
+
+        destination = None
+        prefix_length = None
+        entries = []
+        for child in element:
+            name = _localName(child)
+            if name == "rt-destination":
+                destination = child.text
+            elif name == "rt-prefix-length":
+                prefix_length = child.text
+            elif name == "rt-entry":
+                entries.append(child)
+        if prefix_length is not None and destination is not None and "/" not in destination:
+            destination = f"{destination}/{prefix_length}"
+
+        for entry in entries:
+            fields = {}
+            next_hop = None
+            for child in entry:
+                name = _localName(child)
+                if name == "nh":
+                    # Prefer the selected next-hop, when there are multiple of them (ECMP)
+                    if next_hop is None or any(_localName(nh_child) == "selected-next-hop" for nh_child in child):
+                        next_hop = child
+                else:
+                    fields[name] = child
+
+            address = None
+            interface = None
+            if next_hop is not None:
+                next_hop_fields = {_localName(nh_child): nh_child.text for nh_child in next_hop}
+                address = next_hop_fields.get("to")
+                interface = next_hop_fields.get("via") or next_hop_fields.get("nh-local-interface")
+            if address is None and "nh-type" in fields:
+                address = fields["nh-type"].text # Discard, Receive, Reject, ...
+
+            protocol = fields["protocol-name"].text if "protocol-name" in fields else None
+            preference = fields["preference"].text if "preference" in fields else None
+            active = ("active-tag" in fields and fields["active-tag"].text == "*") or "current-active" in fields
+            yield(table, destination, address, interface, protocol, preference, active)
+
+        _releaseElement(element)
+
+def extractIetfRoutes(source):
+    """
+    Streams the routes from the ietf-routing <routing-state> reply.
+    Args:
+        source (file-like object or str): The reply (bytes) or the path to it.
+    Yields:
+        tuple: (table, prefix, next_hop, interface, protocol, preference, active) for every route. The table is the name of the RIB.
+    """
+
+    table = None
+    for _, element in ET.iterparse(source, events=("end",), tag=("{*}name", "{*}route")):
+        if element.tag.endswith("name"):
+            if _localName(element.getparent()) == "rib":
+                table = element.text
+            continue
+
+        fields = {_localName(child): child for child in element}
+
+        address = None
+        interface = None
+        if "next-hop" in fields:
+            for next_hop_child in fields["next-hop"].iter():
+                name = _localName(next_hop_child)
+                if name in ("next-hop-address", "address", "special-next-hop") and address is None:
+                    address = next_hop_child.text
+                elif name == "outgoing-interface" and interface is None:
+                    interface = next_hop_child.text
+
+        protocol = fields["source-protocol"].text if "source-protocol" in fields else None
+        if protocol is not None:
+            protocol = protocol.split(":")[-1] # Strip the YANG module prefix (ietf-routing:static -> static)
+
+        prefix = fields["destination-prefix"].text if "destination-prefix" in fields else None
+        preference = fields["route-preference"].text if "route-preference" in fields else None
+        yield(table, prefix, address, interface, protocol, preference, "active" in fields)
+
+        _releaseElement(element)
+
+def _localName(element) -> str:
+    """Returns the tag of the element without the namespace (faster than ET.QName, called for every element of the route)."""
+
+    return(element.tag.rpartition("}")[2])
+
+def _releaseElement(element) -> None:
+    """Frees the processed element and its already processed siblings, so the tree built by iterparse does not grow."""
+
+    element.clear(keep_tail=False)
+    parent = element.getparent()
+    while element.getprevious() is not None:
+        del parent[0]
+
+
+# ---------- DATA: ----------
+class RouteStore:
+    """
+    Columnar store of routes. Every route has the same index in all the columns, which keeps the memory proportional to the number of routes
+    (no per-route objects). The repeated strings (tables, next-hops, interfaces, protocols) are interned, so they are stored only once.
+    Attributes:
+        tables, prefixes, next_hops, interfaces, protocols (list): The columns with strings (or None, when the value is missing).
+        preferences (array): The route preference (administrative distance), -1 when missing.
+        active (bytearray): 1 if the route is active (installed in the forwarding table), 0 otherwise.
+    """
+
+    COLUMNS = ("Table", "Prefix", "Next hop", "Interface", "Protocol", "Preference", "Active")
+
+    def __init__(self) -> "RouteStore":
+        self.tables = []
+        self.prefixes = []
+        self.next_hops = []
+        self.interfaces = []
+        self.protocols = []
+        self.preferences = array("l")
+        self.active = bytearray()
+
+    def __len__(self) -> int:
+        return(len(self.prefixes))
+
+    def append(self, table, prefix, next_hop, interface, protocol, preference, active) -> None:
+        """Adds a single route to the store."""
+
+        self.tables.append(_intern(table))
+        self.prefixes.append(prefix)
+        self.next_hops.append(_intern(next_hop))
+        self.interfaces.append(_intern(interface))
+        self.protocols.append(_intern(protocol))
+        self.preferences.append(int(preference) if preference else -1)
+        self.active.append(1 if active else 0)
+
+    def extend(self, routes) -> None:
+        """Adds the routes (iterable of tuples, e.g. extractJunosRoutes()) to the store."""
+
+        for route in routes:
+            self.append(*route)
+
+    def value(self, row, column):
+        """Returns the value of the route (row) in the specified column (index to COLUMNS)."""
+
+        if column == 0:
+            return(self.tables[row])
+        elif column == 1:
+            return(self.prefixes[row])
+        elif column == 2:
+            return(self.next_hops[row])
+        elif column == 3:
+            return(self.interfaces[row])
+        elif column == 4:
+            return(self.protocols[row])
+        elif column == 5:
+            preference = self.preferences[row]
+            return(preference if preference >= 0 else None)
+        elif column == 6:
+            return(bool(self.active[row]))
+
+def _intern(value):
+    return(sys.intern(value) if value is not None else None)
+
+
+class RouteIndex:
+    """
+    Search index over the RouteStore, built once per fetched routing table.
+    The prefixes of every table are stored in a patricia (path-compressed binary radix) trie per address family,
+    which answers the longest prefix match and the "prefix and its more specifics" queries by walking at most 32/128 bits.
+    The tries are built on the first prefix search (the dialog opens without waiting for them).
+    The next-hops, interfaces and protocols have inverted indexes (value -> rows).
+    Attributes:
+        routes (RouteStore): The indexed routes.
+        tries (dict): (table, address family) -> root node of the trie. None until the first prefix search.
+        next_hops, interfaces, protocols (dict): The inverted indexes. The protocols are case-insensitive (lowercase keys).
+    """
+
+    SEARCH_FIELDS = ("Longest prefix match", "Prefix", "Next hop", "Interface", "Protocol")
+
+    def __init__(self, routes) -> "RouteIndex":
+        self.routes = routes
+        self.tries = None
+        self.next_hops = _invertedIndex(routes.next_hops)
+        self.interfaces = _invertedIndex(routes.interfaces)
+        self.protocols = _invertedIndex(routes.protocols, str.lower)
+
+    def _buildTries(self) -> None:
+        entries = {} # (table, address family) -> [(prefix as int, prefix length, row)]
+        widths = {}
+        tables = self.routes.tables
+        for row, prefix in enumerate(self.routes.prefixes):
+            parsed = _parsePrefix(prefix)
+            if parsed is None:
+                continue # Not an IP prefix (e.g. MPLS label)
+            family, width, key, length = parsed
+            trie_entries = entries.get((tables[row], family))
+            if trie_entries is None:
+                trie_entries = entries[(tables[row], family)] = []
+                widths[(tables[row], family)] = width
+            trie_entries.append((key, length, row))
+
+        self.tries = {}
+        for trie, trie_entries in entries.items():
+            trie_entries.sort()
+            root = self.tries[trie] = _trieNode(0, 0)
+            _trieBuild(root, widths[trie], trie_entries)
+
+    def search(self, field, query) -> list:
+        """
+        Searches the routes.
+        Args:
+            field (str): One of SEARCH_FIELDS.
+                "Longest prefix match": the routes, which win for the address (query), in every table. Only the active routes of the prefix,
+                    unless none of them is active.
+                "Prefix": the routes of the prefix (query) and of all its more specific prefixes.
+                "Next hop", "Interface", "Protocol": the routes with the value. An interface matches its units as well (ge-0/0/1 -> ge-0/0/1.0).
+            query (str): The searched value.
+        Returns:
+            list: The rows of the matching routes (in the order of the store). Raises ValueError for an invalid address or prefix.
+        """
+
+        query = query.strip()
+        if field in ("Longest prefix match", "Prefix") and self.tries is None:
+            self._buildTries()
+
+        if field == "Longest prefix match":
+            parsed = _parsePrefix(query)
+            if parsed is None or "/" in query:
+                raise ValueError(f"Invalid IP address: {query}")
+            family, width, key, _ = parsed
+            rows = []
+            active = self.routes.active
+            for (_, trie_family), root in self.tries.items():
+                if trie_family == family:
+                    matched_rows = _trieLongestMatch(root, width, key)
+                    active_rows = [row for row in matched_rows if active[row]]
+                    rows.extend(active_rows or matched_rows)
+        elif field == "Prefix":
+            parsed = _parsePrefix(query)
+            if parsed is None:
+                raise ValueError(f"Invalid IP prefix: {query}")
+            family, width, key, length = parsed
+            rows = []
+            for (_, trie_family), root in self.tries.items():
+                if trie_family == family:
+                    rows.extend(_trieCovered(root, width, key, length))
+        elif field == "Next hop":
+            rows = list(self.next_hops.get(query, ()))
+        elif field == "Interface":
+            rows = list(self.interfaces.get(query, ()))
+            unit_prefix = query + "."
+            for interface, interface_rows in self.interfaces.items():
+                if interface is not None and interface.startswith(unit_prefix):
+                    rows.extend(interface_rows)
+        elif field == "Protocol":
+            rows = list(self.protocols.get(query.lower(), ()))
+        else:
+            raise ValueError(f"Unknown search field: {field}")
+
+        rows.sort()
+        return(rows)
+
+def _invertedIndex(column, normalize=None) -> dict:
+    """Returns value -> rows (array of the row numbers) for the column of the RouteStore. The missing values are not indexed."""
+
+    index = {}
+    for row, value in enumerate(column):
+        if value is None:
+            continue
+        if normalize is not None:
+            value = normalize(value)
+        rows = index.get(value)
+        if rows is None:
+            rows = index[value] = array("l")
+        rows.append(row)
+    return(index)
+
+def _parsePrefix(prefix) -> tuple:
+    """
+    Parses the IPv4/IPv6 prefix ("10.0.0.0/8") or address ("10.0.0.1", treated as a host prefix).
+    Returns:
+        tuple: (address family, width in bits, prefix as int with the host bits cleared, prefix length), None if it is not an IP prefix.
+    """
+
+    if not prefix:
+        return(None)
+    address, _, length = prefix.partition("/")
+    family = socket.AF_INET6 if ":" in address else socket.AF_INET
+    try:
+        key = int.from_bytes(socket.inet_pton(family, address), "big")
+    except OSError:
+        return(None)
+    width = 128 if family == socket.AF_INET6 else 32
+    if length:
+        if not length.isdigit() or int(length) > width:
+            return(None)
+        length = int(length)
+    else:
+        length = width
+    key &= ~((1 << (width - length)) - 1)
+    return(family, width, key, length)
+
+# The trie node is a list (smaller and faster than an object): [prefix as int, prefix length, rows of the routes or None, child 0, child 1]
+_KEY, _LENGTH, _ROWS, _CHILD = 0, 1, 2, 3
+
+def _trieNode(key, length, row=None) -> list:
+    return([key, length, [row] if row is not None else None, None, None])
+
+def _commonLength(a, b, width, limit) -> int:
+    """Returns the length of the common prefix of the two keys, at most limit bits."""
+
+    difference = (a ^ b) >> (width - limit)
+    return(limit - difference.bit_length())
+
+def _trieBuild(root, width, entries) -> None:
+    """
+    Inserts the prefixes into the trie. The entries must be sorted by (key, length) - every new prefix is then inserted on the rightmost
+    path of the trie, which is kept on a stack, so the insertion does not walk the trie from the root (amortized O(1) per prefix).
+    Args:
+        root (list): The root node of the trie.
+        width (int): 32 for IPv4, 128 for IPv6.
+        entries (list): Sorted tuples (prefix as int, prefix length, row).
+    """
+
+    stack = [root]
+    for key, length, row in entries:
+        # Find the deepest node on the rightmost path, which contains the prefix (the root contains everything)
+        while True:
+            node = stack[-1]
+            node_length = node[_LENGTH]
+            if node_length <= length and (node_length == 0 or not (node[_KEY] ^ key) >> (width - node_length)):
+                break
+            stack.pop()
+
+        if node_length == length:
+            if node[_ROWS] is None:
+                node[_ROWS] = [row]
+            else:
+                node[_ROWS].append(row)
+            continue
+
+        bit = (key >> (width - 1 - node_length)) & 1
+        child = node[_CHILD + bit]
+        if child is None:
+            leaf = node[_CHILD + bit] = _trieNode(key, length, row)
+            stack.append(leaf)
+            continue
+
+        # The new prefix branches off in the middle of the compressed path -> split it with a new node
+        common = _commonLength(child[_KEY], key, width, min(child[_LENGTH], length))
+        branch = _trieNode(key & ~((1 << (width - common)) - 1), common)
+        branch[_CHILD + ((child[_KEY] >> (width - 1 - common)) & 1)] = child
+        node[_CHILD + bit] = branch
+        stack.append(branch)
+        if common == length:
+            branch[_ROWS] = [row]
+        else:
+            leaf = branch[_CHILD + ((key >> (width - 1 - common)) & 1)] = _trieNode(key, length, row)
+            stack.append(leaf)
+
+def _trieLongestMatch(root, width, key) -> list:
+    """Returns the rows of the longest prefix containing the address (key)."""
+
+    best = ()
+    node = root
+    while node is not None:
+        node_length = node[_LENGTH]
+        if node_length and (node[_KEY] ^ key) >> (width - node_length):
+            break
+        if node[_ROWS] is not None:
+            best = node[_ROWS]
+        if node_length == width:
+            break
+        node = node[_CHILD + ((key >> (width - 1 - node_length)) & 1)]
+    return(best)
+
+def _trieCovered(root, width, key, length) -> list:
+    """Returns the rows of the prefix and of all its more specific prefixes."""
+
+    node = root
+    while node is not None:
+        node_length = node[_LENGTH]
+        compared = min(node_length, length)
+        if compared and (node[_KEY] ^ key) >> (width - compared):
+            return([])
+        if node_length >= length:
+            break
+        node = node[_CHILD + ((key >> (width - 1 - node_length)) & 1)]
+    if node is None:
+        return([])
+
+    rows = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node[_ROWS] is not None:
+            rows.extend(node[_ROWS])
+        if node[_CHILD] is not None:
+            stack.append(node[_CHILD])
+        if node[_CHILD + 1] is not None:
+            stack.append(node[_CHILD + 1])
+    return(rows)
+
+
+# ---------- NCCLIENT: ----------
+_RPC_ERROR = re.compile(r"<([\w.-]+:)?rpc-error[\s>/]")
+
+class _RawReply(RPCReply):
+    """
+    RPC reply, which is not parsed by ncclient. The (potentially huge) reply is kept only as the raw XML and it is streamed by the caller.
+    The reply is parsed only when it contains an <rpc-error> (small replies), so the errors are still raised by ncclient.
+    """
+
+    def parse(self):
+        if self._parsed:
+            return
+        if _RPC_ERROR.search(self._raw):
+            super().parse()
+        self._parsed = True
+
+class _RawReplyDeviceHandler:
+    """Device handler proxy, which stops ncclient from transforming the reply into a DOM (NCElement, used for Juniper)."""
+
+    def __init__(self, device_handler):
+        self._device_handler = device_handler
+
+    def __getattr__(self, name):
+        return(getattr(self._device_handler, name))
+
+    def transform_reply(self):
+        return(False)
+
+class _RawReplyRPC:
+    """Mixin for the ncclient operations, which return the _RawReply."""
+
+    REPLY_CLS = _RawReply
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._device_handler = _RawReplyDeviceHandler(self._device_handler)
+
+class _RawReplyGet(_RawReplyRPC, Get):
+    pass
+
+class _RawReplyDispatch(_RawReplyRPC, Dispatch):
+    pass
+
+class _RawReplyReader:
+    """
+    Read-only file-like object over the raw reply (str), passed to iterparse. The reply is encoded only in the chunks requested by the parser,
+    so there is never a second (encoded) copy of the whole reply in memory.
+    """
+
+    def __init__(self, raw_reply) -> "_RawReplyReader":
+        self.raw_reply = raw_reply
+        self.position = 0
+
+    def read(self, size=-1) -> bytes:
+        if size is None or size < 0:
+            size = len(self.raw_reply) - self.position
+        chunk = self.raw_reply[self.position:self.position + size]
+        self.position += len(chunk)
+        return(chunk.encode("utf-8"))
+
+
+# ---------- FILTERS: ----------
+class JunosRpcRoute_Dispatch_GetRoutingInformation_Filter(DispatchFilter):
+    def __init__(self) -> None:
+        self.filter_xml = loadTemplate(ROUTING_YANG_DIR + "junos-rpc-route_dispatch_get-routing-information.xml")
+
+
+class IetfRouting_Get_GetRoutingState_Filter(GetFilter):
+    def __init__(self) -> None:
+        self.filter_xml = loadTemplate(ROUTING_YANG_DIR + "ietf-routing_get_get-routing-state.xml")
+
+
+# ---------- QT: ----------
+class RoutingTableModel(QAbstractTableModel):
+    """
+    Table model over the RouteStore. The view asks only for the visible rows, so the size of the routing table does not matter
+    (no widget item is created for the routes). The model can show only a subset of the routes (search results, see setRows()).
+    """
+
+    def __init__(self, routes, parent=None) -> "RoutingTableModel":
+        super().__init__(parent)
+        self.routes = routes
+        self.rows = None # Rows of the store to show, None = all of them
+
+    def setRoutes(self, routes) -> None:
+        self.beginResetModel()
+        self.routes = routes
+        self.rows = None
+        self.endResetModel()
+
+    def setRows(self, rows) -> None:
+        """Shows only the specified rows of the store (list of row numbers), None shows all the routes."""
+
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return(len(self.rows) if self.rows is not None else len(self.routes))
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return(len(RouteStore.COLUMNS))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+
+        row = self.rows[index.row()] if self.rows is not None else index.row()
+        value = self.routes.value(row, index.column())
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return("*" if value else "")
+        return(str(value))
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return(RouteStore.COLUMNS[section])
+        return(str(section + 1))
+
+
+class ShowRoutingTableDialog(QDialog):
+    """
+    Dialog for displaying the routing table of the device. The routes are displayed in a table view over the RouteStore.
+    The routes can be searched (longest prefix match, prefix, next-hop, interface, protocol) with the RouteIndex, built once per fetch.
+    """
+
+    def __init__(self, device, routes) -> QDialog:
+        """
+        Initializes the dialog for showing the routing table.
+        Args:
+            device (Device): The device object for which to display the routing table.
+            routes (RouteStore): The routes of the device (None, if the routing table could not be retrieved).
+        """
+
+        super().__init__()
+        self.device = device
+
+        gnc_icon = QPixmap(os.path.join(ROOT_DIR, "graphics/icons/gnc.png"))
+        self.setWindowIcon(QIcon(gnc_icon))
+        self.setWindowTitle("Routing Table")
+        self.resize(900, 600)
+
+        self.header = QLabel(f"Routing Table for device: {device.id}")
+        self.count_label = QLabel()
+        self.route_index = None
+
+        self.search_field_combo_box = QComboBox()
+        self.search_field_combo_box.addItems(RouteIndex.SEARCH_FIELDS)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Address, prefix, next hop, interface or protocol (empty = all routes)")
+        self.search_input.returnPressed.connect(self._searchRoutes)
+        self.search_button = QPushButton("Search")
+        self.search_button.clicked.connect(self._searchRoutes)
+
+        self.model = RoutingTableModel(RouteStore(), self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed) # Rows are not measured one by one
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self._refreshRoutingTable)
+        self.close_button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        self.close_button_box.rejected.connect(self.reject)
+
+        # Layout
+        header_layout = QHBoxLayout()
+        header_layout.addWidget(self.header)
+        header_layout.addStretch()
+        header_layout.addWidget(self.count_label)
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(self.search_field_combo_box)
+        search_layout.addWidget(self.search_input)
+        search_layout.addWidget(self.search_button)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.refresh_button)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.close_button_box)
+        layout = QVBoxLayout()
+        layout.addLayout(header_layout)
+        layout.addLayout(search_layout)
+        layout.addWidget(self.table_view)
+        layout.addLayout(buttons_layout)
+        self.setLayout(layout)
+
+        self._setRoutes(routes)
+
+    def _setRoutes(self, routes) -> None:
+        """Displays the routes in the table."""
+
+        if routes is None:
+            self.count_label.setText("No data found!")
+            routes = RouteStore()
+        else:
+            self.count_label.setText(f"{len(routes)} routes")
+        self.model.setRoutes(routes)
+        self.route_index = RouteIndex(routes)
+        if self.search_input.text().strip():
+            self._searchRoutes() # Keep the search results after refresh
+
+    def _searchRoutes(self) -> None:
+        """Shows only the routes matching the search (all the routes, when the search input is empty)."""
+
+        query = self.search_input.text().strip()
+        total = len(self.model.routes)
+        if not query:
+            self.model.setRows(None)
+            self.count_label.setText(f"{total} routes")
+            return
+
+        field = self.search_field_combo_box.currentText()
+        start = time.perf_counter()
+        try:
+            rows = self.route_index.search(field, query)
+        except ValueError as e:
+            self.count_label.setText(str(e))
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        self.model.setRows(rows)
+        self.count_label.setText(f"{len(rows)} of {total} routes ({elapsed:.1f} ms)")
+
+    def _refreshRoutingTable(self) -> None:
+        """
+        Refreshes the routing table of the device. This method is called when the user clicks the "Refresh" button in the routing table dialog.
+        """
+
+        self._setRoutes(self.device.getRoutingTable())
@@ -6,8 +6,9 @@ import ipaddress
 
 # Custom modules
 import utils
-from yang.filters import EditconfigFilter, DispatchFilter
-from definitions import ROOT_DIR, SECURITY_YANG_DIR, CONFIGURATION_TARGET_DATASTORE
+import modules.netconf as netconf
+from yang.filters import EditconfigFilter, DispatchFilter, loadTemplate
+from definitions import ROOT_DIR, SECURITY_YANG_DIR
 
 # QT
 from PySide6.QtWidgets import (
@@ -56,7 +57,7 @@ def configureIPSecWithNetconf(device, dev_parameters, ike_parameters, ipsec_para
         print(filter)
 
         # RPC                
-        rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+        rpc_reply = netconf.editNetconfConfig(device, filter)
 
         # Show reminder to check the security zones
         message = (
@@ -73,7 +74,7 @@ def configureIPSecWithNetconf(device, dev_parameters, ike_parameters, ipsec_para
         filter = CiscoIOSXENative_Editconfig_ConfigureIPSec_Filter(dev_parameters, ike_parameters, ipsec_parameters)
         
         # RPC
-        rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+        rpc_reply = netconf.editNetconfConfig(device, filter)
         return(rpc_reply, filter)
 
 def getSecurityZonesWithNetconf(device) -> tuple:
@@ -94,20 +95,20 @@ def getSecurityZonesWithNetconf(device) -> tuple:
 
 def configureSecurityZoneToInterfaceWithNetconf(device, interface, zone, remove_interface_from_zone=False):
     filter = JunosConfSecurity_EditConfig_ConfigureInterfacesZone_Filter(interface, zone, remove_interface_from_zone)
-    rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+    rpc_reply = netconf.editNetconfConfig(device, filter)
     return (rpc_reply, filter)
 
 
 # ---------- FILTERS: ----------
 class JunosRpcZones_Dispatch_GetZones_Filter(DispatchFilter):
     def __init__(self) -> None:
-        self.filter_xml = ET.parse(SECURITY_YANG_DIR + "junos-rpc-zones_dispatch_get-zones.xml")
+        self.filter_xml = loadTemplate(SECURITY_YANG_DIR + "junos-rpc-zones_dispatch_get-zones.xml")
 
 
 class CiscoIOSXENative_Editconfig_ConfigureIPSec_Filter(EditconfigFilter):
     def __init__(self, dev_parameters: dict, ike_parameters: dict, ipsec_parameters: dict) -> None:  
         # Load the XML filter template
-        self.filter_xml = ET.parse(SECURITY_YANG_DIR + "Cisco-IOS-XE-native_edit-config_configure-ipsec.xml")
+        self.filter_xml = loadTemplate(SECURITY_YANG_DIR + "Cisco-IOS-XE-native_edit-config_configure-ipsec.xml")
         self.namespaces = {'native': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native',
                            "acl": "http://cisco.com/ns/yang/Cisco-IOS-XE-acl",
                            "crypto": "http://cisco.com/ns/yang/Cisco-IOS-XE-crypto"
@@ -245,7 +246,7 @@ class CiscoIOSXENative_Editconfig_ConfigureIPSec_Filter(EditconfigFilter):
 
 class JunosConf_Editconfig_ConfigureIPSec_Filter(EditconfigFilter):
     def __init__(self, dev_parameters: dict, ike_parameters: dict, ipsec_parameters: dict) -> None:
-        self.filter_xml = ET.parse(SECURITY_YANG_DIR + "junos-conf_edit-config_configure-ipsec.xml")
+        self.filter_xml = loadTemplate(SECURITY_YANG_DIR + "junos-conf_edit-config_configure-ipsec.xml")
         self.namespaces = {"conf": "http://yang.juniper.net/junos"}
 
         self._createIkeFilter(ike_parameters, dev_parameters)
@@ -385,7 +386,7 @@ class JunosConf_Editconfig_ConfigureIPSec_Filter(EditconfigFilter):
 
 class JunosConfSecurity_EditConfig_ConfigureInterfacesZone_Filter(EditconfigFilter):
     def __init__(self, interface, zone, remove_interface_from_zone=False) -> None:
-        self.filter_xml = ET.parse(SECURITY_YANG_DIR + "junos-conf-security_edit-config_configure-interfaces-zone.xml")
+        self.filter_xml = loadTemplate(SECURITY_YANG_DIR + "junos-conf-security_edit-config_configure-interfaces-zone.xml")
         self.namespaces = {"conf": "http://yang.juniper.net/junos"}
 
         self._createFilter(interface, zone, remove_interface_from_zone)
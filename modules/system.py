@@ -5,8 +5,9 @@ from lxml import etree as ET
 
 # Custom modules
 import utils as utils
-from yang.filters import GetFilter, EditconfigFilter
-from definitions import ROOT_DIR, SYSTEM_YANG_DIR, CONFIGURATION_TARGET_DATASTORE
+import modules.netconf as netconf
+from yang.filters import GetFilter, EditconfigFilter, loadTemplate
+from definitions import ROOT_DIR, SYSTEM_YANG_DIR, RUNNING_CONFIG_SECTIONS, OTHER_RUNNING_CONFIG_SECTIONS
 
 # Qt
 from PySide6.QtWidgets import (
@@ -39,7 +40,7 @@ def getHostnameWithNetconf(device) -> tuple:
         filter_xml = OpenconfigSystem_Get_GetHostname_Filter() # For Juniper, use OpenConfig models
     
     # RPC    
-    rpc_reply = device.mngr.get_config(source="running", filter=str(filter_xml))
+    rpc_reply = device.mngr.get_config(source="running", filter=filter_xml.__ele__())
     rpc_reply_etree = utils.convertToEtree(rpc_reply, device_type)
     
     # XPATH
@@ -69,24 +70,87 @@ def setHostnameWithNetconf(device, new_hostname) -> tuple:
         filter_xml = OpenconfigSystem_Editconfig_EditHostname_Filter(new_hostname) # For Juniper, use OpenConfig models
 
     # RPC
-    rpc_reply = device.mngr.edit_config(target=CONFIGURATION_TARGET_DATASTORE, config=str(filter_xml))
+    rpc_reply = netconf.editNetconfConfig(device, filter_xml)
     return(rpc_reply, filter_xml)
 
+def getRunningConfigSectionWithNetconf(device, section) -> tuple:
+    """
+    Retrieves a single section (top-level container, see RUNNING_CONFIG_SECTIONS) of the running configuration, using a subtree filter.
+    The OTHER_RUNNING_CONFIG_SECTIONS section holds all the top-level containers, which are not listed in RUNNING_CONFIG_SECTIONS
+    (the whole running configuration is retrieved for it).
+    Args:
+        section (str): The name of the section (e.g. "interfaces", "security").
+    Returns:
+        tuple:
+            - section_element (lxml.etree._Element): The section, without namespaces. Element without any content, if the section is not configured.
+              Sections consisting of multiple list entries (e.g. username) are wrapped into a single element.
+            - rpc_reply (str): The raw NETCONF RPC reply.
+    """
+
+    device_type = device.device_parameters['device_params']
+    container, sections = RUNNING_CONFIG_SECTIONS[device_type]
+    if section == OTHER_RUNNING_CONFIG_SECTIONS:
+        section = None # The filter selects the whole root container
+
+    # FILTER
+    if device_type == "iosxe":
+        filter_xml = CiscoIOSXENative_Get_GetSection_Filter(section)
+    elif device_type == "junos":
+        filter_xml = JunosConf_Get_GetSection_Filter(section)
+
+    # RPC
+    rpc_reply = device.mngr.get_config(source="running", filter=filter_xml.__ele__())
+    rpc_reply_etree = utils.convertToEtree(rpc_reply, device_type)
+
+    # XPATH
+    if section is None:
+        container_element = rpc_reply_etree.find(f".//{container}")
+        section_element = ET.Element(OTHER_RUNNING_CONFIG_SECTIONS)
+        if container_element is not None:
+            section_element.extend([child for child in container_element if isinstance(child.tag, str) and child.tag not in sections])
+        return(section_element, rpc_reply)
+    section_elements = rpc_reply_etree.findall(f".//{container}/{section}")
+    if len(section_elements) == 1:
+        return(section_elements[0], rpc_reply)
+    section_element = ET.Element(section)
+    section_element.extend(section_elements)
+    return(section_element, rpc_reply)
+
 
 # ---------- FILTERS: ----------
 class CiscoIOSXENative_Get_GetHostname_Filter(GetFilter):
     def __init__(self):
-        self.filter_xml = ET.parse(SYSTEM_YANG_DIR + "Cisco-IOS-XE-native_get_get-hostname.xml")
+        self.filter_xml = loadTemplate(SYSTEM_YANG_DIR + "Cisco-IOS-XE-native_get_get-hostname.xml")
 
 
 class OpenconfigSystem_Get_GetHostname_Filter(GetFilter):
     def __init__(self):
-        self.filter_xml = ET.parse(SYSTEM_YANG_DIR + "openconfig-system_get_get-hostname.xml")
+        self.filter_xml = loadTemplate(SYSTEM_YANG_DIR + "openconfig-system_get_get-hostname.xml")
+
+
+class CiscoIOSXENative_Get_GetSection_Filter(GetFilter):
+    def __init__(self, section):
+        self.filter_xml = loadTemplate(SYSTEM_YANG_DIR + "Cisco-IOS-XE-native_get_get-section.xml")
+        namespaces = {'ns': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native'}
+
+        native_element = self.filter_xml.find(".//ns:native", namespaces)
+        if section is not None: # The empty <native> selects the whole configuration
+            ET.SubElement(native_element, f"{{{namespaces['ns']}}}{section}")
+
+
+class JunosConf_Get_GetSection_Filter(GetFilter):
+    def __init__(self, section):
+        self.filter_xml = loadTemplate(SYSTEM_YANG_DIR + "junos-conf_get_get-section.xml")
+        namespaces = {'nc': 'urn:ietf:params:xml:ns:netconf:base:1.0'} # The <configuration> element inherits the NETCONF namespace
+
+        configuration_element = self.filter_xml.find(".//nc:configuration", namespaces)
+        if section is not None: # The empty <configuration> selects the whole configuration
+            ET.SubElement(configuration_element, f"{{{namespaces['nc']}}}{section}")
 
 
 class CiscoIOSXENative_Editconfig_EditHostname_Filter(EditconfigFilter):
     def __init__(self, new_hostname):
-        self.filter_xml = ET.parse(SYSTEM_YANG_DIR + "Cisco-IOS-XE-native_edit-config_edit-hostname.xml")
+        self.filter_xml = loadTemplate(SYSTEM_YANG_DIR + "Cisco-IOS-XE-native_edit-config_edit-hostname.xml")
         namespaces = {'ns': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native'}
         
         hostname_element = self.filter_xml.find(".//ns:hostname", namespaces)
@@ -95,7 +159,7 @@ class CiscoIOSXENative_Editconfig_EditHostname_Filter(EditconfigFilter):
 
 class OpenconfigSystem_Editconfig_EditHostname_Filter(EditconfigFilter):
     def __init__(self, new_hostname):
-        self.filter_xml = ET.parse(SYSTEM_YANG_DIR + "openconfig-system_edit-config_edit-hostname.xml") # For Juniper, use openconfig models
+        self.filter_xml = loadTemplate(SYSTEM_YANG_DIR + "openconfig-system_edit-config_edit-hostname.xml") # For Juniper, use openconfig models
         namespaces = {'ns': 'http://openconfig.net/yang/system'}
         
         hostname_element = self.filter_xml.find(".//ns:hostname", namespaces)
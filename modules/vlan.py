@@ -6,8 +6,9 @@ import copy
 
 # Custom modules
 import utils
-from definitions import ROOT_DIR, CONFIGURATION_TARGET_DATASTORE, VLAN_YANG_DIR
-from yang.filters import EditconfigFilter, GetFilter
+import modules.netconf as netconf
+from definitions import ROOT_DIR, VLAN_YANG_DIR
+from yang.filters import EditconfigFilter, GetFilter, loadTemplate
 
 # Qt
 from PySide6.QtWidgets import (
@@ -56,7 +57,7 @@ def getVlansWithNetconf(device) -> dict:
         filter = CiscoIOSXEVlan_Get_GetVlanList_Filter()
 
         # RPC
-        rpc_reply = device.mngr.get(str(filter))
+        rpc_reply = device.mngr.get(filter.__ele__())
         rpc_reply_etree = utils.convertToEtree(rpc_reply, device.device_parameters['device_params'])
 
         # PARSE
@@ -99,7 +100,7 @@ def deleteInterfaceVlanWithNetconf(device, interfaces: dict) -> tuple:
         filter = OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter(interfaces, delete=True)
         print(filter)
         # RPC
-        rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+        rpc_reply = netconf.editNetconfConfig(device, filter)
         #rpc_reply = ""
         return(rpc_reply, filter)
 
@@ -131,7 +132,7 @@ def setInterfaceVlanWithNetconf(device, interfaces: dict) -> tuple:
         filter = OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter(interfaces, delete=False)
 
         # RPC
-        rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+        rpc_reply = netconf.editNetconfConfig(device, filter)
         return(rpc_reply, filter)
 
     if device.device_parameters['device_params'] == 'junos':
@@ -161,7 +162,7 @@ def addVlanWithNetconf(device, vlan_id, vlan_name) -> tuple:
         filter = CiscoIOSXEVlan_EditConfig_AddVlan_Filter(vlan_id, vlan_name)
 
         # RPC
-        rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+        rpc_reply = netconf.editNetconfConfig(device, filter)
         return(rpc_reply, filter)
 
     if device.device_parameters['device_params'] == 'junos':
@@ -173,7 +174,7 @@ def enableL3FunctionsWithNetconf(device) -> tuple:
         filter = CiscoIOSXENative_EditConfig_Enablel3Functions_Filter()
 
         # RPC
-        rpc_reply = device.mngr.edit_config(str(filter), target=CONFIGURATION_TARGET_DATASTORE)
+        rpc_reply = netconf.editNetconfConfig(device, filter)
         return(rpc_reply, filter)
 
     if device.device_parameters['device_params'] == 'junos':
@@ -183,20 +184,20 @@ def enableL3FunctionsWithNetconf(device) -> tuple:
 # ---------- FILTERS: ----------
 class CiscoIOSXEVlan_Get_GetVlanList_Filter(GetFilter):
     def __init__(self):
-        self.filter_xml = ET.parse(VLAN_YANG_DIR + "Cisco-IOS-XE-vlan_get_get-vlan-list.xml")
+        self.filter_xml = loadTemplate(VLAN_YANG_DIR + "Cisco-IOS-XE-vlan_get_get-vlan-list.xml")
 
 
 class OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter(EditconfigFilter):
     def __init__(self, interfaces: dict, delete=False):
-        self.filter_xml = ET.parse(VLAN_YANG_DIR + "openconfig-interfaces_editconfig_configure-interface-vlan.xml")
+        self.filter_xml = loadTemplate(VLAN_YANG_DIR + "openconfig-interfaces_editconfig_configure-interface-vlan.xml")
         self.namespaces = {"oc-intf": "http://openconfig.net/yang/interfaces"}
+        self.interfaces_element = self.filter_xml.find(".//oc-intf:interfaces", self.namespaces) # Looked up only once, not for every added interface
 
         for interface_name, interface_data in interfaces.items():
             self._addInterface(interface_name, interface_data, delete)
 
     def _addInterface(self, interface_name, interface_data, delete):
-        interfaces_element = self.filter_xml.find(".//oc-intf:interfaces", self.namespaces)
-        interface_element = ET.SubElement(interfaces_element, "interface")
+        interface_element = ET.SubElement(self.interfaces_element, "interface")
         name_element = ET.SubElement(interface_element, "name").text = interface_name
         ethernet_element = ET.SubElement(interface_element, "ethernet", xmlns="http://openconfig.net/yang/interfaces/ethernet")
         if delete:
@@ -226,7 +227,7 @@ class OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter(EditconfigFi
 
 class CiscoIOSXEVlan_EditConfig_AddVlan_Filter(EditconfigFilter):
     def __init__(self, vlan_id, vlan_name):
-        self.filter_xml = ET.parse(VLAN_YANG_DIR + "Cisco-IOS-XE-vlan_editconfig_add-vlan.xml")
+        self.filter_xml = loadTemplate(VLAN_YANG_DIR + "Cisco-IOS-XE-vlan_editconfig_add-vlan.xml")
         self.namespaces = {"native": "http://cisco.com/ns/yang/Cisco-IOS-XE-native",
                            "vlan": "http://cisco.com/ns/yang/Cisco-IOS-XE-vlan"}
         
@@ -239,7 +240,7 @@ class CiscoIOSXEVlan_EditConfig_AddVlan_Filter(EditconfigFilter):
 
 class CiscoIOSXENative_EditConfig_Enablel3Functions_Filter(EditconfigFilter):
     def __init__(self):
-        self.filter_xml = ET.parse(VLAN_YANG_DIR + "Cisco-IOS-XE-native_editconfig_enable-l3-functions.xml")
+        self.filter_xml = loadTemplate(VLAN_YANG_DIR + "Cisco-IOS-XE-native_editconfig_enable-l3-functions.xml")
 
 
 # ---------- QT: ----------
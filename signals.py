@@ -3,15 +3,27 @@ from PySide6.QtCore import QObject, Signal
 
 class SignalManager(QObject):
     # Emited when a pending change is added to the device:
-    #   (helper.py - "helper.addPendingChange").
+    #   (helper.py - "helper.addPendingChange", devices.py - "device.replayPendingChanges").
     # Connects to function that adds the change to the pending changes table:
     #   (main.py - pendingChangesDockWidget.addPendingChangeToTable).
-    pendingChangeAdded = Signal(object, str, str, str) # (device_id, pending_change_name, rpc_reply, filter)
+    pendingChangeAdded = Signal(object) # (record) - journal.PendingChangeRecord
+
+    # Emited when the device is brought up and the pending change journal has changes of the device, left by an earlier run of the application:
+    #   (devices.py - "device.finishBringUp").
+    # Connects to function that offers the replay of the changes:
+    #   (main.py - pendingChangesDockWidget.addReplayableDevice).
+    pendingChangeJournalFound = Signal(object, int) # (device_id, number of the changes)
 
     # Emited when the device no longer has any pending changes - either by discarding or by commiting them:
-    #   (devices.py - "device.discardChanges", "device.commitChanges").
+    #   (devices.py - "device.finishDiscard", "device.finishCommit", "device.finishCancelCommit").
     # Connects to function that clears the pending changes for the device from the pending changes table:
     #   (main.py - pendingChangesDockWidget.clearPendingChangesFromTable).
     deviceNoLongerHasPendingChanges = Signal(object)
 
+    # Emited when the lifecycle state of the device changes (connecting -> inventorying -> ready / failed) - also from the worker threads:
+    #   (devices.py - "device._setState").
+    # Connects to function that refreshes the state badge of the device on the canvas (always runs in the GUI thread):
+    #   (devices.py - "device.refreshStateBadge").
+    deviceStateChanged = Signal(object) # (device)
+
 signal_manager = SignalManager()
\ No newline at end of file
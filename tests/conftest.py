@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The tests import the application modules from the root of the repository, the same as main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The modules import PySide6 - no display is needed for the tests
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
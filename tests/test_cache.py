@@ -0,0 +1,74 @@
+import cache
+from cache import SnapshotCache
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return(self.now)
+
+def test_data_are_served_from_the_cache_until_they_expire(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    snapshot_cache = SnapshotCache(ttl=10)
+    loads = []
+
+    def load():
+        loads.append(clock.now)
+        return({"hostname": f"R{len(loads)}"})
+
+    assert snapshot_cache.get("hostname", load) == {"hostname": "R1"}
+    clock.now += 5
+    assert snapshot_cache.get("hostname", load) == {"hostname": "R1"}
+    clock.now += 6
+    assert snapshot_cache.get("hostname", load) == {"hostname": "R2"}
+    assert len(loads) == 2
+
+def test_force_bypasses_the_cache():
+    snapshot_cache = SnapshotCache(ttl=60)
+    snapshot_cache.get("hostname", lambda: "R1")
+
+    assert snapshot_cache.get("hostname", lambda: "R2", force=True) == "R2"
+    assert snapshot_cache.peek("hostname") == "R2"
+
+def test_callers_get_their_own_copy():
+    snapshot_cache = SnapshotCache(ttl=60)
+    data = snapshot_cache.get("interfaces", lambda: {"GigabitEthernet1": {"description": "uplink"}})
+    data["GigabitEthernet1"]["description"] = "changed"
+
+    assert snapshot_cache.peek("interfaces") == {"GigabitEthernet1": {"description": "uplink"}}
+
+def test_failed_retrieval_is_not_cached():
+    snapshot_cache = SnapshotCache(ttl=60)
+
+    assert snapshot_cache.get("hostname", lambda: None) is None
+    assert snapshot_cache.peek("hostname") is None
+
+def test_invalidate_drops_the_specified_keys_or_everything():
+    snapshot_cache = SnapshotCache(ttl=60)
+    snapshot_cache.get("hostname", lambda: "R1")
+    snapshot_cache.get("interfaces", lambda: {})
+
+    snapshot_cache.invalidate("hostname")
+    assert snapshot_cache.peek("hostname") is None
+    assert snapshot_cache.peek("interfaces") == {}
+
+    snapshot_cache.invalidate()
+    assert snapshot_cache.peek("interfaces") is None
+
+def test_data_retrieved_across_an_invalidation_are_not_stored():
+    snapshot_cache = SnapshotCache(ttl=60)
+
+    def load():
+        snapshot_cache.invalidate() # e.g. a commit finished, while the data were being retrieved
+        return("stale")
+
+    assert snapshot_cache.get("hostname", load) == "stale"
+    assert snapshot_cache.peek("hostname") is None
+
+def test_zero_ttl_disables_the_cache():
+    snapshot_cache = SnapshotCache(ttl=0)
+    snapshot_cache.get("hostname", lambda: "R1")
+
+    assert snapshot_cache.peek("hostname") is None
@@ -0,0 +1,172 @@
+import ipaddress
+from lxml import etree as ET
+
+from yang.filters import EditconfigBatch, listEntryKey
+from modules.ospf import CiscoIOSXEOspf_Editconfig_ConfigureOspf_Filter, OpenconfigNetworkInstance_Editconfig_ConfigureOspf_Filter
+from modules.vlan import CiscoIOSXEVlan_EditConfig_AddVlan_Filter, OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter
+from modules.interfaces import OpenconfigInterfaces_Editconfig_EditIpaddress_Filter
+
+class XmlFilter:
+    """Edit-config filter given directly by its XML (the <config> element)."""
+
+    def __init__(self, xml) -> None:
+        self.element = ET.fromstring(xml)
+
+    def __ele__(self):
+        return(self.element)
+
+def stage(*filters) -> list:
+    """Stages the filters in a new batch, returns the merged <config> trees (one per edit-config)."""
+
+    batch = EditconfigBatch()
+    for filter in filters:
+        batch.add(filter)
+    assert len(batch) == len(filters)
+    return([config for config, _ in batch.take()])
+
+def localNames(elements) -> list:
+    return([ET.QName(element).localname for element in elements])
+
+def ciscoOspf(networks, passive_interfaces=[]):
+    return(CiscoIOSXEOspf_Editconfig_ConfigureOspf_Filter("0", None, None, None, None, passive_interfaces, {interface: [ipaddress.ip_network(network)] for interface, network in networks.items()}))
+
+# ---------- OSPF: ----------
+def test_cisco_ospf_networks_are_merged_into_one_process():
+    configs = stage(ciscoOspf({"GigabitEthernet1": "10.0.1.0/24"}), ciscoOspf({"GigabitEthernet2": "10.0.2.0/24"}))
+
+    assert len(configs) == 1
+    process_ids = configs[0].findall(".//{*}process-id")
+    assert len(process_ids) == 1
+    assert [network.findtext("ip") for network in process_ids[0].findall("network")] == ["10.0.1.0", "10.0.2.0"]
+
+def test_cisco_ospf_network_wildcard_is_part_of_the_key():
+    configs = stage(ciscoOspf({"GigabitEthernet1": "10.0.0.0/24"}), ciscoOspf({"GigabitEthernet1": "10.0.0.0/16"}))
+
+    assert len(configs) == 1
+    networks = configs[0].findall(".//{*}process-id/network")
+    assert [network.findtext("wildcard") for network in networks] == ["0.0.0.255", "0.0.255.255"]
+
+def test_openconfig_ospf_interfaces_are_merged_into_one_area():
+    configs = stage(
+        OpenconfigNetworkInstance_Editconfig_ConfigureOspf_Filter("0", None, None, None, None, [], {"ge-0/0/1": []}),
+        OpenconfigNetworkInstance_Editconfig_ConfigureOspf_Filter("0", None, None, None, None, [], {"ge-0/0/2": []}),
+    )
+
+    assert len(configs) == 1
+    areas = configs[0].findall(".//{*}area")
+    assert len(areas) == 1
+    assert [interface.findtext("id") for interface in areas[0].find("{*}interfaces")] == ["ge-0/0/1", "ge-0/0/2"]
+
+def test_openconfig_ospf_different_areas_are_separate_entries():
+    configs = stage(
+        OpenconfigNetworkInstance_Editconfig_ConfigureOspf_Filter("0", None, None, None, None, [], {"ge-0/0/1": []}),
+        OpenconfigNetworkInstance_Editconfig_ConfigureOspf_Filter("1", None, None, None, None, [], {"ge-0/0/2": []}),
+    )
+
+    assert len(configs) == 1
+    assert [area.findtext("{*}identifier") for area in configs[0].findall(".//{*}area")] == ["0", "1"]
+
+# ---------- VLAN: ----------
+def test_vlans_are_merged_into_one_vlan_container():
+    configs = stage(CiscoIOSXEVlan_EditConfig_AddVlan_Filter("10", "USERS"), CiscoIOSXEVlan_EditConfig_AddVlan_Filter("20", "VOICE"))
+
+    assert len(configs) == 1
+    vlan = configs[0].find(".//{*}vlan")
+    assert localNames(vlan) == ["configuration", "vlan-list", "configuration", "vlan-list"]
+    assert [entry.findtext("{*}id") for entry in vlan.findall("{*}vlan-list")] == ["10", "20"]
+
+def test_same_vlan_renamed_starts_a_new_batch():
+    configs = stage(CiscoIOSXEVlan_EditConfig_AddVlan_Filter("10", "USERS"), CiscoIOSXEVlan_EditConfig_AddVlan_Filter("10", "GUESTS"))
+
+    assert len(configs) == 2
+
+def test_interface_vlans_are_merged():
+    configs = stage(
+        OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter({"GigabitEthernet1": {"vlan_data": {"port_mode": "access", "vlan": ["10"]}}}),
+        OpenconfigInterfaces_EditConfig_ConfigureInterfaceVlan_Filter({"GigabitEthernet2": {"vlan_data": {"port_mode": "trunk", "vlan": ["10", "20"]}}}),
+    )
+
+    assert len(configs) == 1
+    assert [interface.findtext("name") for interface in configs[0].findall(".//{*}interfaces/interface")] == ["GigabitEthernet1", "GigabitEthernet2"]
+
+# ---------- INTERFACES: ----------
+def test_ip_addresses_of_one_interface_are_merged():
+    configs = stage(
+        OpenconfigInterfaces_Editconfig_EditIpaddress_Filter("GigabitEthernet1", 0, ipaddress.ip_interface("10.0.0.1/24")),
+        OpenconfigInterfaces_Editconfig_EditIpaddress_Filter("GigabitEthernet1", 0, ipaddress.ip_interface("10.0.1.1/24")),
+        OpenconfigInterfaces_Editconfig_EditIpaddress_Filter("GigabitEthernet2", 0, ipaddress.ip_interface("10.0.2.1/24")),
+    )
+
+    assert len(configs) == 1
+    interfaces = configs[0].findall(".//{*}interfaces/{*}interface")
+    assert [interface.findtext("{*}name") for interface in interfaces] == ["GigabitEthernet1", "GigabitEthernet2"]
+    assert [address.findtext("{*}ip") for address in interfaces[0].findall(".//{*}address")] == ["10.0.0.1", "10.0.1.1"]
+
+def test_deleted_and_added_again_ip_address_starts_a_new_batch():
+    configs = stage(
+        OpenconfigInterfaces_Editconfig_EditIpaddress_Filter("GigabitEthernet1", 0, ipaddress.ip_interface("10.0.0.1/24"), delete_ip=True),
+        OpenconfigInterfaces_Editconfig_EditIpaddress_Filter("GigabitEthernet1", 0, ipaddress.ip_interface("10.0.0.1/24")),
+    )
+
+    assert len(configs) == 2
+
+# ---------- REPEATED LIST ENTRIES: ----------
+def descriptionFilter(interface, description) -> XmlFilter:
+    return(XmlFilter(f"<config><interfaces><interface><name>{interface}</name><config><description>{description}</description></config></interface></interfaces></config>"))
+
+def test_repeated_identical_entry_is_merged():
+    configs = stage(descriptionFilter("GigabitEthernet1", "uplink"), descriptionFilter("GigabitEthernet1", "uplink"))
+
+    assert len(configs) == 1
+    assert len(configs[0].findall(".//interface")) == 1
+
+def test_repeated_entry_with_another_leaf_is_merged_into_the_entry():
+    first = XmlFilter("<config><interfaces><interface><name>GigabitEthernet1</name><config><description>uplink</description></config></interface></interfaces></config>")
+    second = XmlFilter("<config><interfaces><interface><name>GigabitEthernet1</name><config><enabled>true</enabled></config></interface></interfaces></config>")
+
+    configs = stage(first, second)
+
+    assert len(configs) == 1
+    assert [ET.QName(leaf).localname for leaf in configs[0].find(".//interface/config")] == ["description", "enabled"]
+
+def test_repeated_entry_with_a_changed_leaf_starts_a_new_batch():
+    configs = stage(
+        descriptionFilter("GigabitEthernet1", "uplink"),
+        descriptionFilter("GigabitEthernet2", "downlink"),
+        descriptionFilter("GigabitEthernet1", "changed"),
+        descriptionFilter("GigabitEthernet2", "downlink"),
+    )
+
+    # The order of the changes is kept: the changed description is sent after the first one, the following changes are staged in the new batch
+    assert len(configs) == 2
+    assert [interface.findtext("config/description") for interface in configs[0].iter("interface")] == ["uplink", "downlink"]
+    assert [interface.findtext("config/description") for interface in configs[1].iter("interface")] == ["changed", "downlink"]
+
+def test_staged_filter_is_not_modified():
+    first, second = descriptionFilter("GigabitEthernet1", "uplink"), descriptionFilter("GigabitEthernet2", "downlink")
+    stage(first, second)
+
+    assert len(first.element.findall(".//interface")) == 1
+
+# ---------- LIST ENTRIES: ----------
+def test_container_with_key_like_first_leaf_is_not_a_list_entry():
+    # <config> is a container, even though its first leaf is named like a list key - a changed leaf must not add a second <config>
+    first = XmlFilter("<config><interfaces><interface><name>1</name><config><name>A</name></config></interface></interfaces></config>")
+    second = XmlFilter("<config><interfaces><interface><name>1</name><config><name>B</name></config></interface></interfaces></config>")
+
+    configs = stage(first, second)
+
+    assert len(configs) == 2
+    assert listEntryKey(first.element.find(".//config")) is None
+
+def test_list_entry_key_contains_all_the_keys():
+    element = ET.fromstring("<policies><policy><from-zone-name>trust</from-zone-name><to-zone-name>untrust</to-zone-name><policy><name>P1</name></policy></policy></policies>")
+
+    assert listEntryKey(element[0]) == (("from-zone-name", "trust"), ("to-zone-name", "untrust"))
+    assert listEntryKey(element[0][2]) == (("name", "P1"),)
+
+def test_iosxe_interface_types_are_list_entries():
+    element = ET.fromstring("<native><interface><GigabitEthernet><name>1</name></GigabitEthernet></interface></native>")
+
+    assert listEntryKey(element[0]) is None
+    assert listEntryKey(element[0][0]) == (("name", "1"),)
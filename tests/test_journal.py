@@ -0,0 +1,98 @@
+import os
+import pytest
+from lxml import etree as ET
+
+from journal import PendingChangeJournal, targetPath
+
+class StubDevice:
+    def __init__(self, device_id, port=830) -> None:
+        self.id = device_id
+        self.device_parameters = {"address": "192.0.2.1", "port": port}
+
+class XmlFilter:
+    def __init__(self, xml) -> None:
+        self.element = ET.fromstring(xml)
+
+    def __ele__(self):
+        return(self.element)
+
+def descriptionFilter(interface, description) -> XmlFilter:
+    return(XmlFilter(f'<config><interfaces xmlns="http://openconfig.net/yang/interfaces"><interface><name>{interface}</name>'
+                     f'<config><description>{description}</description></config></interface></interfaces></config>'))
+
+@pytest.fixture
+def device():
+    return(StubDevice("R1"))
+
+def test_records_survive_a_restart(tmp_path, device):
+    journal = PendingChangeJournal(directory=str(tmp_path))
+    journal.append(device, "Description 1", filter=descriptionFilter("GigabitEthernet1", "uplink"))
+    journal.append(device, "Description 2", filter=descriptionFilter("GigabitEthernet2", "downlink"))
+
+    leftovers = PendingChangeJournal(directory=str(tmp_path)).leftovers(device)
+
+    assert [record.operation for record in leftovers] == ["Description 1", "Description 2"]
+    assert leftovers[0].__ele__().findtext(".//{*}description") == "uplink"
+    assert leftovers[0].reply_status == "staged"
+
+def test_truncated_last_line_is_skipped(tmp_path, device):
+    journal = PendingChangeJournal(directory=str(tmp_path))
+    journal.append(device, "Description 1", filter=descriptionFilter("GigabitEthernet1", "uplink"))
+    journal.append(device, "Description 2", filter=descriptionFilter("GigabitEthernet2", "downlink"))
+    path = os.path.join(str(tmp_path), os.listdir(str(tmp_path))[0])
+    with open(path, "rb+") as file: # The application crashed, while the last record was being written
+        file.truncate(os.path.getsize(path) - 20)
+
+    leftovers = PendingChangeJournal(directory=str(tmp_path)).leftovers(device)
+
+    assert [record.operation for record in leftovers] == ["Description 1"]
+
+def test_clear_keeps_the_leftovers(tmp_path, device):
+    PendingChangeJournal(directory=str(tmp_path)).append(device, "Old change", filter=descriptionFilter("GigabitEthernet1", "old"))
+    journal = PendingChangeJournal(directory=str(tmp_path))
+    journal.append(device, "New change", filter=descriptionFilter("GigabitEthernet2", "new"))
+
+    journal.clear(device)
+
+    assert journal.records(device) == []
+    assert [record.operation for record in PendingChangeJournal(directory=str(tmp_path)).leftovers(device)] == ["Old change"]
+
+def test_taken_leftovers_belong_to_the_current_device(tmp_path):
+    PendingChangeJournal(directory=str(tmp_path)).append(StubDevice("R1"), "Change", filter=descriptionFilter("GigabitEthernet1", "x"))
+    journal = PendingChangeJournal(directory=str(tmp_path))
+    device = StubDevice("R7") # Same address and port, other ID after the restart
+
+    records = journal.takeLeftovers(device)
+
+    assert [record.device_id for record in records] == ["R7"]
+    assert journal.leftovers(device) == []
+    assert journal.records(device) == records
+
+def test_discarded_leftovers_remove_the_file(tmp_path, device):
+    PendingChangeJournal(directory=str(tmp_path)).append(device, "Change", filter=descriptionFilter("GigabitEthernet1", "x"))
+
+    PendingChangeJournal(directory=str(tmp_path)).discardLeftovers(device)
+
+    assert os.listdir(str(tmp_path)) == []
+
+def test_devices_are_kept_apart(tmp_path):
+    journal = PendingChangeJournal(directory=str(tmp_path))
+    journal.append(StubDevice("R1", port=830), "Change 1", filter=descriptionFilter("GigabitEthernet1", "x"))
+    journal.append(StubDevice("R2", port=831), "Change 2", filter=descriptionFilter("GigabitEthernet1", "y"))
+
+    assert [record.operation for record in PendingChangeJournal(directory=str(tmp_path)).leftovers(StubDevice("R2", port=831))] == ["Change 2"]
+
+@pytest.mark.parametrize("xml, expected", [
+    ('<config><interfaces><interface><name>GigabitEthernet1</name><config><description>x</description></config></interface></interfaces></config>',
+     "/interfaces/interface[name=GigabitEthernet1]/config/description"),
+    ('<config><native><interface><GigabitEthernet><name>1</name><ip/></GigabitEthernet></interface></native></config>',
+     "/native/interface/GigabitEthernet[name=1]/ip"),
+    ('<config><native><router><router-ospf><ospf><process-id><id>1</id><network><ip>10.0.0.0</ip><wildcard>0.0.0.255</wildcard><area>0</area></network></process-id></ospf></router-ospf></router></native></config>',
+     "/native/router/router-ospf/ospf/process-id[id=1]/network[ip=10.0.0.0,wildcard=0.0.0.255]/area"),
+    ('<config><native><hostname>R1</hostname><ip/></native></config>', "/native"),
+])
+def test_target_path(xml, expected):
+    assert targetPath(ET.fromstring(xml)) == expected
+
+def test_target_path_without_a_filter():
+    assert targetPath(None) == ""
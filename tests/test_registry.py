@@ -0,0 +1,105 @@
+import pytest
+
+from devices import DeviceRegistry
+
+class StubDevice:
+    def __init__(self, device_id, hostname, vendor="iosxe", port=830, ospf=True, ipsec=True, vlan=False) -> None:
+        self.id = device_id
+        self.hostname = hostname
+        self.device_parameters = {"address": "192.0.2.1", "port": port, "device_params": vendor}
+        self.is_ospf_capable = ospf
+        self.is_ipsec_capable = ipsec
+        self.is_vlan_capable = vlan
+
+def register(registry, *devices) -> None:
+    for device in devices:
+        registry.place(device)
+        registry.add(device)
+
+@pytest.fixture
+def registry():
+    return(DeviceRegistry())
+
+def test_devices_are_found_by_every_index(registry):
+    router, switch, junos = StubDevice("R1", "core", port=830), StubDevice("SW1", "access", port=831, vlan=True), StubDevice("R2", "edge", vendor="junos", port=832)
+    register(registry, router, switch, junos)
+
+    assert registry.get("R1") is router
+    assert registry.getByAddress("192.0.2.1", 831) is switch
+    assert registry.find(hostname="edge") == [junos]
+    assert registry.find(vendor="iosxe", capability="vlan") == [switch]
+    assert len(registry.find()) == 3
+
+def test_rename_moves_the_device_in_the_hostname_index(registry):
+    router, other = StubDevice("R1", "core"), StubDevice("R2", "core", port=831)
+    register(registry, router, other)
+
+    router.hostname = "core-new"
+    registry.rename(router, "core")
+
+    assert registry.find(hostname="core") == [other]
+    assert registry.find(hostname="core-new") == [router]
+
+def test_rename_drops_the_empty_hostname(registry):
+    router = StubDevice("R1", "core")
+    register(registry, router)
+
+    router.hostname = "core-new"
+    registry.rename(router, "core")
+
+    assert "core" not in registry.by_hostname
+
+def test_update_capabilities_moves_the_device_in_the_capability_index(registry):
+    switch = StubDevice("SW1", "access", ospf=False, ipsec=False, vlan=True)
+    register(registry, switch)
+
+    switch.is_ospf_capable = True
+    registry.updateCapabilities(switch)
+
+    assert registry.find(capability="ospf") == [switch]
+    assert registry.find(capability="vlan") == [switch]
+
+    switch.is_vlan_capable = False
+    registry.updateCapabilities(switch)
+
+    assert registry.find(capability="vlan") == []
+
+def test_rename_of_a_device_not_brought_up_is_ignored(registry):
+    router = StubDevice("R1", "core")
+    registry.place(router)
+
+    router.hostname = "core-new"
+    registry.rename(router, "core")
+
+    assert registry.find(hostname="core-new") == []
+
+def test_remove_clears_every_index(registry):
+    router, other = StubDevice("R1", "core", port=830), StubDevice("R2", "core", port=831)
+    register(registry, router, other)
+
+    registry.remove(router)
+
+    assert registry.get("R1") is None
+    assert registry.getByAddress("192.0.2.1", 830) is None
+    assert registry.find(hostname="core") == [other]
+    assert registry.find(vendor="iosxe") == [other]
+    assert registry.find(capability="ospf") == [other]
+    assert len(registry) == 1
+
+def test_remove_of_a_device_not_brought_up(registry):
+    router = StubDevice("R1", "core")
+    registry.place(router)
+
+    registry.remove(router)
+
+    assert registry.getByAddress("192.0.2.1", 830) is None
+    assert len(registry) == 0
+
+def test_remove_keeps_the_address_of_another_device(registry):
+    # A duplicate placed on the same address and port replaces the first one in the address index, removing the first one must keep it
+    first, duplicate = StubDevice("R1", "core"), StubDevice("R2", "core")
+    register(registry, first, duplicate)
+
+    registry.remove(first)
+
+    assert registry.getByAddress("192.0.2.1", 830) is duplicate
@@ -0,0 +1,67 @@
+import pytest
+
+from modules.routing import RouteStore, RouteIndex
+
+ROUTES = [
+    # table, prefix, next_hop, interface, protocol, preference, active
+    ("inet.0", "0.0.0.0/0", "203.0.113.1", "ge-0/0/0.0", "Static", "5", True),
+    ("inet.0", "10.0.0.0/8", "10.255.0.1", "ge-0/0/1.0", "OSPF", "10", True),
+    ("inet.0", "10.1.0.0/16", "10.255.0.2", "ge-0/0/2.0", "OSPF", "10", True),
+    ("inet.0", "10.1.2.0/24", "10.255.0.3", "ge-0/0/3.0", "BGP", "170", True),
+    ("inet.0", "10.1.2.128/25", "10.255.0.4", "ge-0/0/4.0", "BGP", "170", True),
+    ("mgmt.inet.0", "10.0.0.0/8", "192.0.2.1", "fxp0.0", "Static", "5", True),
+    ("inet6.0", "2001:db8::/32", "fe80::1", "ge-0/0/1.0", "Static", "5", True),
+    ("inet6.0", "2001:db8:1::/48", "fe80::2", "ge-0/0/2.0", "OSPF3", "10", True),
+]
+
+@pytest.fixture
+def index():
+    routes = RouteStore()
+    routes.extend(ROUTES)
+    return(RouteIndex(routes))
+
+def prefixes(index, rows) -> list:
+    return([(index.routes.tables[row], index.routes.prefixes[row]) for row in rows])
+
+@pytest.mark.parametrize("address, expected", [
+    ("10.1.2.200", "10.1.2.128/25"),
+    ("10.1.2.1", "10.1.2.0/24"),
+    ("10.1.3.1", "10.1.0.0/16"),
+    ("10.2.0.1", "10.0.0.0/8"),
+    ("192.0.2.55", "0.0.0.0/0"),
+])
+def test_longest_prefix_match(index, address, expected):
+    assert ("inet.0", expected) in prefixes(index, index.search("Longest prefix match", address))
+
+def test_longest_prefix_match_returns_the_winner_of_every_table(index):
+    assert sorted(prefixes(index, index.search("Longest prefix match", "10.2.0.1"))) == [("inet.0", "10.0.0.0/8"), ("mgmt.inet.0", "10.0.0.0/8")]
+
+def test_longest_prefix_match_returns_only_the_active_routes():
+    routes = RouteStore()
+    routes.extend(ROUTES + [("inet.0", "10.1.2.0/24", "10.255.0.9", "ge-0/0/9.0", "Static", "5", False)])
+    index = RouteIndex(routes)
+    assert [(routes.tables[row], routes.next_hops[row]) for row in index.search("Longest prefix match", "10.1.2.1")] == [("inet.0", "10.255.0.3"), ("mgmt.inet.0", "192.0.2.1")]
+
+def test_longest_prefix_match_falls_back_to_the_inactive_routes():
+    routes = RouteStore()
+    routes.extend([("inet.0", "10.0.0.0/8", "10.255.0.1", "ge-0/0/1.0", "OSPF", "10", False), ("inet.0", "10.0.0.0/8", "10.255.0.2", "ge-0/0/2.0", "BGP", "170", False)])
+    index = RouteIndex(routes)
+    assert [routes.next_hops[row] for row in index.search("Longest prefix match", "10.2.0.1")] == ["10.255.0.1", "10.255.0.2"]
+
+def test_longest_prefix_match_ipv6(index):
+    assert prefixes(index, index.search("Longest prefix match", "2001:db8:1::1")) == [("inet6.0", "2001:db8:1::/48")]
+    assert prefixes(index, index.search("Longest prefix match", "2001:db8:2::1")) == [("inet6.0", "2001:db8::/32")]
+
+def test_longest_prefix_match_without_a_matching_route(index):
+    assert index.search("Longest prefix match", "2001:db9::1") == []
+
+@pytest.mark.parametrize("query", ["10.1.2.0/24", "not-an-address"])
+def test_longest_prefix_match_rejects_invalid_addresses(index, query):
+    with pytest.raises(ValueError):
+        index.search("Longest prefix match", query)
+
+def test_prefix_search_returns_the_more_specifics(index):
+    assert sorted(prefixes(index, index.search("Prefix", "10.1.0.0/16"))) == [("inet.0", "10.1.0.0/16"), ("inet.0", "10.1.2.0/24"), ("inet.0", "10.1.2.128/25")]
+
+def test_interface_search_matches_the_units(index):
+    assert prefixes(index, index.search("Interface", "ge-0/0/1")) == [("inet.0", "10.0.0.0/8"), ("inet6.0", "2001:db8::/32")]
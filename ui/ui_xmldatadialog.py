@@ -17,8 +17,8 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
     QPalette, QPixmap, QRadialGradient, QTransform)
 from PySide6.QtWidgets import (QAbstractButton, QApplication, QDialog, QDialogButtonBox,
     QFrame, QHBoxLayout, QHeaderView, QLabel,
-    QPushButton, QSizePolicy, QTreeWidget, QTreeWidgetItem,
-    QVBoxLayout, QWidget)
+    QPushButton, QSizePolicy, QTreeView, QVBoxLayout,
+    QWidget)
 
 class Ui_XMLDataDialog(object):
     def setupUi(self, XMLDataDialog):
@@ -65,8 +65,9 @@ class Ui_XMLDataDialog(object):
 
         self.verticalLayout.addLayout(self.top_laout)
 
-        self.data_tree = QTreeWidget(XMLDataDialog)
+        self.data_tree = QTreeView(XMLDataDialog)
         self.data_tree.setObjectName(u"data_tree")
+        self.data_tree.setUniformRowHeights(True)
 
         self.verticalLayout.addWidget(self.data_tree)
 
@@ -88,7 +89,5 @@ class Ui_XMLDataDialog(object):
         self.refresh_button.setText(QCoreApplication.translate("XMLDataDialog", u"Refresh", None))
         self.expand_button.setText(QCoreApplication.translate("XMLDataDialog", u"Expand all", None))
         self.collapse_button.setText(QCoreApplication.translate("XMLDataDialog", u"Collapse all", None))
-        ___qtreewidgetitem = self.data_tree.headerItem()
-        ___qtreewidgetitem.setText(0, QCoreApplication.translate("XMLDataDialog", u"Element", None));
     # retranslateUi
 
@@ -1,13 +1,24 @@
 # ---------- IMPORTS: ----------
 # Standard library
+import re
+import sys
+import copy
+import time
 from lxml import etree as ET
 from datetime import datetime
+from ncclient.xml_ import NCElement
 
 # Custom modules
 from signals import signal_manager
+from metrics import rpc_metrics
+from journal import pending_change_journal
 
 # Qt
-from PySide6.QtWidgets import QTreeWidgetItem
+from PySide6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+# Default namespace declaration placed right after the tag name (<interfaces xmlns="...">) - the usual form in the NETCONF replies.
+# Declarations in other places are handled by removeXmlns() after parsing. Text content cannot contain a raw "<", so only real tags are matched.
+_DEFAULT_XMLNS_DECLARATION = re.compile(rb"""(<[^\s<>!?/]+)\s+xmlns\s*=\s*(?:"[^"]*"|'[^']*')""")
 
 # ---------- HELPER FUNCTIONS: ----------
 def clearLayout(layout) -> None:
@@ -31,17 +42,16 @@ def clearLayout(layout) -> None:
 
 def removeXmlns(element) -> None:
     """
-    Removes all namespace declarations from an XML element and its children.
+    Removes all namespaces from an XML element and all its descendants (in place). 
+    Only the elements, which still have a namespace, are visited (XPath) - the tree is not walked recursively, so deep replies cannot hit the recursion limit.
 
     Args:
-        element (xml.etree.ElementTree.Element): The XML element from which to remove namespaces.
+        element (lxml.etree._Element): The XML element from which to remove namespaces.
     """
 
-    if element.tag.startswith('{'):  # If the tag has a namespace
-        element.tag = element.tag.split('}', 1)[-1]  # Remove namespace from the tag
-        # Recursively apply to child elements
-        for child in element:
-            removeXmlns(child)
+    for namespaced_element in element.xpath('descendant-or-self::*[namespace-uri() != ""]'):
+        namespaced_element.tag = ET.QName(namespaced_element).localname
+    ET.cleanup_namespaces(element) # Remove the now unused namespace declarations
 
 def convertToEtree(rpc_reply, device_type, strip_namespaces=True) -> ET.Element:
     """
@@ -55,8 +65,12 @@ def convertToEtree(rpc_reply, device_type, strip_namespaces=True) -> ET.Element:
         xml.etree.ElementTree.Element: The converted ElementTree object.
     
     Notes:
-    - For Cisco IOS XE devices, the RPC reply is converted from XML to bytes.
-    - For Juniper devices, the RPC reply is converted from NCElement to string to bytes.
+    - For Cisco IOS XE devices, the raw reply is parsed once. The default namespace declarations are dropped from the raw bytes
+      before parsing (setting the tag of every element afterwards is several times slower than the parsing itself), the rest of the namespaces
+      (prefixed elements) is stripped by removeXmlns().
+    - For Juniper devices, ncclient has already parsed the reply and stripped the namespaces (NCElement), so its tree is reused as is.
+      The returned tree is shared with the RPC reply object and must not be modified.
+    - The time spent parsing the reply is recorded in the RPC metrics (see metrics.RpcMetrics.recordParseTime).
     - All XML Namespace declarations are stripped for easier parsing.
     References:
     - Issue: https://github.com/ncclient/ncclient/issues/593
@@ -65,20 +79,26 @@ def convertToEtree(rpc_reply, device_type, strip_namespaces=True) -> ET.Element:
     # Juniper returns <class 'ncclient.xml_.NCElement'> object, while Cisco returns <class 'ncclient.operations.retrieve.GetReply'>
     # Issue: https://github.com/ncclient/ncclient/issues/593
     # After the issue is resolved, this part can be simplified
+    if device_type == "junos" and isinstance(rpc_reply, NCElement):
+        # NCElement -> ETREE (the namespace-free tree parsed by ncclient)
+        return(rpc_reply.find("."))
+
+    start = time.perf_counter()
     if device_type == "iosxe":
         # RPC REPLY -> XML -> BYTES
-        rpc_reply_xml = rpc_reply.xml
-        rpc_reply_bytes = rpc_reply_xml.encode('utf-8')
-    elif device_type == "junos":
-        # NCElement -> STRING -> BYTES
-        rpc_reply_str = str(rpc_reply)
-        rpc_reply_bytes = rpc_reply_str.encode('utf-8')
+        rpc_reply_bytes = rpc_reply.xml.encode('utf-8')
+    else:
+        # STRING -> BYTES
+        rpc_reply_bytes = str(rpc_reply).encode('utf-8')
 
     # BYTES -> ETREE
+    if strip_namespaces:
+        rpc_reply_bytes = _DEFAULT_XMLNS_DECLARATION.sub(rb"\1", rpc_reply_bytes)
     rpc_reply_etree = ET.fromstring(rpc_reply_bytes)
     if strip_namespaces:
-        removeXmlns(rpc_reply_etree) # Strip all XML Namespace declarations for easier parsing
+        removeXmlns(rpc_reply_etree) # Strip the remaining XML Namespaces (prefixed elements) for easier parsing
 
+    rpc_metrics.recordParseTime(rpc_reply, time.perf_counter() - start)
     return(rpc_reply_etree) # returns the root node (https://lxml.de/apidoc/lxml.etree.html#lxml.etree.fromstring)
 
 def prettyXml(input) -> str:
@@ -104,9 +124,63 @@ def prettyXml(input) -> str:
 
     return (xml_pretty)
 
+def rawXml(source):
+    """
+    Returns the serialized XML of the RPC reply, filter or element, without formatting it. The RPC replies are not serialized again -
+    Cisco replies (RPCReply) keep the raw XML, Juniper replies (NCElement) keep the RPCReply they were parsed from.
+    
+    Args:
+        source: RPC reply (RPCReply or NCElement), filter (GetFilter, EditconfigFilter, ...), lxml element, str or bytes.
+    
+    Returns:
+        str or bytes: The serialized XML.
+    """
+
+    if isinstance(source, (str, bytes)):
+        return(source)
+    if isinstance(source, NCElement):
+        source = source._NCElement__result # Issue: https://github.com/ncclient/ncclient/issues/593
+    if isinstance(getattr(source, "xml", None), str):
+        return(source.xml)
+    if hasattr(source, "__ele__"):
+        return(ET.tostring(source.__ele__()))
+    if isinstance(source, ET._Element):
+        return(ET.tostring(source))
+    return(str(source))
+
+class LazyXml:
+    """
+    RPC reply or filter kept in its raw (serialized) form and pretty-printed only when it is displayed - str() formats it (once).
+    Creating it is cheap, so the RPC replies can be handed to the console, even when nobody looks at them.
+    Attributes:
+        raw (str or bytes): The serialized XML.
+    """
+
+    def __init__(self, source) -> "LazyXml":
+        self.raw = rawXml(source)
+        self._pretty = None
+
+    def __len__(self) -> int:
+        return(len(self.raw))
+
+    def __str__(self) -> str:
+        if self._pretty is None:
+            try:
+                self._pretty = prettyXml(self.raw)
+            except ValueError: # Not an XML (e.g. a message instead of the reply) - shown as is
+                self._pretty = self.rawText()
+        return(self._pretty)
+
+    def rawText(self) -> str:
+        """Returns the XML as it was received (unformatted)."""
+
+        return(self.raw.decode() if isinstance(self.raw, bytes) else self.raw)
+
 def printRpc(rpc_reply, action, device: object) -> None:
     """
     Prints the RPC reply in a formatted manner along with a timestamp, action, and device information.
+    When the output is redirected to the integrated console, the reply is handed over unformatted (LazyXml)
+    and it is formatted by the console only when it is displayed.
     
     Args:
         rpc_reply (str): The RPC reply to be printed.
@@ -126,13 +200,17 @@ def printRpc(rpc_reply, action, device: object) -> None:
 
 
     timestamp = datetime.now().strftime("%H:%M:%S")
-    rpc_reply_pretty = prettyXml(rpc_reply)
-    message = (
+    header = (
         f"{timestamp}\n"
-        f"RPC reply for action: \"{action}\" on device with ID: {id} (Hostname: {hostname})\n"
-        f"{rpc_reply_pretty}"
+        f"RPC reply for action: \"{action}\" on device with ID: {id} (Hostname: {hostname})"
     )
-    print(message)
+    rpc_reply = LazyXml(rpc_reply)
+
+    write_rpc = getattr(sys.stdout, "writeRpc", None) # Integrated console (see main.ConsoleStream)
+    if write_rpc is not None:
+        write_rpc(header, rpc_reply)
+    else:
+        print(f"{header}\n{rpc_reply}")
 
 def printGeneral(message) -> None:
     """
@@ -151,7 +229,7 @@ def printGeneral(message) -> None:
 
 def addPendingChange(device, pending_change_name, rpc_reply=None, filter=None) -> None:
     """
-    This function marks the device as having pending changes and emits a signal
+    This function marks the device as having pending changes, records the change in the pending change journal and emits a signal
     to notify that a pending change has been added. The signal is then used to add the pending change to the PendingChangesWidget.
     
     Args:
@@ -159,9 +237,24 @@ def addPendingChange(device, pending_change_name, rpc_reply=None, filter=None) -
         pending_change (Any): The pending change to be added to the device.
     """
 
-    signal_manager.pendingChangeAdded.emit(device.id, pending_change_name, prettyXml(rpc_reply), prettyXml(filter))
+    # Only the compact record is kept (compressed filter, status of the reply), the table shows the records of the journal
+    record = pending_change_journal.append(device, pending_change_name, rpc_reply, filter)
+    signal_manager.pendingChangeAdded.emit(record)
     device.has_pending_changes = True
 
+def clearPendingChanges(device) -> None:
+    """
+    Marks the device as having no pending changes (they have been committed or discarded), clears them from the pending change journal
+    and emits a signal to notify that the pending changes of the device should be removed from the PendingChangesWidget.
+    
+    Args:
+        device (Device): The device object, whose pending changes are to be cleared.
+    """
+
+    pending_change_journal.clear(device)
+    device.has_pending_changes = False
+    signal_manager.deviceNoLongerHasPendingChanges.emit(device.id)
+
 def getBgColorFromFlag(flag) -> str:
     if flag == "commited":
         return "white"
@@ -178,36 +271,194 @@ def getTooltipFromFlag(flag) -> str:
     elif flag == "deleted":
         return "This configuration has been set for deletion. The deletion will be put into effect after commit."
     
-def populateTreeWidget(tree_widget, xml_root) -> None:
+def populateTreeView(tree_view, xml_root) -> None:
         """
-        Populates the QTreeWidget with items from the given XML root.
-        This method clears the current items in the tree widget and 
-        adds new items based on the provided XML root element.
+        Shows the given XML root in the QTreeView.
+        The view gets a new XmlTreeModel, which creates the rows only when their branch is expanded,
+        so opening even a very large XML tree (full running configuration) is instant.
         Args:
-            xml_root: The root element of the XML structure containing the data to populate the tree widget.
+            tree_view (QTreeView): The tree view in which to show the data.
+            xml_root: The root element of the XML structure containing the data to show.
         """
 
-        tree_widget.clear()
-        if xml_root is not None:
-            addTreeItems(tree_widget.invisibleRootItem(), xml_root)
-        else:
-            tree_widget.setHeaderLabels(["No data found!"])
+        tree_view.setModel(XmlTreeModel(xml_root, tree_view))
 
-def addTreeItems(parent, element) -> None:
+class _XmlTreeNode:
     """
-    Recursively adds tree items to a QTreeWidget.
-    Args:
-        parent (QTreeWidgetItem): The parent tree widget item to which new items will be added.
-        element (Element): The XML element whose data will be used to create tree items.
+    One row of the XmlTreeModel - an XML element, or an attribute ("key: value") / text leaf of its parent element.
+    The child nodes are created on the first request (when the branch is expanded), not when the node is created.
+    """
+
+    __slots__ = ("parent", "row", "element", "text", "_children")
+
+    def __init__(self, parent, row, element=None, text=None):
+        self.parent = parent
+        self.row = row
+        self.element = element
+        self.text = element.tag if element is not None else text
+        self._children = None
+
+    def hasChildren(self) -> bool:
+        element = self.element
+        if element is None:
+            return(False)
+        return(bool(element.attrib) or next(element.iterchildren(ET.Element), None) is not None or bool(element.text and element.text.strip()))
+
+    def children(self) -> list:
+        """Same order as the former QTreeWidget: attributes, child elements, text."""
+
+        if self._children is None:
+            element = self.element
+            children = []
+            if element is not None:
+                for key, value in element.attrib.items():
+                    children.append(_XmlTreeNode(self, len(children), text=f"{key}: {value}"))
+                for child in element.iterchildren(ET.Element):
+                    children.append(_XmlTreeNode(self, len(children), element=child))
+                if element.text and element.text.strip():
+                    children.append(_XmlTreeNode(self, len(children), text=element.text.strip()))
+            self._children = children
+        return(self._children)
+
+class XmlTreeModel(QAbstractItemModel):
+    """
+    A read-only model backed directly by the lxml tree (for QTreeView).
+    Unlike filling a QTreeWidget, no Qt object is created per XML node and the rows of a branch are created only when
+    the branch is expanded - the memory and time needed depend on the expanded part of the tree, not on its size.
     """
 
-    item = QTreeWidgetItem(parent, [element.tag])
-    for key, value in element.attrib.items():
-        QTreeWidgetItem(item, [f"{key}: {value}"])
-    for child in element:
-        addTreeItems(item, child)
-    if element.text and element.text.strip():
-        QTreeWidgetItem(item, [element.text.strip()])
+    def __init__(self, xml_root, parent=None):
+        """
+        Args:
+            xml_root: The root element of the XML structure, or None if there is no data.
+            parent (QObject): The parent object of the model.
+        """
+
+        super().__init__(parent)
+        self.xml_root = xml_root
+        self.root_node = _XmlTreeNode(None, 0)
+        self.root_node._children = [_XmlTreeNode(self.root_node, 0, element=xml_root)] if xml_root is not None else []
+
+    def _node(self, index) -> _XmlTreeNode:
+        return(index.internalPointer() if index.isValid() else self.root_node)
+
+    def index(self, row, column, parent=QModelIndex()) -> QModelIndex:
+        if column != 0 or row < 0:
+            return(QModelIndex())
+        children = self._node(parent).children()
+        if row >= len(children):
+            return(QModelIndex())
+        return(self.createIndex(row, column, children[row]))
+
+    def parent(self, index=QModelIndex()) -> QModelIndex:
+        if not index.isValid():
+            return(QModelIndex())
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self.root_node:
+            return(QModelIndex())
+        return(self.createIndex(parent_node.row, 0, parent_node))
+
+    def hasChildren(self, parent=QModelIndex()) -> bool:
+        # Answered without creating the child rows - the view asks for every visible row
+        if not parent.isValid():
+            return(bool(self.root_node._children))
+        return(parent.internalPointer().hasChildren())
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.column() > 0:
+            return(0)
+        return(len(self._node(parent).children()))
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return(1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole:
+            return(index.internalPointer().text)
+        return(None)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return("Element" if self.xml_root is not None else "No data found!")
+        return(None)
+
+class SectionedXmlTreeModel(XmlTreeModel):
+    """
+    XmlTreeModel, whose top-level sections are retrieved only when they are expanded (fetchMore).
+    The tree starts as the root container with an empty element per section.
+    """
+
+    def __init__(self, container, sections, fetchSection, cached_sections=None, parent=None):
+        """
+        Args:
+            container (str): The tag of the root element (e.g. "configuration").
+            sections (iterable): The names of the sections (children of the root element).
+            fetchSection (callable): Called with the name of the section, returns the section element (None, if it could not be retrieved).
+            cached_sections (dict): Already retrieved sections (name -> element), shown without calling fetchSection.
+            parent (QObject): The parent object of the model.
+        """
+
+        xml_root = ET.Element(container)
+        self.unfetched_sections = set()
+        cached_sections = cached_sections or {}
+        for section in sections:
+            if section in cached_sections:
+                xml_root.append(copy.deepcopy(cached_sections[section])) # The element can only have one parent
+            else:
+                ET.SubElement(xml_root, section)
+                self.unfetched_sections.add(section)
+        super().__init__(xml_root, parent)
+        self.fetchSection = fetchSection
+
+    def _unfetchedSectionNode(self, index) -> _XmlTreeNode:
+        """Returns the node of the section, if the index points to a section, which was not retrieved yet (None otherwise)."""
+
+        if not index.isValid():
+            return(None)
+        node = index.internalPointer()
+        if node.element is None or node.element.getparent() is not self.xml_root or node.text not in self.unfetched_sections:
+            return(None)
+        return(node)
+
+    def hasChildren(self, parent=QModelIndex()) -> bool:
+        if self._unfetchedSectionNode(parent) is not None:
+            return(True) # Shows the expand arrow, the content is not known yet
+        return(super().hasChildren(parent))
+
+    def canFetchMore(self, parent) -> bool:
+        return(self._unfetchedSectionNode(parent) is not None)
+
+    def fetchMore(self, parent) -> None:
+        node = self._unfetchedSectionNode(parent)
+        if node is None:
+            return
+        self.unfetched_sections.discard(node.text)
+        section_element = self.fetchSection(node.text)
+        if section_element is None:
+            return
+        section_element = copy.deepcopy(section_element)
+
+        # Create the rows of the retrieved section, then swap the empty element for it
+        section_node = _XmlTreeNode(node.parent, node.row, element=section_element)
+        children = section_node.children()
+        for child in children:
+            child.parent = node
+        if not children:
+            return
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        self.xml_root.replace(node.element, section_element)
+        node.element = section_element
+        node._children = children
+        self.endInsertRows()
+
+    def fetchAll(self) -> None:
+        """Retrieves all the sections, which were not retrieved yet (used before expanding the whole tree)."""
+
+        container_index = self.index(0, 0)
+        for row in range(self.rowCount(container_index)):
+            section_index = self.index(row, 0, container_index)
+            if self.canFetchMore(section_index):
+                self.fetchMore(section_index)
 
 def getFirstIPAddressesFromSubinterfaces(subinterfaces) -> tuple:
         """
@@ -0,0 +1,90 @@
+# ---------- IMPORTS: ----------
+# Standard library
+from concurrent.futures import ThreadPoolExecutor
+
+# Custom modules
+from definitions import NETCONF_WORKER_POOL_SIZE
+
+# Qt
+from PySide6.QtCore import QObject, Signal
+
+# ---------- WORKERS: ----------
+class FanOutExecutor(QObject):
+    """
+    Runs blocking NETCONF work (connecting, retrieving device information, ...) for multiple devices at the same time,
+    on a bounded pool of worker threads. The results are delivered back to the GUI thread using Qt signals, so the
+    connected slots are free to work with the widgets and the items on the canvas.
+    The function submitted to the executor must NOT touch any Qt objects, since it runs in a worker thread.
+    Signals:
+        taskSucceeded (object, object): Emitted when a task finishes successfully - (key, return value of the task).
+        taskFailed (object, str): Emitted when a task raises an exception - (key, error message).
+        allTasksFinished (object): Emitted when there are no more running tasks - ({key: error message} of all the failed tasks).
+    """
+
+    taskSucceeded = Signal(object, object)
+    taskFailed = Signal(object, str)
+    allTasksFinished = Signal(object)
+
+    # Internal signal, used to pass the finished task from the worker thread to the GUI thread
+    _taskDone = Signal(object, object, object) # (key, return value, exception)
+
+    def __init__(self, max_workers=NETCONF_WORKER_POOL_SIZE, parent=None) -> "FanOutExecutor":
+        super().__init__(parent)
+
+        self.max_workers = max_workers
+        self.executor = None # Created on the first submitted task
+        self.running_tasks = 0
+        self.failed_tasks = {}
+
+        self._taskDone.connect(self._onTaskDone)
+
+    def submit(self, key, function, *args, **kwargs) -> None:
+        """
+        Submits a task to the worker pool. Must be called from the GUI thread.
+        Args:
+            key (object): Identifies the task in the emitted signals (e.g. the device object).
+            function (callable): The function to be run in the worker thread.
+            *args, **kwargs: Arguments for the function.
+        """
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="netconf-worker")
+
+        self.running_tasks += 1
+        future = self.executor.submit(function, *args, **kwargs)
+        future.add_done_callback(lambda future: self._taskDone.emit(key, *self._unpackFuture(future)))
+
+    def isRunning(self) -> bool:
+        """Returns True if there are still some tasks running, False otherwise."""
+        return(self.running_tasks > 0)
+
+    def shutdown(self) -> None:
+        """Waits for the running tasks to finish and stops the worker threads."""
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    @staticmethod
+    def _unpackFuture(future) -> tuple:
+        """Returns the (return value, exception) tuple of the finished future. Runs in the worker thread."""
+
+        exception = future.exception()
+        if exception is not None:
+            return(None, exception)
+        return(future.result(), None)
+
+    def _onTaskDone(self, key, result, exception) -> None:
+        """Handles the finished task in the GUI thread and re-emits the result using the public signals."""
+
+        self.running_tasks -= 1
+        if exception is None:
+            self.taskSucceeded.emit(key, result)
+        else:
+            self.failed_tasks[key] = str(exception)
+            self.taskFailed.emit(key, str(exception))
+
+        if self.running_tasks == 0:
+            failed_tasks = self.failed_tasks
+            self.failed_tasks = {}
+            self.allTasksFinished.emit(failed_tasks)
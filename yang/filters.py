@@ -1,9 +1,37 @@
 # Standard library
+import copy
+import itertools
+import threading
 from lxml import etree as ET
-from ncclient.xml_ import to_ele
 
 # Helper module for storing basic classes for filters, from which other filters can inherit.
 
+# ---------- TEMPLATES: ----------
+# The XML templates are parsed only once (on the first use) and cached. Every filter then works with its own deep copy of the
+# parsed template, so the filters can freely modify it and building a filter never touches the filesystem.
+_template_cache = {}
+_template_cache_lock = threading.Lock() # Filters are built from the worker threads as well
+
+def loadTemplate(path) -> ET._ElementTree:
+    """
+    Returns a copy of the parsed XML template. Replacement for ET.parse(path), which parses the file only once.
+
+    Args:
+        path (str): Path to the XML template.
+
+    Returns:
+        lxml.etree._ElementTree: A private (deep) copy of the parsed template, safe to be modified.
+    """
+
+    template = _template_cache.get(path)
+    if template is None:
+        with _template_cache_lock:
+            template = _template_cache.get(path)
+            if template is None:
+                template = ET.parse(path)
+                _template_cache[path] = template
+    return(copy.deepcopy(template))
+
 class GetFilter:
     def __init__(self):
         # Implemented in child classes
@@ -13,14 +41,25 @@ class GetFilter:
         """
         This method converts the filter_xml attribute to a string using the
         ElementTree tostring method and decodes it to UTF-8.
-        This is needed for dispatching RPCs with ncclient.
+        Used for displaying the filter (console, pending changes). The RPCs are dispatched with __ele__().
 
         Returns:
             str: The string representation of the filter_xml attribute.
         """
 
         return(ET.tostring(self.filter_xml).decode('utf-8'))
-    
+
+    def __ele__(self):
+        """
+        This method returns the root element of the filter_xml attribute, which is passed to ncclient as is,
+        without serializing it to a string and parsing it back.
+
+        Returns:
+            lxml.etree._Element: The root element of the filter_xml attribute.
+        """
+
+        return(self.filter_xml.getroot())
+
 
 class EditconfigFilter:
     def __init__(self):
@@ -31,14 +70,25 @@ class EditconfigFilter:
         """
         This method converts the filter_xml attribute to a string using the
         ElementTree tostring method and decodes it to UTF-8.
-        This is needed for dispatching RPCs with ncclient.
+        Used for displaying the filter (console, pending changes). The RPCs are dispatched with __ele__().
 
         Returns:
             str: The string representation of the filter_xml attribute.
         """
 
         return(ET.tostring(self.filter_xml).decode('utf-8'))
-    
+
+    def __ele__(self):
+        """
+        This method returns the root element of the filter_xml attribute, which is passed to ncclient as is,
+        without serializing it to a string and parsing it back.
+
+        Returns:
+            lxml.etree._Element: The root element of the filter_xml attribute.
+        """
+
+        return(self.filter_xml.getroot())
+
 class DispatchFilter:
     def __init__(self):
         # Implemented in child classes
@@ -48,7 +98,7 @@ class DispatchFilter:
         """
         This method converts the filter_xml attribute to a string using the
         ElementTree tostring method and decodes it to UTF-8.
-        This is needed for dispatching RPCs with ncclient.
+        Used for displaying the filter (console, pending changes). The RPCs are dispatched with __ele__().
 
         Returns:
             str: The string representation of the filter_xml attribute.
@@ -58,14 +108,158 @@ class DispatchFilter:
     
     def __ele__(self):
         """
-        This method converts the filter_xml attribute to an Element object.
-        This is needed for dispatching RPCs with ncclient.
+        This method returns the root element of the filter_xml attribute, which is passed to ncclient as is,
+        without serializing it to a string and parsing it back.
 
         Returns:
-            xml.etree.ElementTree.Element: The Element object of the filter_xml attribute.
+            lxml.etree._Element: The root element of the filter_xml attribute.
 
         Resources:
             https://github.com/ncclient/ncclient/issues/182
         """
 
-        return(to_ele(str(self)))
\ No newline at end of file
+        return(self.filter_xml.getroot())
+
+
+# ---------- BATCHING: ----------
+# Lists of the YANG models used by the edit-config filters: local name of the list -> keys of the list (local names, in the order of the model).
+# Following the YANG XML encoding (RFC 7950, 7.8.5), the keys are the first children of the list entry. The same name is used by the lists
+# of different models (with different keys) and by containers (e.g. "interface" of the IOS-XE native model), so an element is treated as
+# a list entry only if its first children are the keys of one of its lists. Any other element is treated as a container.
+LIST_KEYS = {
+    # openconfig-interfaces, openconfig-network-instance (OSPF)
+    "interface": [("name",), ("id",)],
+    "subinterface": [("index",)],
+    "address": [("ip",), ("name",)], # openconfig-if-ip, junos address book
+    "network-instance": [("name",)],
+    "protocol": [("identifier", "name")],
+    "area": [("identifier",)],
+    # Cisco-IOS-XE-native (OSPF, VLAN, ACL, crypto)
+    "process-id": [("id",)],
+    "network": [("ip", "wildcard")],
+    "configuration": [("vlan-id",)],
+    "vlan-list": [("id",)],
+    "extended": [("name",)],
+    "access-list-seq-rule": [("sequence",)],
+    "transform-set": [("tag",)],
+    "key-address": [("key",)],
+    "policy": [("number",), ("name",), ("from-zone-name", "to-zone-name")], # IOS-XE ISAKMP, junos IKE/IPsec and security policies
+    "map": [("name", "seq")],
+    # junos-conf (security)
+    "security-zone": [("name",)],
+    "interfaces": [("name",)],
+    "proposal": [("name",)],
+    "gateway": [("name",)],
+    "vpn": [("name",)],
+    "address-book": [("name",)],
+    "zone": [("name",)],
+}
+# Lists named by the data, keyed by the local names of their parent and grandparent: the interfaces of the IOS-XE native model
+# are lists named by the interface type (GigabitEthernet, Loopback, ...)
+LIST_KEYS_BY_PARENT = {
+    ("native", "interface"): [("name",)],
+}
+
+class EditconfigBatch:
+    """
+    Staging buffer of the edit-config filters of one device. The <config> trees of the staged filters are merged locally,
+    so all the staged changes are sent to the device in a single <edit-config> (see netconf.applyNetconfChanges).
+    When a filter would change something already staged (e.g. the same leaf set twice, or an entry deleted and created again),
+    it starts a new batch, so the changes are still applied in the order in which they were made.
+    The buffer is filled from the GUI thread and sent from the worker threads, so it is guarded by a lock.
+    """
+
+    def __init__(self) -> "EditconfigBatch":
+        self.batches = [] # [merged <config> tree, number of the staged filters in it], sent one <edit-config> per batch
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Returns the number of the staged filters."""
+
+        with self._lock:
+            return(sum(changes for _, changes in self.batches))
+
+    def add(self, filter) -> None:
+        """Stages the filter (EditconfigFilter). The filter itself is not modified."""
+
+        fragment = filter.__ele__()
+        with self._lock:
+            if self.batches and _mergeConfig(self.batches[-1][0], fragment, apply=False):
+                _mergeConfig(self.batches[-1][0], fragment, apply=True)
+                self.batches[-1][1] += 1
+            else:
+                self.batches.append([copy.deepcopy(fragment), 1])
+
+    def take(self) -> list:
+        """Removes all the staged changes from the buffer. Returns the batches ([<config> tree, number of filters]), which can be put back with restore()."""
+
+        with self._lock:
+            batches = self.batches
+            self.batches = []
+        return(batches)
+
+    def restore(self, batches) -> None:
+        """Puts the batches returned by take() back in front of the buffer (used when they could not be sent)."""
+
+        with self._lock:
+            self.batches[:0] = batches
+
+    def clear(self) -> None:
+        self.take()
+
+def listEntryKey(element) -> tuple:
+    """
+    Returns the key of the list entry (see LIST_KEYS) - ((key tag, key value), ...) in the order of the keys. None for the containers and leaves.
+    """
+
+    candidates = LIST_KEYS.get(ET.QName(element).localname, [])
+    parent = element.getparent()
+    if parent is not None and parent.getparent() is not None:
+        candidates = candidates + LIST_KEYS_BY_PARENT.get((ET.QName(parent.getparent()).localname, ET.QName(parent).localname), [])
+
+    for keys in candidates:
+        key_elements = list(itertools.islice(element.iterchildren(ET.Element), len(keys)))
+        if len(key_elements) == len(keys) and all(not len(key_element) and ET.QName(key_element).localname == key for key_element, key in zip(key_elements, keys)):
+            return(tuple((key_element.tag, (key_element.text or "").strip()) for key_element in key_elements))
+    return(None)
+
+def _mergeConfig(target, fragment, apply) -> bool:
+    """
+    Merges the children of the fragment into the target element.
+    Args:
+        target (lxml.etree._Element): The merged tree (modified only when apply is True).
+        fragment (lxml.etree._Element): The tree to be merged (never modified, its elements are copied).
+        apply (bool): False only checks, if the fragment can be merged without changing the meaning of the already merged changes.
+    Returns:
+        bool: False if the fragment conflicts with the target, True otherwise.
+    """
+
+    existing_children = {}
+    for child in target.iterchildren(ET.Element):
+        existing_children.setdefault(child.tag, []).append(child)
+
+    for child in fragment.iterchildren(ET.Element):
+        child_is_leaf = not len(child)
+        child_key = listEntryKey(child)
+        match = None
+        for candidate in existing_children.get(child.tag, ()):
+            if child_is_leaf and not len(candidate):
+                # The same leaf again - fine when identical, otherwise the order matters (overwritten leaf, leaf-list)
+                if (child.text or "").strip() == (candidate.text or "").strip() and child.attrib == candidate.attrib:
+                    match = candidate
+                    break
+                return False
+            candidate_key = listEntryKey(candidate)
+            if child_key is not None and candidate_key is not None and child_key != candidate_key:
+                continue # Another entry of the same list
+            if child.attrib != candidate.attrib: # Different operation (delete, replace, ...) on the same node
+                return False
+            match = candidate
+            break
+
+        if match is None:
+            if apply:
+                target.append(copy.deepcopy(child))
+        elif len(child) and not _mergeConfig(match, child, apply):
+            return False
+    return True